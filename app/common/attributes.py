@@ -0,0 +1,115 @@
+"""属性だけの列指向テーブル
+
+出題や見出しで使う地名・コードをジオメトリと切り離して保存する。
+列ごとのリスト（行番号 = フィーチャー番号）なので、ポリゴンを
+読み込まずに市町村名の一覧を作れる。
+
+生成方法（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m common.attributes
+"""
+
+import json
+import os
+from collections.abc import Iterable
+from typing import Self
+
+import streamlit as st
+
+from common.const import Const
+from common.geostream import stream_features
+from common.utils import stream_data
+
+CONST = Const()
+
+BASE_DIR = CONST.base_dir
+BUILD_DIR = CONST.build_dir
+REGIONS = CONST.regions
+
+ATTRIBUTES_EXTENSION = ".attrs.json"
+
+# 都道府県名・振興局名・郡名・市町村名・行政区域コード
+COLUMNS = ("N03_001", "N03_002", "N03_003", "N03_004", "N03_007")
+
+
+class AttributeTable:
+    """フィーチャーの属性を列ごとに持つテーブル"""
+
+    def __init__(self, columns: dict[str, list]) -> None:
+        self.columns = columns
+
+    @classmethod
+    def from_geojson(cls, geojson) -> Self:
+        return cls.from_features(geojson["features"])
+
+    @classmethod
+    def from_features(cls, features: Iterable[dict]) -> Self:
+        """フィーチャーを 1 つずつ受け取って作る（ジオメトリは残さない）"""
+        columns: dict[str, list] = {"index": [], **{key: [] for key in COLUMNS}}
+        for i, feature in enumerate(features):
+            properties = feature["properties"] or {}
+            columns["index"].append(i)
+            for key in COLUMNS:
+                columns[key].append(properties.get(key))
+
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns["index"])
+
+    def column(self, key: str) -> list:
+        return self.columns[key]
+
+    def row(self, index: int) -> dict:
+        """1 行分の属性（フィーチャーの properties と同じ形）"""
+        return {key: values[index] for key, values in self.columns.items()}
+
+    def names(self, key: str) -> list[str]:
+        """key 列の値のうち None でないもの（フィーチャー順）"""
+        return [value for value in self.columns[key] if value is not None]
+
+    def find(self, key: str, value) -> list[int]:
+        """key 列が value の行番号"""
+        return [i for i, v in enumerate(self.columns[key]) if v == value]
+
+    def write(self, path: str) -> int:
+        """JSON で書き出し、書き込んだバイト数を返す"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.columns, f, ensure_ascii=False, separators=(",", ":"))
+            return f.tell()
+
+    @classmethod
+    def read(cls, path: str) -> Self:
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+
+@st.cache_resource
+def load_attributes(region: str) -> AttributeTable:
+    """地域の属性テーブルを読み込む（未生成なら元データから作る）"""
+    path = f"{BUILD_DIR}{region}{ATTRIBUTES_EXTENSION}"
+    if os.path.exists(path):
+        return AttributeTable.read(path)
+
+    # 元データは逐次読み込み、ジオメトリを持ったままにしない
+    return AttributeTable.from_features(stream_data(region))
+
+
+def convert_all(
+    base_dir: str = BASE_DIR, build_dir: str = BUILD_DIR, regions=REGIONS
+) -> dict[str, tuple[int, int]]:
+    """全アセットを変換し、地域コードごとの (元サイズ, 変換後サイズ) を返す"""
+    sizes = {}
+    for region in regions:
+        src = f"{base_dir}{region}.json"
+        table = AttributeTable.from_features(stream_features(src))
+
+        written = table.write(f"{build_dir}{region}{ATTRIBUTES_EXTENSION}")
+        sizes[region] = (os.path.getsize(src), written)
+
+    return sizes
+
+
+if __name__ == "__main__":
+    for region, (src, dst) in convert_all().items():
+        print(f"{region}: {src:,} -> {dst:,} bytes")
@@ -0,0 +1,241 @@
+"""圧縮アセット（gzip / zstd / brotli）
+
+拡張子（".json.gz" / ".json.zst" / ".json.br"）で圧縮形式を選び、
+ファイルを少しずつ展開するストリームを json.load へ渡す。展開はストリームで
+行うが、json.load は展開後の全体を読み込んでから解析する（解析は逐次ではない）。
+フィーチャー単位で逐次に読むときは common.geostream.stream_features を使う。
+zstd は Python 3.14 の compression.zstd（無ければ zstandard）、
+brotli は brotli パッケージがあるときだけ使える。
+
+変換と比較（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m common.compressed [--codec gzip|zstd|brotli ...]
+"""
+
+import argparse
+import gzip
+import io
+import json
+import os
+import time
+
+from common.const import Const
+
+CONST = Const()
+
+BASE_DIR = CONST.base_dir
+BUILD_DIR = CONST.build_dir
+REGIONS = CONST.regions
+
+# 拡張子の末尾 → 圧縮形式
+CODECS = {".gz": "gzip", ".zst": "zstd", ".br": "brotli"}
+SUFFIXES = {codec: suffix for suffix, codec in CODECS.items()}
+
+# 変換時の圧縮レベル（展開速度はレベルによらない）
+LEVELS = {"gzip": 9, "zstd": 19, "brotli": 11}
+
+_CHUNK_SIZE = 1 << 16
+
+
+def codec_of(path: str) -> str | None:
+    """パス（または拡張子）の圧縮形式（圧縮されていなければ None）"""
+    return CODECS.get(os.path.splitext(path)[1])
+
+
+def _zstd():
+    try:
+        from compression import zstd  # Python 3.14+
+    except ImportError:
+        zstd = None
+
+    if zstd is not None:
+        return zstd
+
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "zstd には Python 3.14 以降か zstandard パッケージが必要です"
+        ) from e
+
+    return zstandard
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError as e:
+        raise ImportError("brotli には brotli パッケージが必要です") from e
+
+    return brotli
+
+
+class _StreamReader(io.RawIOBase):
+    """増分展開器で少しずつ展開する読み取りストリーム（brotli・zstandard 用）"""
+
+    def __init__(self, fileobj, decompress, finished, codec: str) -> None:
+        self._fileobj = fileobj
+        self._decompress = decompress
+        self._finished = finished
+        self._codec = codec
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            chunk = self._fileobj.read(_CHUNK_SIZE)
+            if not chunk:
+                # 途中で切れたファイルを JSON の解析エラーにしない
+                if not self._finished():
+                    raise EOFError(f"{self._codec} ストリームが途中で終わっています")
+                return 0
+            self._buffer = self._decompress(chunk)
+
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+def decompressing_reader(fileobj, codec: str):
+    """圧縮されたバイナリストリームを展開しながら読むストリーム"""
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")
+
+    if codec == "zstd":
+        zstd = _zstd()
+        if hasattr(zstd, "ZstdFile"):
+            return zstd.ZstdFile(fileobj, mode="rb")
+        obj = zstd.ZstdDecompressor().decompressobj()
+        reader = _StreamReader(fileobj, obj.decompress, lambda: obj.eof, codec)
+        return io.BufferedReader(reader, _CHUNK_SIZE)
+
+    if codec == "brotli":
+        obj = _brotli().Decompressor()
+        reader = _StreamReader(fileobj, obj.process, obj.is_finished, codec)
+        return io.BufferedReader(reader, _CHUNK_SIZE)
+
+    raise ValueError(f"未対応の圧縮形式です: {codec}")
+
+
+def load_json(path: str):
+    """JSON ファイルを読み込む（拡張子が圧縮形式なら展開して）"""
+    with open(path, "rb") as f:
+        if (codec := codec_of(path)) is None:
+            return json.load(f)
+
+        with decompressing_reader(f, codec) as reader:
+            return json.load(reader)
+
+
+def compress(data: bytes, codec: str, level: int | None = None) -> bytes:
+    level = LEVELS.get(codec) if level is None else level
+
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=level, mtime=0)
+
+    if codec == "zstd":
+        zstd = _zstd()
+        if hasattr(zstd, "ZstdFile"):
+            return zstd.compress(data, level=level)
+        return zstd.ZstdCompressor(level=level).compress(data)
+
+    if codec == "brotli":
+        return _brotli().compress(data, quality=level)
+
+    raise ValueError(f"未対応の圧縮形式です: {codec}")
+
+
+def available_codecs() -> list[str]:
+    """この環境で使える圧縮形式"""
+    codecs = ["gzip", "zstd"]
+    try:
+        _brotli()
+    except ImportError:
+        pass
+    else:
+        codecs.append("brotli")
+
+    try:
+        _zstd()
+    except ImportError:
+        codecs.remove("zstd")
+
+    return codecs
+
+
+def _timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def convert_all(
+    codecs: list[str],
+    base_dir: str = BASE_DIR,
+    build_dir: str = BUILD_DIR,
+    regions=REGIONS,
+) -> list[tuple[str, str, int, int, float, float]]:
+    """全アセットを圧縮し、サイズと読み込み時間を比較する
+
+    戻り値は (地域コード, 圧縮形式, 元サイズ, 圧縮後サイズ,
+    元の読込秒, 圧縮ファイルの展開・読込秒) のリスト。
+    """
+    os.makedirs(build_dir, exist_ok=True)
+
+    report = []
+    for region in regions:
+        src = f"{base_dir}{region}.json"
+        with open(src, "rb") as f:
+            data = f.read()
+        t_src = _timed(load_json, src)
+
+        for codec in codecs:
+            dst = f"{build_dir}{region}.json{SUFFIXES[codec]}"
+            with open(dst, "wb") as f:
+                f.write(compress(data, codec))
+
+            report.append(
+                (
+                    region,
+                    codec,
+                    len(data),
+                    os.path.getsize(dst),
+                    t_src,
+                    _timed(load_json, dst),
+                )
+            )
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--codec", action="append", help="圧縮形式（既定は使えるもの全て）"
+    )
+    args = parser.parse_args()
+
+    report = convert_all(args.codec or available_codecs())
+
+    print(
+        f"{'region':<16} {'codec':<6} {'json':>10} {'packed':>10} {'size':>5}"
+        f" {'json.load':>10} {'unpack':>10} {'time':>5}"
+    )
+    for region, codec, src, dst, t_src, t_dst in report:
+        print(
+            f"{region:<16} {codec:<6} {src:>10,} {dst:>10,} {dst / src:>5.0%}"
+            f" {t_src * 1000:>8.1f}ms {t_dst * 1000:>8.1f}ms {t_dst / t_src:>5.0%}"
+        )
+
+    for codec in sorted({row[1] for row in report}):
+        rows = [row for row in report if row[1] == codec]
+        src = sum(row[2] for row in rows)
+        dst = sum(row[3] for row in rows)
+        t_src = sum(row[4] for row in rows)
+        t_dst = sum(row[5] for row in rows)
+        print(
+            f"{'total':<16} {codec:<6} {src:>10,} {dst:>10,} {dst / src:>5.0%}"
+            f" {t_src * 1000:>8.1f}ms {t_dst * 1000:>8.1f}ms {t_dst / t_src:>5.0%}"
+        )
@@ -1,60 +1,156 @@
+import logging
+import os
+from collections.abc import Callable
+from types import MappingProxyType
+
+from common.prefectures import PrefectureTable
+
+logger = logging.getLogger(__name__)
+
+
+def env[T](name: str, default: T, parse: Callable[[str], T] = str) -> T:
+    """環境変数を parse で読む（未設定・空・不正な値なら default）"""
+    if not (value := os.environ.get(name, "").strip()):
+        return default
+
+    try:
+        return parse(value)
+    except ValueError:
+        logger.warning(
+            "環境変数 %s=%r を読めないので %r を使います", name, value, default
+        )
+        return default
+
+
+def flag(value: str) -> bool:
+    """真偽値の環境変数（1・true・yes・on だけを真とし、それ以外は偽）"""
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
 class Const:
     # assets
     base_url = ""
     base_dir = "app/assets/"
     base_file = ""
 
+    # アセットから生成する派生ファイル（バイナリストアなど）の出力先
+    build_dir = "app/assets/build/"
+
+    # bbox・中心座標の事前計算インデックス（app/assets/ に配置）
+    index_file = "index.json"
+
+    # プロセス共有のジオメトリキャッシュの上限（推定バイト数）
+    geometry_cache_bytes: int = env("GEOMETRY_CACHE_BYTES", 256 * 1024 * 1024, int)
+
+    # JSON 化した地図のレイヤーをプロセスで共有する件数（地域・ティアごと）
+    deck_cache_entries: int = env("DECK_CACHE_ENTRIES", 16, int)
+
+    # 地図のレイヤーの既定の形式（"geojson" か、平らな座標配列の "flat"）
+    map_layer_format: str = env("MAP_LAYER_FORMAT", "geojson")
+
+    # 簡略化ジオメトリを用意するズームレベル
+    tier_zooms: tuple[int, ...] = (4, 6, 8, 10, 12)
+
+    # 地図のズーム (zoom, min_zoom)
+    prefecture_zoom: tuple[int, int] = (4, 4)
+    region_zoom: tuple[int, int] = (8, 6)
+    region_zooms: MappingProxyType[str, tuple[int, int]] = MappingProxyType(
+        {
+            "01": (6, 6),  # 北海道
+            "13": (9, 4),  # 東京都
+        }
+    )
+
+    # 地図を拡大できる最大ズーム
+    prefecture_max_zoom: int = 8
+    region_max_zoom: int = 12
+
+    # 起動時に読み込んでおく地域コード（カンマ区切り、"all" で全て、空なら無効）
+    warmup_regions: str = env("WARMUP_REGIONS", "")
+    warmup_workers: int = env("WARMUP_WORKERS", 4, int)
+    # ウォームアップが終わったら進行状況を書き出すファイル（readiness probe 用、空なら無効）
+    warmup_status_file: str = env("WARMUP_STATUS_FILE", "")
+
+    # リモートアセット（base_url が URL のとき）の保存先・タイムアウト秒・
+    # 再試行回数・同時接続数
+    fetch_cache_dir: str = env("FETCH_CACHE_DIR", "app/assets/build/http/")
+    fetch_timeout: float = env("FETCH_TIMEOUT", 10.0, float)
+    fetch_retries: int = env("FETCH_RETRIES", 3, int)
+    fetch_concurrency: int = env("FETCH_CONCURRENCY", 4, int)
+
+    # 学習ページで選んだ都道府県と隣接県を先読みするスレッド数（0 で無効）
+    prefetch_workers: int = env("PREFETCH_WORKERS", 2, int)
+
+    # 計測スパンの集計（TRACING=1 で有効）とスパンごとに残す直近の件数
+    tracing: bool = env("TRACING", False, flag)
+    tracing_samples: int = env("TRACING_SAMPLES", 2048, int)
+
+    # アセットの地域コード
+    regions: tuple[str, ...] = (
+        "prefecture",
+        "01_subprefecture",
+        *[f"{i:02d}" for i in range(1, 48)],
+    )
+
     # クイズの問題数
     num_questions: int = 10
 
-    # 都道府県・県庁所在地・緯度経度
-    prefectures: list[tuple[str, str, float, float]] = [
-        ("北海道", "札幌市", 43.06417, 141.34694),
-        ("青森県", "青森市", 40.82444, 140.74),
-        ("岩手県", "盛岡市", 39.70361, 141.1525),
-        ("宮城県", "仙台市", 38.26889, 140.87194),
-        ("秋田県", "秋田市", 39.71861, 140.1025),
-        ("山形県", "山形市", 38.24056, 140.36333),
-        ("福島県", "福島市", 37.75, 140.46778),
-        ("茨城県", "水戸市", 36.34139, 140.44667),
-        ("栃木県", "宇都宮市", 36.56583, 139.88361),
-        ("群馬県", "前橋市", 36.39111, 139.06083),
-        ("埼玉県", "さいたま市", 35.85694, 139.64889),
-        ("千葉県", "千葉市", 35.60472, 140.12333),
-        ("東京都", "新宿区", 35.68944, 139.69167),
-        ("神奈川県", "横浜市", 35.44778, 139.6425),
-        ("新潟県", "新潟市", 37.90222, 139.02361),
-        ("富山県", "富山市", 36.69528, 137.21139),
-        ("石川県", "金沢市", 36.59444, 136.62556),
-        ("福井県", "福井市", 36.06528, 136.22194),
-        ("山梨県", "甲府市", 35.66389, 138.56833),
-        ("長野県", "長野市", 36.65139, 138.18111),
-        ("岐阜県", "岐阜市", 35.39111, 136.72222),
-        ("静岡県", "静岡市", 34.97694, 138.38306),
-        ("愛知県", "名古屋市", 35.18028, 136.90667),
-        ("三重県", "津市", 34.73028, 136.50861),
-        ("富山県", "富山市", 36.69528, 137.21139),
-        ("滋賀県", "大津市", 35.00444, 135.86833),
-        ("京都府", "京都市", 35.02139, 135.75556),
-        ("大阪府", "大阪市", 34.68639, 135.52),
-        ("兵庫県", "神戸市", 34.69139, 135.18306),
-        ("奈良県", "奈良市", 34.68528, 135.83278),
-        ("和歌山県", "和歌山市", 34.22611, 135.1675),
-        ("鳥取県", "鳥取市", 35.50361, 134.23833),
-        ("島根県", "松江市", 35.47222, 133.05056),
-        ("岡山県", "岡山市", 34.66167, 133.935),
-        ("広島県", "広島市", 34.39639, 132.45944),
-        ("山口県", "山口市", 34.18583, 131.47139),
-        ("徳島県", "徳島市", 34.06583, 134.55944),
-        ("香川県", "高松市", 34.34028, 134.04333),
-        ("愛媛県", "松山市", 33.84167, 132.76611),
-        ("高知県", "高知市", 33.55972, 133.53111),
-        ("福岡県", "福岡市", 33.60639, 130.41806),
-        ("佐賀県", "佐賀市", 33.24944, 130.29889),
-        ("長崎県", "長崎市", 32.74472, 129.87361),
-        ("熊本県", "熊本市", 32.78972, 130.74167),
-        ("大分県", "大分市", 33.23806, 131.6125),
-        ("宮崎県", "宮崎市", 31.91111, 131.42389),
-        ("鹿児島県", "鹿児島市", 31.56028, 130.55806),
-        ("沖縄県", "那覇市", 26.2125, 127.68111),
-    ]
+    # 4 択の誤答の選び方（random / nearest / same_region）
+    quiz_distractors: str = env("QUIZ_DISTRACTORS", "random")
+
+    # 事前生成してプロセスで共有する出題プールの回数と乱数の seed
+    round_pool_size: int = env("ROUND_POOL_SIZE", 4096, int)
+    round_pool_seed: int = env("ROUND_POOL_SEED", 0, int)
+
+    # 都道府県・県庁所在地・緯度経度（都道府県コード順。名前やコードで引ける）
+    prefectures: PrefectureTable = PrefectureTable(
+        [
+            ("北海道", "札幌市", 43.06417, 141.34694),
+            ("青森県", "青森市", 40.82444, 140.74),
+            ("岩手県", "盛岡市", 39.70361, 141.1525),
+            ("宮城県", "仙台市", 38.26889, 140.87194),
+            ("秋田県", "秋田市", 39.71861, 140.1025),
+            ("山形県", "山形市", 38.24056, 140.36333),
+            ("福島県", "福島市", 37.75, 140.46778),
+            ("茨城県", "水戸市", 36.34139, 140.44667),
+            ("栃木県", "宇都宮市", 36.56583, 139.88361),
+            ("群馬県", "前橋市", 36.39111, 139.06083),
+            ("埼玉県", "さいたま市", 35.85694, 139.64889),
+            ("千葉県", "千葉市", 35.60472, 140.12333),
+            ("東京都", "新宿区", 35.68944, 139.69167),
+            ("神奈川県", "横浜市", 35.44778, 139.6425),
+            ("新潟県", "新潟市", 37.90222, 139.02361),
+            ("富山県", "富山市", 36.69528, 137.21139),
+            ("石川県", "金沢市", 36.59444, 136.62556),
+            ("福井県", "福井市", 36.06528, 136.22194),
+            ("山梨県", "甲府市", 35.66389, 138.56833),
+            ("長野県", "長野市", 36.65139, 138.18111),
+            ("岐阜県", "岐阜市", 35.39111, 136.72222),
+            ("静岡県", "静岡市", 34.97694, 138.38306),
+            ("愛知県", "名古屋市", 35.18028, 136.90667),
+            ("三重県", "津市", 34.73028, 136.50861),
+            ("滋賀県", "大津市", 35.00444, 135.86833),
+            ("京都府", "京都市", 35.02139, 135.75556),
+            ("大阪府", "大阪市", 34.68639, 135.52),
+            ("兵庫県", "神戸市", 34.69139, 135.18306),
+            ("奈良県", "奈良市", 34.68528, 135.83278),
+            ("和歌山県", "和歌山市", 34.22611, 135.1675),
+            ("鳥取県", "鳥取市", 35.50361, 134.23833),
+            ("島根県", "松江市", 35.47222, 133.05056),
+            ("岡山県", "岡山市", 34.66167, 133.935),
+            ("広島県", "広島市", 34.39639, 132.45944),
+            ("山口県", "山口市", 34.18583, 131.47139),
+            ("徳島県", "徳島市", 34.06583, 134.55944),
+            ("香川県", "高松市", 34.34028, 134.04333),
+            ("愛媛県", "松山市", 33.84167, 132.76611),
+            ("高知県", "高知市", 33.55972, 133.53111),
+            ("福岡県", "福岡市", 33.60639, 130.41806),
+            ("佐賀県", "佐賀市", 33.24944, 130.29889),
+            ("長崎県", "長崎市", 32.74472, 129.87361),
+            ("熊本県", "熊本市", 32.78972, 130.74167),
+            ("大分県", "大分市", 33.23806, 131.6125),
+            ("宮崎県", "宮崎市", 31.91111, 131.42389),
+            ("鹿児島県", "鹿児島市", 31.56028, 130.55806),
+            ("沖縄県", "那覇市", 26.2125, 127.68111),
+        ]
+    )
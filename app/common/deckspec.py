@@ -0,0 +1,69 @@
+"""JSON 化済みの地図（st.pydeck_chart に pdk.Deck の代わりに渡す）
+
+レイヤーを 1 度だけ JSON 化して持ち、描画のたびにはビューなどの小さい部分だけを
+JSON 化する。pydeck は使うときに読み込むので、このモジュールの import は軽い。
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pydeck as pdk
+
+# pdk.Deck の既定のビュー
+MAP_VIEWS = [{"@@type": "MapView", "controller": True}]
+
+
+class DeckSpec:
+    """JSON 化済みのレイヤーを持つ地図（st.pydeck_chart に pdk.Deck の代わりに渡せる）
+
+    レイヤーは JSON 文字列のまま持ち、to_json はビューなどの小さい部分だけを
+    JSON 化してつなぐので、ジオメトリを JSON 化し直さない。
+    st.pydeck_chart は to_json() と _tooltip だけを見る。pandas 3 では layers 属性の
+    レイヤーも走査するので、JSON 文字列は layers という名前にしない。
+    map_provider の既定は pdk.Deck と同じ "carto"。
+    """
+
+    __slots__ = ("_tooltip", "layers_json", "map_provider", "map_style", "view_state")
+
+    def __init__(
+        self,
+        layers_json: str,
+        view_state: pdk.ViewState,
+        tooltip: dict | None = None,
+        map_style: str = "dark_no_labels",
+        map_provider: str | None = "carto",
+    ) -> None:
+        from pydeck.bindings.json_tools import default_serialize
+        from pydeck.bindings.map_styles import get_from_map_identifier
+
+        self.layers_json = layers_json
+        self.view_state = default_serialize(view_state)
+        self._tooltip = tooltip
+        # pdk.Deck と同じく地図の提供元に合わせたスタイルの URL にする
+        self.map_style = get_from_map_identifier(map_style, map_provider)
+        self.map_provider = map_provider
+
+    def to_json(self) -> str:
+        spec = {
+            "initialViewState": self.view_state,
+            "mapStyle": self.map_style,
+            "views": MAP_VIEWS,
+        }
+        if self.map_provider is not None:
+            spec["mapProvider"] = self.map_provider
+
+        head = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+        return f'{head[:-1]},"layers":{self.layers_json}}}'
+
+
+def serialize_layers(layers: Iterable[pdk.Layer]) -> str:
+    """レイヤーを pdk.Deck.to_json と同じ内容の JSON にする（空白なし）"""
+    from pydeck.bindings.json_tools import default_serialize
+
+    return json.dumps(
+        list(layers), sort_keys=True, default=default_serialize, separators=(",", ":")
+    )
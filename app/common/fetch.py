@@ -0,0 +1,161 @@
+"""リモートアセットの取得（接続プール・ディスクキャッシュ・条件付きリクエスト）
+
+requests.Session を 1 つ共有して接続を使い回し、受信したファイルを
+ディスクに保存する。2 回目以降は ETag / Last-Modified を付けて
+条件付きで取得し、304 なら保存済みのファイルをそのまま使う。
+タイムアウト・再試行（502/503/504 と接続エラー）・同時接続数の上限を持ち、
+サーバーに届かないとき（接続エラー・タイムアウト・5xx）は保存済みのファイルが
+あればそれを返す。4xx は保存済みのファイルがあっても送出する。
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import Counter
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from common.const import Const
+
+CONST = Const()
+
+CACHE_DIR = CONST.fetch_cache_dir
+
+# 再試行するステータスコード
+RETRY_STATUSES = (502, 503, 504)
+
+META_SUFFIX = ".meta.json"
+
+_CHUNK_SIZE = 1 << 16
+
+
+def _transient(error: requests.RequestException) -> bool:
+    """保存済みのファイルで続けてよい失敗か（接続・タイムアウト・5xx）
+
+    404 や 403 のような 4xx は、削除・非公開にされたアセットを
+    いつまでも配り続けないよう呼び出し元へ送出する。
+    """
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+class Fetcher:
+    """URL のファイルをディスクキャッシュ経由で取得する（スレッドセーフ）"""
+
+    def __init__(
+        self,
+        cache_dir: str = CACHE_DIR,
+        timeout: float = CONST.fetch_timeout,
+        retries: int = CONST.fetch_retries,
+        concurrency: int = CONST.fetch_concurrency,
+        backoff: float = 0.5,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.stats: Counter[str] = Counter()
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=concurrency, pool_maxsize=concurrency, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+
+    def path(self, url: str) -> str:
+        """url を保存するパス（拡張子で圧縮形式が分かるようファイル名を残す）"""
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        name = os.path.basename(urlsplit(url).path) or "index"
+        return os.path.join(self.cache_dir, f"{digest}-{name}")
+
+    def fetch(self, url: str) -> str:
+        """url を取得して保存先のパスを返す（変更がなければ再受信しない）"""
+        path = self.path(url)
+        meta = self._read_meta(path)
+
+        headers = {}
+        if etag := meta.get("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := meta.get("last_modified"):
+            headers["If-Modified-Since"] = last_modified
+
+        try:
+            with (
+                self._slots,
+                self.session.get(
+                    url, headers=headers, stream=True, timeout=self.timeout
+                ) as response,
+            ):
+                if response.status_code == 304 and meta:
+                    self._count("revalidated")
+                    return path
+
+                response.raise_for_status()
+                self._store(response, path)
+        except requests.RequestException as e:
+            if not meta or not _transient(e):
+                raise
+
+            # サーバーに届かない・サーバー側の障害なら保存済みのファイルで続ける
+            self._count("stale")
+            return path
+
+        self._count("downloaded")
+        return path
+
+    def _read_meta(self, path: str) -> dict:
+        if not os.path.exists(path):
+            return {}
+
+        try:
+            with open(path + META_SUFFIX, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self, response: requests.Response, path: str) -> None:
+        # 途中で失敗しても壊れたファイルを残さないよう一時ファイルから置き換える
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._replace(path, response.iter_content(_CHUNK_SIZE))
+
+        meta = {
+            "url": response.url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        self._replace(path + META_SUFFIX, [json.dumps(meta).encode("utf-8")])
+
+    def _replace(self, path: str, chunks) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+
+# プロセス全体で 1 つだけ使う
+fetcher = Fetcher()
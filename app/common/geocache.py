@@ -0,0 +1,156 @@
+"""プロセス共有のジオメトリキャッシュ
+
+st.cache_data は値を pickle し、呼び出しごとにコピーを返す。
+読み込んだ GeoJSON を読み取り専用に変換して全セッションで共有し、
+推定バイト数の上限を超えたら最も古く使われたものから追い出す。
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from common.const import Const
+
+CONST = Const()
+
+CACHE_BYTES = CONST.geometry_cache_bytes
+
+
+def _readonly(*_args, **_kwargs):
+    raise TypeError("キャッシュ済みのジオメトリは変更できません")
+
+
+class FrozenDict(dict):
+    """変更できない dict（json.dumps や比較は通常の dict と同じ）"""
+
+    __setitem__ = __delitem__ = __ior__ = _readonly  # type: ignore[assignment]
+    clear = pop = popitem = setdefault = update = _readonly  # type: ignore[assignment]
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """変更できない list（json.dumps や比較は通常の list と同じ）"""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly  # type: ignore[assignment]
+    append = clear = extend = insert = pop = remove = _readonly  # type: ignore[assignment]
+    reverse = sort = _readonly  # type: ignore[assignment]
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(obj) -> tuple[Any, int]:
+    """再帰的に読み取り専用へ変換し、(変換後の値, 推定バイト数) を返す"""
+    if isinstance(obj, dict):
+        size = sys.getsizeof(obj)
+        items = {}
+        for key, value in obj.items():
+            items[key], n = freeze(value)
+            size += n
+        return FrozenDict(items), size
+
+    if isinstance(obj, list):
+        size = sys.getsizeof(obj)
+        values = []
+        for value in obj:
+            value, n = freeze(value)
+            values.append(value)
+            size += n
+        return FrozenList(values), size
+
+    return obj, sys.getsizeof(obj)
+
+
+class GeometryCache:
+    """推定バイト数の上限つき LRU キャッシュ（スレッドセーフ）"""
+
+    def __init__(self, max_bytes: int = CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: dict[str, threading.Lock] = {}
+        self._nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, loader: Callable[[], Any]):
+        """key の値を返す。無ければ loader で読み込み、読み取り専用にして保持する"""
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        # 同じキーの読み込みは 1 回にまとめる
+        with loading:
+            with self._lock:
+                if (entry := self._entries.get(key)) is not None:
+                    self._entries.move_to_end(key)
+                    return entry[0]
+
+            try:
+                value, size = freeze(loader())
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(key, None)
+                raise
+
+            with self._lock:
+                self._entries[key] = (value, size)
+                self._nbytes += size
+                self._loading.pop(key, None)
+                self._evict()
+
+        return value
+
+    def _evict(self) -> None:
+        # 直前に追加したエントリは上限を超えていても残す
+        while len(self._entries) > 1 and self._nbytes > self.max_bytes:
+            _key, (_value, size) = self._entries.popitem(last=False)
+            self._nbytes -= size
+            self.evictions += 1
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        """ヒット・ミス・追い出しの回数と使用量"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# プロセス全体で 1 つだけ使う
+geometry_cache = GeometryCache()
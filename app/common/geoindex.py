@@ -0,0 +1,104 @@
+"""bbox・中心座標の事前計算インデックス
+
+アセットの座標をリクエスト時に走査しないよう、地域コードごとに
+bbox・中心座標・フィーチャー単位の bbox をビルド時に計算しておく。
+
+生成方法（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m common.geoindex
+"""
+
+import json
+
+import numpy as np
+import streamlit as st
+
+from common.const import Const
+from common.geometry import pack
+
+CONST = Const()
+
+BASE_DIR = CONST.base_dir
+INDEX_FILE = CONST.index_file
+REGIONS = CONST.regions
+
+INDEX_VERSION = 1
+
+
+def build_entry(geojson) -> dict:
+    """GeoJSON 1 件分のインデックスを作成する"""
+    packed = pack(geojson)
+    bbox = packed.bbox()
+    center = [(bbox[1] + bbox[3]) / 2, (bbox[0] + bbox[2]) / 2]
+    features = [None if np.isnan(b[0]) else b.tolist() for b in packed.feature_bboxes()]
+
+    return {"bbox": bbox, "center": center, "features": features}
+
+
+def build_index(base_dir: str = BASE_DIR, regions=REGIONS) -> dict:
+    """全アセットのインデックスを作成する"""
+    entries = {}
+    for region in regions:
+        with open(f"{base_dir}{region}.json", "r", encoding="utf-8") as f:
+            entries[region] = build_entry(json.load(f))
+
+    return {"version": INDEX_VERSION, "regions": entries}
+
+
+def write_index(index: dict, base_dir: str = BASE_DIR) -> str:
+    path = f"{base_dir}{INDEX_FILE}"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+
+    return path
+
+
+@st.cache_resource
+def load_index() -> dict:
+    """インデックスを読み込む（プロセス内で共有・読み取り専用）"""
+    path = f"{BASE_DIR}{INDEX_FILE}"
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        return {}
+
+    if index.get("version") != INDEX_VERSION:
+        return {}
+
+    return index.get("regions", {})
+
+
+def lookup(region: str) -> dict | None:
+    """地域コードからインデックスを引く（未登録なら None）"""
+    return load_index().get(region)
+
+
+def get_region_center(region: str) -> tuple[float, float] | None:
+    """地域の中心座標 (lat, lon) を返す"""
+    if entry := lookup(region):
+        lat, lon = entry["center"]
+        return lat, lon
+
+    return None
+
+
+def get_region_bbox(region: str) -> list[float] | None:
+    """地域の bbox [min_lon, min_lat, max_lon, max_lat] を返す"""
+    if entry := lookup(region):
+        return entry["bbox"]
+
+    return None
+
+
+def get_feature_bbox(region: str, index: int) -> list[float] | None:
+    """フィーチャー単位の bbox を返す（geometry が無い場合は None）"""
+    if entry := lookup(region):
+        return entry["features"][index]
+
+    return None
+
+
+if __name__ == "__main__":
+    path = write_index(build_index())
+    print(f"wrote {path}")
@@ -0,0 +1,257 @@
+"""NumPy によるジオメトリ計算
+
+GeoJSON のリングを 1 本の座標配列とオフセット表に詰め、bbox・面積・
+面積重み付きの重心をリング単位の配列演算でまとめて求める。
+座標は経緯度のまま平面として扱う。
+"""
+
+import itertools
+from collections.abc import Iterable, Iterator
+from functools import cached_property
+from typing import Self
+
+import numpy as np
+
+
+def _polygons(geometry) -> list:
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+
+    return []
+
+
+def _feature_rings(feature) -> list:
+    geometry = feature.get("geometry")
+    if geometry is None:
+        return []
+
+    return [
+        (j == 0, ring)
+        for polygon in _polygons(geometry)
+        for j, ring in enumerate(polygon)
+        if len(ring)
+    ]
+
+
+def _flatten(rings: list, n_points: int) -> np.ndarray:
+    """入れ子のリストを 1 回の走査で (n_points, 2) の配列にする"""
+    chain = itertools.chain.from_iterable
+    flat = np.fromiter(chain(chain(rings)), dtype=np.float64)
+    if len(flat) == 2 * n_points:
+        return flat.reshape(-1, 2)
+
+    # 高さなど 3 次元目を持つ座標
+    return np.concatenate([np.asarray(ring, dtype=np.float64)[:, :2] for ring in rings])
+
+
+class PackedGeometry:
+    """リング単位に詰めた座標配列
+
+    coords: (n_points, 2) の [経度, 緯度]
+    ring_offsets: リング i は coords[ring_offsets[i]:ring_offsets[i + 1]]
+    ring_feature: リングが属するフィーチャーの番号（昇順）
+    ring_exterior: 外周なら True、穴なら False
+    """
+
+    def __init__(
+        self,
+        coords: np.ndarray,
+        ring_offsets: np.ndarray,
+        ring_feature: np.ndarray,
+        ring_exterior: np.ndarray,
+        n_features: int,
+    ) -> None:
+        self.coords = coords
+        self.ring_offsets = ring_offsets
+        self.ring_feature = ring_feature
+        self.ring_exterior = ring_exterior
+        self.n_features = n_features
+
+    @classmethod
+    def from_geojson(cls, geojson) -> Self:
+        rings = []
+        ring_feature = []
+        ring_exterior = []
+
+        for i, feature in enumerate(geojson["features"]):
+            for exterior, ring in _feature_rings(feature):
+                rings.append(ring)
+                ring_feature.append(i)
+                ring_exterior.append(exterior)
+
+        lengths = [len(ring) for ring in rings]
+
+        return cls(
+            _flatten(rings, sum(lengths)),
+            np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]),
+            np.asarray(ring_feature, dtype=np.int64),
+            np.asarray(ring_exterior, dtype=bool),
+            len(geojson["features"]),
+        )
+
+    @classmethod
+    def from_features(cls, features: Iterable[dict]) -> Self:
+        """フィーチャーを 1 つずつ受け取って詰める（全体の入れ子構造を持たない）
+
+        geostream.stream_features と組み合わせると、座標はフィーチャーごとに
+        配列へ移して元のリストを手放すので、ピークメモリが配列の大きさに近づく。
+        """
+        chunks = [np.empty((0, 2))]
+        lengths = []
+        ring_feature = []
+        ring_exterior = []
+
+        n_features = 0
+        for i, feature in enumerate(features):
+            n_features = i + 1
+            if not (rings := _feature_rings(feature)):
+                continue
+
+            feature_lengths = [len(ring) for _exterior, ring in rings]
+            chunks.append(
+                _flatten([ring for _exterior, ring in rings], sum(feature_lengths))
+            )
+            lengths.extend(feature_lengths)
+            ring_feature.extend([i] * len(rings))
+            ring_exterior.extend(exterior for exterior, _ring in rings)
+
+        return cls(
+            np.concatenate(chunks),
+            np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]),
+            np.asarray(ring_feature, dtype=np.int64),
+            np.asarray(ring_exterior, dtype=bool),
+            n_features,
+        )
+
+    @classmethod
+    def from_store(cls, store) -> Self:
+        """バイナリストアの配列をそのまま使う（座標はコピーしない）"""
+        polygons_per_feature = np.diff(store.feature_offsets)
+        rings_per_polygon = np.diff(store.polygon_offsets)
+        polygon_feature = np.repeat(
+            np.arange(len(store), dtype=np.int64), polygons_per_feature
+        )
+
+        ring_exterior = np.zeros(len(store.ring_offsets) - 1, dtype=bool)
+        ring_exterior[store.polygon_offsets[:-1][rings_per_polygon > 0]] = True
+
+        return cls(
+            store.coords,
+            store.ring_offsets,
+            np.repeat(polygon_feature, rings_per_polygon),
+            ring_exterior,
+            len(store),
+        )
+
+    @property
+    def n_rings(self) -> int:
+        return len(self.ring_offsets) - 1
+
+    @cached_property
+    def ring_bboxes(self) -> np.ndarray:
+        """リングごとの [min_lon, min_lat, max_lon, max_lat]"""
+        if self.n_rings == 0:
+            return np.empty((0, 4))
+
+        starts = self.ring_offsets[:-1]
+        return np.hstack(
+            [
+                np.minimum.reduceat(self.coords, starts, axis=0),
+                np.maximum.reduceat(self.coords, starts, axis=0),
+            ]
+        )
+
+    def bbox(self) -> list[float]:
+        """外周リング全体の bbox"""
+        exterior = self.ring_bboxes[self.ring_exterior]
+        if len(exterior) == 0:
+            raise ValueError("GeoJSON に有効な座標が含まれていません")
+
+        return [
+            *exterior[:, :2].min(axis=0).tolist(),
+            *exterior[:, 2:].max(axis=0).tolist(),
+        ]
+
+    def feature_bboxes(self) -> np.ndarray:
+        """フィーチャーごとの bbox（geometry が無いフィーチャーは NaN）"""
+        out = np.full((self.n_features, 4), np.nan)
+        lower = np.full((self.n_features, 2), np.inf)
+        upper = np.full((self.n_features, 2), -np.inf)
+
+        exterior = self.ring_exterior
+        features = self.ring_feature[exterior]
+        np.minimum.at(lower, features, self.ring_bboxes[exterior, :2])
+        np.maximum.at(upper, features, self.ring_bboxes[exterior, 2:])
+
+        found = np.isfinite(lower[:, 0])
+        out[found, :2] = lower[found]
+        out[found, 2:] = upper[found]
+        return out
+
+    @cached_property
+    def _ring_moments(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """リングごとの面積と 1 次モーメント（外周は正、穴は負にそろえる）"""
+        if self.n_rings == 0 or len(self.coords) < 2:
+            zeros = np.zeros(self.n_rings)
+            return zeros, zeros, zeros
+
+        x, y = self.coords[:, 0], self.coords[:, 1]
+        cross = x[:-1] * y[1:] - x[1:] * y[:-1]
+        # リングの境目をまたぐ辺は除く
+        cross[self.ring_offsets[1:-1] - 1] = 0.0
+
+        starts = self.ring_offsets[:-1]
+        area2 = np.add.reduceat(cross, starts)
+        mx = np.add.reduceat((x[:-1] + x[1:]) * cross, starts)
+        my = np.add.reduceat((y[:-1] + y[1:]) * cross, starts)
+
+        sign = np.where(self.ring_exterior, 1.0, -1.0) * np.sign(area2)
+        return area2 * sign / 2, mx * sign / 6, my * sign / 6
+
+    def areas(self) -> np.ndarray:
+        """フィーチャーごとの面積（平方度）"""
+        area, _mx, _my = self._ring_moments
+        return np.bincount(self.ring_feature, area, minlength=self.n_features)
+
+    def centroids(self) -> np.ndarray:
+        """フィーチャーごとの面積重み付き重心 [経度, 緯度]（面積 0 なら bbox の中心）"""
+        area, mx, my = self._ring_moments
+        total = np.bincount(self.ring_feature, area, minlength=self.n_features)
+        moments = np.column_stack(
+            [
+                np.bincount(self.ring_feature, mx, minlength=self.n_features),
+                np.bincount(self.ring_feature, my, minlength=self.n_features),
+            ]
+        )
+
+        bboxes = self.feature_bboxes()
+        out = (bboxes[:, :2] + bboxes[:, 2:]) / 2
+        has_area = total > 0
+        out[has_area] = moments[has_area] / total[has_area, None]
+        return out
+
+    def centroid(self) -> tuple[float, float]:
+        """全体の面積重み付き重心 (lat, lon)"""
+        area, mx, my = self._ring_moments
+        total = area.sum()
+        if total <= 0:
+            raise ValueError("GeoJSON に有効な座標が含まれていません")
+
+        return float(my.sum() / total), float(mx.sum() / total)
+
+
+def pack(data) -> PackedGeometry:
+    """GeoJSON（バイナリストア・その遅延ビュー・フィーチャーの列でもよい）を詰めた配列にする"""
+    if isinstance(data, PackedGeometry):
+        return data
+
+    if isinstance(data, Iterator):
+        return PackedGeometry.from_features(data)
+
+    store = getattr(data, "store", data)
+    if hasattr(store, "ring_offsets"):
+        return PackedGeometry.from_store(store)
+
+    return PackedGeometry.from_geojson(data)
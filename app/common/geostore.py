@@ -0,0 +1,285 @@
+"""メモリマップ型のバイナリジオメトリストア
+
+GeoJSON の座標を平坦な float64/float32 配列に詰め、ポリゴン・リングの
+オフセット表と一緒に 1 ファイルへ書き出す。読み込みは mmap で行うので、
+複数のワーカープロセスは OS のページキャッシュを共有できる。
+
+ファイル構成（リトルエンディアン）:
+    MAGIC (8 bytes) | ヘッダー長 uint32 | 予約 uint32 | ヘッダー JSON |
+    feature_offsets int64[n_features + 1] |
+    polygon_offsets int64[n_polygons + 1] |
+    ring_offsets int64[n_rings + 1] |
+    coords dtype[n_points * 2]
+
+生成方法（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m common.geostore [--float32]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Sequence
+from itertools import pairwise
+
+import numpy as np
+import streamlit as st
+
+from common.const import Const
+
+CONST = Const()
+
+BASE_DIR = CONST.base_dir
+BUILD_DIR = CONST.build_dir
+REGIONS = CONST.regions
+
+STORE_EXTENSION = ".geo"
+
+MAGIC = b"PQGEO\x00\x00\x01"
+_PREFIX = struct.Struct("<8sII")
+_ALIGN = 8
+
+
+def _pad(n: int) -> int:
+    return -n % _ALIGN
+
+
+def _polygons(geometry) -> list:
+    if geometry is None:
+        return []
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+
+    raise ValueError(f"未対応のジオメトリです: {geometry['type']}")
+
+
+def write_store(geojson, path: str, dtype: str = "<f8") -> int:
+    """GeoJSON をバイナリストアへ書き出し、書き込んだバイト数を返す"""
+    feature_offsets = [0]
+    polygon_offsets = [0]
+    ring_offsets = [0]
+    coords: list[float] = []
+    types = []
+    properties = []
+
+    for feature in geojson["features"]:
+        geometry = feature.get("geometry")
+        types.append(geometry["type"] if geometry else None)
+        properties.append(feature.get("properties"))
+
+        for polygon in _polygons(geometry):
+            for ring in polygon:
+                for lon, lat, *_ in ring:
+                    coords.append(lon)
+                    coords.append(lat)
+                ring_offsets.append(len(coords) // 2)
+            polygon_offsets.append(len(ring_offsets) - 1)
+        feature_offsets.append(len(polygon_offsets) - 1)
+
+    header = {
+        "dtype": np.dtype(dtype).str,
+        "n_features": len(types),
+        "n_polygons": len(polygon_offsets) - 1,
+        "n_rings": len(ring_offsets) - 1,
+        "n_points": len(coords) // 2,
+        "types": types,
+        "properties": properties,
+        "extra": {k: v for k, v in geojson.items() if k != "features"},
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+    header_bytes += b" " * _pad(_PREFIX.size + len(header_bytes))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(header_bytes), 0))
+        f.write(header_bytes)
+        f.writelines(
+            np.asarray(offsets, dtype="<i8").tobytes()
+            for offsets in (feature_offsets, polygon_offsets, ring_offsets)
+        )
+        f.write(np.asarray(coords, dtype=dtype).tobytes())
+
+        return f.tell()
+
+
+class GeoStore:
+    """バイナリストアの読み取り専用ビュー（配列は mmap を直接参照する）"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, header_len, _ = _PREFIX.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"バイナリストアではありません: {path}")
+
+        offset = _PREFIX.size
+        header = json.loads(self._mmap[offset : offset + header_len])
+        offset += header_len
+
+        self.types: list[str | None] = header["types"]
+        self.properties: list[dict] = header["properties"]
+        self.extra: dict = header["extra"]
+
+        def take(dtype, count):
+            nonlocal offset
+            array = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=offset)
+            offset += array.nbytes
+            return array
+
+        self.feature_offsets = take("<i8", header["n_features"] + 1)
+        self.polygon_offsets = take("<i8", header["n_polygons"] + 1)
+        self.ring_offsets = take("<i8", header["n_rings"] + 1)
+        self.coords = take(header["dtype"], header["n_points"] * 2).reshape(-1, 2)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def polygon_rings(self, polygon: int) -> list[np.ndarray]:
+        """ポリゴン 1 つ分のリング（外周・穴）を (n, 2) 配列で返す"""
+        first, last = self.polygon_offsets[polygon], self.polygon_offsets[polygon + 1]
+        bounds = self.ring_offsets[first : last + 1]
+        return [self.coords[a:b] for a, b in pairwise(bounds)]
+
+    def geometry(self, index: int) -> dict | None:
+        """フィーチャーのジオメトリを GeoJSON として組み立てる"""
+        geometry_type = self.types[index]
+        if geometry_type is None:
+            return None
+
+        first, last = self.feature_offsets[index], self.feature_offsets[index + 1]
+        polygons = [
+            [ring.tolist() for ring in self.polygon_rings(p)]
+            for p in range(first, last)
+        ]
+        coordinates = polygons[0] if geometry_type == "Polygon" else polygons
+
+        return {"type": geometry_type, "coordinates": coordinates}
+
+    def feature(self, index: int) -> dict:
+        return {
+            "type": "Feature",
+            "geometry": self.geometry(index),
+            "properties": self.properties[index],
+        }
+
+    def to_geojson(self) -> dict:
+        """全体を通常の GeoJSON dict として展開する"""
+        return {**self.extra, "features": [self.feature(i) for i in range(len(self))]}
+
+    def view(self) -> GeoJSONView:
+        return GeoJSONView(self)
+
+
+class FeatureView(Mapping):
+    """フィーチャー 1 件の遅延ビュー（geometry は参照時に組み立てる）"""
+
+    _KEYS = ("type", "geometry", "properties")
+
+    def __init__(self, store: GeoStore, index: int) -> None:
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key):
+        if key == "type":
+            return "Feature"
+        if key == "geometry":
+            return self._store.geometry(self._index)
+        if key == "properties":
+            return self._store.properties[self._index]
+
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+
+class FeatureSequence(Sequence):
+    def __init__(self, store: GeoStore) -> None:
+        self._store = store
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        return FeatureView(self._store, index)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+class GeoJSONView(Mapping):
+    """FeatureCollection の遅延ビュー"""
+
+    def __init__(self, store: GeoStore) -> None:
+        self.store = store
+        self._features = FeatureSequence(store)
+
+    def __getitem__(self, key):
+        if key == "features":
+            return self._features
+
+        return self.store.extra[key]
+
+    def __iter__(self):
+        yield from self.store.extra
+        yield "features"
+
+    def __len__(self) -> int:
+        return len(self.store.extra) + 1
+
+    def to_geojson(self) -> dict:
+        return self.store.to_geojson()
+
+
+@st.cache_resource
+def open_store(path: str) -> GeoStore:
+    """バイナリストアを開く（プロセス内で共有・読み取り専用）"""
+    return GeoStore(path)
+
+
+def convert_all(
+    base_dir: str = BASE_DIR,
+    build_dir: str = BUILD_DIR,
+    regions=REGIONS,
+    dtype: str = "<f8",
+) -> dict[str, tuple[int, int]]:
+    """全アセットを変換し、地域コードごとの (元サイズ, 変換後サイズ) を返す"""
+    sizes = {}
+    for region in regions:
+        src = f"{base_dir}{region}.json"
+        with open(src, "r", encoding="utf-8") as f:
+            geojson = json.load(f)
+
+        written = write_store(geojson, f"{build_dir}{region}{STORE_EXTENSION}", dtype)
+        sizes[region] = (os.path.getsize(src), written)
+
+    return sizes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--float32", action="store_true", help="座標を float32 で保存する"
+    )
+    args = parser.parse_args()
+
+    sizes = convert_all(dtype="<f4" if args.float32 else "<f8")
+    for region, (src, dst) in sizes.items():
+        print(f"{region}: {src:,} -> {dst:,} bytes")
@@ -0,0 +1,208 @@
+"""GeoJSON のフィーチャー単位の逐次読み込み
+
+json.load はファイル全体の文字列と入れ子の Python オブジェクトを同時に持つので、
+読み込み中のメモリはファイルサイズの数倍になり、解析が終わるまで何も使えない。
+iter_features は FeatureCollection の "features" 配列を少しずつ読み、
+フィーチャーを 1 つずつ返す（解析は json.JSONDecoder.raw_decode に任せる）。
+圧縮ファイル（".json.gz" など）は展開しながら読む。
+
+受け取った側でフィーチャーを捨てていけば、全体の入れ子構造を持たずに
+詰めた座標配列（PackedGeometry.from_features）や属性テーブル
+（AttributeTable.from_features）を作れる。
+
+json.load との比較（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m common.geostream [地域コード ...]
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import time
+import tracemalloc
+from collections.abc import Iterable, Iterator
+
+from common.compressed import codec_of, decompressing_reader
+from common.const import Const
+from common.geometry import PackedGeometry
+
+CONST = Const()
+
+BASE_DIR = CONST.base_dir
+
+_CHUNK_SIZE = 1 << 16
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _Scanner:
+    """テキストストリームを必要な分だけ読み進めるバッファ"""
+
+    def __init__(self, reader, chunk_size: int) -> None:
+        self._reader = reader
+        self._chunk_size = chunk_size
+        self._text = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int) -> bool:
+        """size 文字以上を読み足す（終端なら False）"""
+        if self._eof:
+            return False
+
+        # 読み終えた部分は捨てる
+        self._text = self._text[self._pos :]
+        self._pos = 0
+
+        chunk = self._reader.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+
+        self._text += chunk
+        return True
+
+    def peek(self) -> str:
+        """空白を読み飛ばして次の 1 文字を返す（終端なら ""）"""
+        while True:
+            self._pos = _WHITESPACE.match(self._text, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._text):
+                return self._text[self._pos]
+            if not self._fill(self._chunk_size):
+                return ""
+
+    def expect(self, char: str) -> None:
+        if (found := self.peek()) != char:
+            raise ValueError(
+                f"GeoJSON の解析に失敗しました: {char!r} の位置に {found!r}"
+            )
+        self._pos += 1
+
+    def value(self):
+        """次の JSON 値を 1 つ解析する（足りなければ読み足して解析し直す）"""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._text, self._pos)
+            except json.JSONDecodeError:
+                # 途中で切れた値は、未解析の長さと同じだけ読み足して解析し直す
+                if not self._fill(max(self._chunk_size, len(self._text) - self._pos)):
+                    raise
+                continue
+
+            # 末尾で終わった数値は続きがあるかもしれない
+            if end == len(self._text) and self._fill(self._chunk_size):
+                continue
+
+            self._pos = end
+            return value
+
+
+def iter_features(fileobj, chunk_size: int = _CHUNK_SIZE) -> Iterator[dict]:
+    """FeatureCollection（バイナリストリーム）のフィーチャーを順に返す
+
+    "features" 以外のメンバー（"type" や "name" など）は読み飛ばす。
+    壊れた・途中で切れた JSON は ValueError を送出する。
+    """
+    scanner = _Scanner(io.TextIOWrapper(fileobj, encoding="utf-8"), chunk_size)
+
+    scanner.expect("{")
+    while (char := scanner.peek()) != "}":
+        if char == ",":
+            scanner.expect(",")
+            continue
+
+        key = scanner.value()
+        scanner.expect(":")
+        if key != "features":
+            scanner.value()
+            continue
+
+        scanner.expect("[")
+        while (char := scanner.peek()) != "]":
+            if char == ",":
+                scanner.expect(",")
+                continue
+            if not char:
+                raise ValueError("GeoJSON の features が途中で終わっています")
+
+            yield scanner.value()
+
+        scanner.expect("]")
+
+
+def stream_features(path: str, chunk_size: int = _CHUNK_SIZE) -> Iterator[dict]:
+    """ファイルのフィーチャーを順に返す（拡張子が圧縮形式なら展開しながら）"""
+    with open(path, "rb") as f:
+        if (codec := codec_of(path)) is None:
+            yield from iter_features(f, chunk_size)
+            return
+
+        with decompressing_reader(f, codec) as reader:
+            yield from iter_features(reader, chunk_size)
+
+
+def collect(features: Iterable[dict]) -> dict:
+    """フィーチャーを FeatureCollection にまとめる"""
+    return {"type": "FeatureCollection", "features": list(features)}
+
+
+def _measure(func, *args) -> tuple[float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        func(*args)
+        return time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare(
+    regions, base_dir: str = BASE_DIR
+) -> list[tuple[str, int, float, int, float, int]]:
+    """詰めた座標配列を作るまでの時間とピークメモリを json.load と比べる
+
+    戻り値は (地域コード, ファイルサイズ, json.load の秒, そのピーク,
+    逐次読み込みの秒, そのピーク) のリスト。
+    """
+
+    def load(path):
+        with open(path, "rb") as f:
+            return PackedGeometry.from_geojson(json.load(f))
+
+    def stream(path):
+        return PackedGeometry.from_features(stream_features(path))
+
+    report = []
+    for region in regions:
+        path = f"{base_dir}{region}.json"
+        report.append(
+            (
+                region,
+                os.path.getsize(path),
+                *_measure(load, path),
+                *_measure(stream, path),
+            )
+        )
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "regions", nargs="*", default=["03", "42", "04"], help="地域コード"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'region':<16} {'size':>12} {'json.load':>10} {'peak':>12}"
+        f" {'stream':>10} {'peak':>12}"
+    )
+    for region, size, t_load, m_load, t_stream, m_stream in compare(args.regions):
+        print(
+            f"{region:<16} {size:>12,} {t_load * 1000:>8.1f}ms {m_load:>12,}"
+            f" {t_stream * 1000:>8.1f}ms {m_stream:>12,}"
+        )
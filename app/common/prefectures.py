@@ -0,0 +1,99 @@
+"""都道府県の表（変更不可・名前などから O(1) で引ける）
+
+行は JIS の都道府県コード順に並べ、行番号 + 1 がコードになる。
+レコードは __slots__ を持つ変更不可のオブジェクトで、緯度・経度は
+行番号をそろえた float64 の配列（読み取り専用の memoryview）としても持つので、
+NumPy へはコピーせずに渡せる（np.frombuffer(table.lat)）。
+
+都道府県名・県庁所在地・コードから行番号への辞書は作成時に 1 度だけ作り、
+重複があれば ValueError を送出する。
+"""
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import overload
+
+
+@dataclass(frozen=True, slots=True)
+class Prefecture:
+    """都道府県 1 件（index は表の行番号、code は都道府県コード "01"〜"47"）"""
+
+    index: int
+    code: str
+    name: str
+    capital: str
+    lat: float
+    lon: float
+
+
+def _index(values: Iterable[str], label: str) -> MappingProxyType[str, int]:
+    index: dict[str, int] = {}
+    for i, value in enumerate(values):
+        if value in index:
+            raise ValueError(f"{label}が重複しています: {value}")
+        index[value] = i
+
+    return MappingProxyType(index)
+
+
+class PrefectureTable(Sequence[Prefecture]):
+    """都道府県の表（行番号・都道府県名・県庁所在地・コードで引ける）"""
+
+    __slots__ = (
+        "_records",
+        "capital_index",
+        "capitals",
+        "code_index",
+        "lat",
+        "lon",
+        "name_index",
+        "names",
+    )
+
+    def __init__(self, rows: Iterable[tuple[str, str, float, float]]) -> None:
+        self._records = tuple(
+            Prefecture(i, f"{i + 1:02d}", name, capital, float(lat), float(lon))
+            for i, (name, capital, lat, lon) in enumerate(rows)
+        )
+
+        self.names = tuple(p.name for p in self._records)
+        self.capitals = tuple(p.capital for p in self._records)
+        self.lat = memoryview(array("d", (p.lat for p in self._records))).toreadonly()
+        self.lon = memoryview(array("d", (p.lon for p in self._records))).toreadonly()
+
+        self.name_index = _index(self.names, "都道府県名")
+        self.capital_index = _index(self.capitals, "県庁所在地")
+        self.code_index = _index((p.code for p in self._records), "都道府県コード")
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @overload
+    def __getitem__(self, index: int) -> Prefecture: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[Prefecture, ...]: ...
+
+    def __getitem__(self, index):
+        return self._records[index]
+
+    def __iter__(self) -> Iterator[Prefecture]:
+        return iter(self._records)
+
+    def by_name(self, name: str) -> Prefecture | None:
+        if (i := self.name_index.get(name)) is None:
+            return None
+        return self._records[i]
+
+    def by_capital(self, capital: str) -> Prefecture | None:
+        if (i := self.capital_index.get(capital)) is None:
+            return None
+        return self._records[i]
+
+    def by_code(self, code: str) -> Prefecture | None:
+        """都道府県コード（行政区域コードの上 2 桁）で引く"""
+        if (i := self.code_index.get(code[:2])) is None:
+            return None
+        return self._records[i]
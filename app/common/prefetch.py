@@ -0,0 +1,134 @@
+"""選択した都道府県と隣接県の先読み
+
+学習ページで都道府県を選ぶと、次のステップで表示する市町村の
+簡略化ジオメトリと属性テーブルをバックグラウンドのスレッドプールで
+キャッシュに載せておく。隣接県も一緒に読むので、選び直しても待たない。
+
+隣接関係は都道府県レイヤーの境界から作る（頂点を共有する県どうしを隣接とみなす）。
+北海道・沖縄県のように陸続きの県がないものは隣接県を持たない。
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+import numpy as np
+import streamlit as st
+
+from common.attributes import load_attributes
+from common.const import Const
+from common.geometry import pack
+from common.utils import load_data
+from common.warmup import load_region
+
+CONST = Const()
+
+# 頂点を同一とみなす座標の桁数（度の小数点以下）
+PRECISION = 6
+
+# 次のステップで都道府県コードのほかに開くことがある地域
+EXTRA_REGIONS = {"01": ["01_subprefecture"]}  # 北海道は振興局も選べる
+
+logger = logging.getLogger(__name__)
+
+
+def neighbour_graph(geojson, precision: int = PRECISION) -> dict[str, list[str]]:
+    """地域コード（N03_007 の上 2 桁）→ 境界の頂点を共有する地域コード"""
+    codes = [f["properties"]["N03_007"][:2] for f in geojson["features"]]
+    graph: dict[str, set[str]] = {code: set() for code in codes}
+
+    packed = pack(geojson)
+    if packed.n_rings == 0:
+        return {code: [] for code in graph}
+
+    # 頂点ごとのフィーチャー番号を作り、同じ頂点を持つ異なるフィーチャーを組にする
+    features = np.repeat(packed.ring_feature, np.diff(packed.ring_offsets))
+    grid = np.round(packed.coords[:, :2] * 10**precision).astype(np.int64)
+    order = np.lexsort((features, grid[:, 1], grid[:, 0]))
+    grid, features = grid[order], features[order]
+
+    same = (grid[1:] == grid[:-1]).all(axis=1) & (features[1:] != features[:-1])
+    for a, b in set(zip(features[:-1][same].tolist(), features[1:][same].tolist())):
+        if codes[a] != codes[b]:
+            graph[codes[a]].add(codes[b])
+            graph[codes[b]].add(codes[a])
+
+    return {code: sorted(neighbours) for code, neighbours in graph.items()}
+
+
+@st.cache_resource
+def load_neighbours() -> dict[str, list[str]]:
+    """都道府県の隣接グラフ（プロセスで共有）"""
+    return neighbour_graph(load_data("prefecture"))
+
+
+class Prefetcher:
+    """地域の先読み（読み込み中の地域は重ねて投入しない）"""
+
+    def __init__(self, workers: int = CONST.prefetch_workers) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="prefetch"
+        )
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, regions: list[str]) -> list[Future]:
+        """regions をこの順に読み込み始める"""
+        futures = []
+        submitted = []
+        with self._lock:
+            for region in regions:
+                if (future := self._pending.get(region)) is None:
+                    future = self._pending[region] = self._executor.submit(
+                        self._load, region
+                    )
+                    submitted.append((region, future))
+                futures.append(future)
+
+        # 終わっていればその場で呼ばれるのでロックの外で登録する
+        for region, future in submitted:
+            future.add_done_callback(lambda f, region=region: self._finish(region, f))
+
+        return futures
+
+    def _load(self, region: str) -> None:
+        try:
+            load_region(region)
+            load_attributes(region)
+        except (OSError, ValueError) as e:
+            logger.warning("prefetch %s failed: %s", region, e)
+
+    def _finish(self, region: str, future: Future) -> None:
+        with self._lock:
+            self._pending.pop(region, None)
+
+        if (error := future.exception()) is not None:
+            # 想定外の例外はトレースバックを残す
+            logger.error("prefetch %s failed", region, exc_info=error)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """読み込み中の地域が全て終わるまで待つ（timeout 秒を過ぎたら False）"""
+        with self._lock:
+            futures = list(self._pending.values())
+
+        _done, not_done = wait(futures, timeout=timeout)
+        return not not_done
+
+
+@st.cache_resource
+def load_prefetcher() -> Prefetcher | None:
+    """プロセスで共有する先読み（PREFETCH_WORKERS=0 なら無効）"""
+    if CONST.prefetch_workers <= 0:
+        return None
+
+    return Prefetcher()
+
+
+def prefetch_around(code: str) -> list[Future]:
+    """都道府県 code と隣接県を先読みする"""
+    if (prefetcher := load_prefetcher()) is None:
+        return []
+
+    return prefetcher.prefetch(
+        [code, *EXTRA_REGIONS.get(code, []), *load_neighbours().get(code, [])]
+    )
@@ -1,32 +1,104 @@
-import pydeck as pdk
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, NamedTuple
+
 import streamlit as st
+
+from common.const import Const
+from common.deckspec import DeckSpec, serialize_layers
+from common.geoindex import get_region_center
+from common.geometry import pack
+from common.geostream import collect
+from common.prefetch import prefetch_around
+from common.simplify import select_tier
+from common.tracing import span, traced
 from common.utils import get_geojson_center
 
+if TYPE_CHECKING:
+    import pydeck as pdk
+
+CONST = Const()
+
+DECK_CACHE_ENTRIES = CONST.deck_cache_entries
+LAYER_FORMAT = CONST.map_layer_format
+
+# レイヤーの形式（GeoJSON のまま / ポリゴンごとの平らな座標配列）
+LAYER_FORMATS = ("geojson", "flat")
+
 ss = st.session_state
 
+# 選択イベントに残す属性（都道府県名・振興局名・市町村名・行政区域コード）
+SELECTION_KEYS = ("N03_001", "N03_002", "N03_004", "N03_007")
 
-@st.fragment
-def make_map(
-    data,
-    has_tip: bool = False,
-    zoom: int = 4,
-    min_zoom: int = 4,
-    max_zoom: int = 12,
-    area_code: int = 1,
-    map_provider: str | None = None,
-    lat: float | None = None,
-    lon: float | None = None,
-    get_line_width: int = 100,
-):
-    if has_tip:
-        area = f"<b>{{N03_00{area_code}}}</b>"
-    else:
-        area = "<b>どこかな？</b>"
 
-    if None in (lat, lon):
-        lat, lon = get_geojson_center(data)
+class Selection(NamedTuple):
+    """選択したフィーチャーのレイヤー内の番号と、必要な属性だけ
+
+    region は選んだ地図の地域コード（番号はその地域のレイヤーの中でだけ意味を持つ）。
+    """
+
+    index: int
+    properties: dict
+    region: str | None = None
+
+
+def select_feature(features, index: int, region: str | None = None) -> Selection:
+    """サーバー側のデータから選択フィーチャーの属性を引く"""
+    properties = features[index]["properties"] or {}
+    return Selection(
+        index, {key: properties.get(key) for key in SELECTION_KEYS}, region
+    )
+
+
+def selected_properties(event) -> dict | None:
+    """選択イベント（Selection か pydeck の選択オブジェクト）の属性"""
+    if event is None:
+        return None
+    if isinstance(event, Selection):
+        return event.properties
+
+    return event.geojson[0]["properties"]
+
+
+def selected_in(event, region: str) -> Selection | None:
+    """region の地図で選んだ選択イベント（別の地図で選んだものは None）
 
-    view_state = pdk.ViewState(
+    ステップを移ったり北海道の振興局・市町村を切り替えたりすると、前の地図の
+    選択が残る。その番号を今の地図のレイヤーに当てはめないよう地域を確かめる。
+    """
+    if isinstance(event, Selection) and event.region == region:
+        return event
+
+    return None
+
+
+def as_geojson(data):
+    """描画に渡せる GeoJSON にする
+
+    バイナリストアの遅延ビューは展開し、逐次読み込みのフィーチャーの列
+    （utils.stream_data）は FeatureCollection にまとめる。
+    """
+    if hasattr(data, "to_geojson"):
+        return data.to_geojson()
+    if isinstance(data, Iterator):
+        return collect(data)
+
+    return data
+
+
+TOOLTIP_STYLE = {
+    "background-color": "#515254",  # アスファルト
+    "color": "#b2ffff",  # チェレステ
+    "font-family": "Noto Sans JP, sans-serif",
+    "border-radius": "50% 20% / 10% 40%",
+}
+
+
+def _view_state(lat, lon, zoom, min_zoom, max_zoom) -> pdk.ViewState:
+    import pydeck as pdk
+
+    return pdk.ViewState(
         latitude=lat,
         longitude=lon,
         zoom=zoom,
@@ -36,7 +108,11 @@ def make_map(
         bearing=0,
     )
 
-    geojson = pdk.Layer(
+
+def _geojson_layer(data, get_line_width: int) -> pdk.Layer:
+    import pydeck as pdk
+
+    return pdk.Layer(
         "GeoJsonLayer",
         data,
         id="geojson",
@@ -47,30 +123,238 @@ def make_map(
         get_line_width=get_line_width,
     )
 
-    tooltip = {
-        "html": area,
-        "style": {
-            "background-color": "#515254",  # アスファルト
-            "color": "#b2ffff",  # チェレステ
-            "font-family": "Noto Sans JP, sans-serif",
-            "border-radius": "50% 20% / 10% 40%",
-        },
-    }
-
-    r = pdk.Deck(
+
+def flat_polygons(data) -> list[dict]:
+    """ポリゴンごとに平らな座標配列を持つ行にする（PolygonLayer 用）
+
+    各行は {"feature": フィーチャーの番号, "polygon": ..., "properties": {...}}。
+    polygon は穴がなければ [経度, 緯度, ...] の平らな配列、穴があれば
+    {"positions": 平らな配列, "holeIndices": [穴の先頭の positions 上の位置, ...]}。
+    リングを閉じる最後の点は deck.gl が補うので省く。
+    MultiPolygon はポリゴンごとに行を分け、feature で元のフィーチャーを指す。
+    属性はツールチップと選択に使うもの（SELECTION_KEYS）だけを残す。
+    """
+    import numpy as np
+
+    data = as_geojson(data)
+    packed = pack(data)
+    coords = packed.coords
+    offsets = packed.ring_offsets
+
+    # 閉じたリングの最後の点を除いた座標とオフセット
+    first, last = offsets[:-1], offsets[1:] - 1
+    closed = (last > first) & np.all(coords[first] == coords[last], axis=1)
+    keep = np.ones(len(coords), dtype=bool)
+    keep[last[closed]] = False
+    coords = coords[keep]
+    offsets = np.concatenate([[0], np.cumsum(np.diff(offsets) - closed)])
+
+    # ポリゴン i は外周のリング starts[i] から次の外周の手前まで
+    starts = np.append(np.flatnonzero(packed.ring_exterior), packed.n_rings)
+
+    features = data["features"]
+    properties = {}
+    records = []
+    for a, b in zip(starts[:-1].tolist(), starts[1:].tolist()):
+        feature = int(packed.ring_feature[a])
+        if feature not in properties:
+            source = features[feature]["properties"] or {}
+            properties[feature] = {
+                key: source[key] for key in SELECTION_KEYS if key in source
+            }
+
+        positions = coords[offsets[a] : offsets[b]].ravel().tolist()
+        if b - a > 1:
+            holes = ((offsets[a + 1 : b] - offsets[a]) * 2).tolist()
+            polygon = {"positions": positions, "holeIndices": holes}
+        else:
+            polygon = positions
+
+        records.append(
+            {"feature": feature, "polygon": polygon, "properties": properties[feature]}
+        )
+
+    return records
+
+
+def _polygon_layer(data, get_line_width: int) -> pdk.Layer:
+    import pydeck as pdk
+
+    # _geojson_layer と同じ見た目・同じ id（選択イベントのキー）にする
+    return pdk.Layer(
+        "PolygonLayer",
+        flat_polygons(data),
+        id="geojson",
+        pickable=True,
+        opacity=0.1,
+        # 引用符で囲んだ文字列は式ではなくそのままの値として渡る
+        position_format='"XY"',
+        get_polygon="polygon",
+        get_fill_color=[136, 141, 144],  # スカイグレー
+        get_line_color=[204, 0, 204],  # 紫色
+        get_line_width=get_line_width,
+    )
+
+
+def _layer(data, get_line_width: int, layer_format: str) -> pdk.Layer:
+    if layer_format == "geojson":
+        return _geojson_layer(data, get_line_width)
+    if layer_format == "flat":
+        return _polygon_layer(data, get_line_width)
+
+    raise ValueError(f"未対応のレイヤーの形式です: {layer_format}")
+
+
+def _tooltip(has_tip: bool, area_code: int) -> dict:
+    if has_tip:
+        area = f"<b>{{N03_00{area_code}}}</b>"
+    else:
+        area = "<b>どこかな？</b>"
+
+    return {"html": area, "style": TOOLTIP_STYLE}
+
+
+def _center(data, lat, lon, region) -> tuple[float, float]:
+    if None in (lat, lon):
+        # 事前計算インデックスがあれば座標を走査しない
+        center = get_region_center(region) if region else None
+        lat, lon = center or get_geojson_center(data)
+
+    return lat, lon
+
+
+@traced()
+def make_deck(
+    data,
+    has_tip: bool = False,
+    zoom: int = 4,
+    min_zoom: int = 4,
+    max_zoom: int = 12,
+    area_code: int = 1,
+    map_provider: str | None = None,
+    lat: float | None = None,
+    lon: float | None = None,
+    get_line_width: int = 100,
+    region: str | None = None,
+    layer_format: str = LAYER_FORMAT,
+) -> pdk.Deck:
+    """GeoJSON レイヤー 1 枚の地図を組み立てる（描画はしない）
+
+    layer_format が "flat" ならポリゴンごとの平らな座標配列の PolygonLayer にする。
+    """
+    import pydeck as pdk
+
+    data = as_geojson(data)
+    lat, lon = _center(data, lat, lon, region)
+
+    return pdk.Deck(
         map_style="dark_no_labels",
         map_provider=map_provider,  # type: ignore
-        layers=[geojson],
-        initial_view_state=view_state,
-        tooltip=tooltip,  # type: ignore
+        layers=[_layer(data, get_line_width, layer_format)],
+        initial_view_state=_view_state(lat, lon, zoom, min_zoom, max_zoom),
+        tooltip=_tooltip(has_tip, area_code),  # type: ignore
     )
 
-    choose_map(r)
+
+@st.cache_resource(max_entries=DECK_CACHE_ENTRIES)
+@traced()
+def layer_json(
+    region: str,
+    tier: int | None,
+    get_line_width: int,
+    _data,
+    layer_format: str = LAYER_FORMAT,
+) -> str:
+    """region・ティアのレイヤーの JSON（プロセスで 1 度だけ JSON 化する）
+
+    _data はキーに含めないので、load_tier(region, ...) でそのティアを読み込んだ
+    データを渡すこと。
+    """
+    return serialize_layers([_layer(as_geojson(_data), get_line_width, layer_format)])
+
+
+@traced()
+def make_deck_spec(
+    data,
+    region: str,
+    has_tip: bool = False,
+    zoom: int = 4,
+    min_zoom: int = 4,
+    max_zoom: int = 12,
+    area_code: int = 1,
+    map_provider: str | None = None,
+    lat: float | None = None,
+    lon: float | None = None,
+    get_line_width: int = 100,
+    layer_format: str = LAYER_FORMAT,
+) -> DeckSpec:
+    """make_deck と同じ地図を、キャッシュしたレイヤーの JSON から組み立てる
+
+    レイヤーは (region, ティア, 線の太さ, 形式) ごとに 1 度だけ JSON 化し、ビューと
+    ツールチップだけを呼び出しごとに作る。data は load_tier(region, zoom,
+    min_zoom, max_zoom) で読み込んだものであること。
+    """
+    tier = select_tier(zoom, min_zoom, max_zoom)
+    layers = layer_json(region, tier, get_line_width, data, layer_format)
+
+    lat, lon = _center(data, lat, lon, region)
+    return DeckSpec(
+        layers,
+        _view_state(lat, lon, zoom, min_zoom, max_zoom),
+        _tooltip(has_tip, area_code),
+        map_provider=map_provider,
+    )
+
+
+def feature_index(index: int, obj: dict) -> int:
+    """選択した行の番号をフィーチャーの番号にする（"flat" の行は feature を持つ）"""
+    return obj.get("feature", index)
+
+
+@st.fragment
+def make_map(
+    data,
+    has_tip: bool = False,
+    zoom: int = 4,
+    min_zoom: int = 4,
+    max_zoom: int = 12,
+    area_code: int = 1,
+    map_provider: str | None = None,
+    lat: float | None = None,
+    lon: float | None = None,
+    get_line_width: int = 100,
+    region: str | None = None,
+    slim_selection: bool = True,
+    layer_format: str = LAYER_FORMAT,
+):
+    data = as_geojson(data)
+
+    # 地域が分かれば JSON 化済みのレイヤーを使い回す
+    build = make_deck if region is None else make_deck_spec
+    r = build(
+        data,
+        has_tip=has_tip,
+        zoom=zoom,
+        min_zoom=min_zoom,
+        max_zoom=max_zoom,
+        area_code=area_code,
+        map_provider=map_provider,
+        lat=lat,
+        lon=lon,
+        get_line_width=get_line_width,
+        region=region,
+        layer_format=layer_format,
+    )
+
+    # 選択したフィーチャーのジオメトリをセッションに持たない
+    choose_map(r, data["features"] if slim_selection else None, region)
 
 
 @st.fragment
-def choose_map(r):
-    event = st.pydeck_chart(r, height=700, on_select="rerun")
+def choose_map(r, features=None, region=None):
+    # 地図の JSON 化と送信を含む
+    with span("pydeck.pydeck_chart"):
+        event = st.pydeck_chart(r, height=700, on_select="rerun")
 
     if obj := event.selection.objects:  # type: ignore
         # with st.expander("*Detailed information on the selected region.*"):
@@ -78,5 +362,14 @@ def choose_map(r):
         #     st.caption(obj.geojson[0]["properties"]["N03_007"])
         #     st.write(obj)
 
-        ss.indices = event.selection.indices["geojson"][0]  # type: ignore
-        ss.event = obj
+        ss.indices = feature_index(
+            event.selection.indices["geojson"][0],  # type: ignore
+            obj["geojson"][0],
+        )
+        ss.event = (
+            obj if features is None else select_feature(features, ss.indices, region)
+        )
+
+        if region == "prefecture":
+            # 次のステップで開く都道府県と隣接県を裏で読み込んでおく
+            prefetch_around(selected_properties(ss.event)["N03_007"][:2])
@@ -0,0 +1,168 @@
+"""出題セットの一括生成
+
+都道府県の行番号（Const.prefectures）だけで問題と選択肢を作る。
+多数の回（ラウンド）をまとめて NumPy で生成でき、乱数は seed で再現できる。
+
+誤答（選択肢のうち正解以外）の選び方:
+    random: 正解以外から一様に選ぶ
+    nearest: 正解から近い県（県庁所在地どうしの距離）から選ぶ
+    same_region: 同じ地方の県から選び、足りなければ近い県で補う
+
+選び方は都道府県どうしの「優先度」行列で表し、優先度に一様乱数を足した
+キーの小さいものから誤答にする（同じ優先度の中では一様に選ばれる）。
+
+生成速度の計測（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m common.questions [--rounds N] [--strategy ...]
+"""
+
+import argparse
+import time
+from functools import cache
+from typing import NamedTuple
+
+import numpy as np
+
+from common.const import Const
+
+CONST = Const()
+
+PREFECTURES = CONST.prefectures
+NUM_QUESTIONS = CONST.num_questions
+NUM_OPTIONS = 4
+
+STRATEGIES = ("random", "nearest", "same_region")
+
+# 地方区分（都道府県コードの範囲）
+DISTRICTS = {
+    "北海道": ("01", "01"),
+    "東北": ("02", "07"),
+    "関東": ("08", "14"),
+    "中部": ("15", "23"),
+    "近畿": ("24", "30"),
+    "中国": ("31", "35"),
+    "四国": ("36", "39"),
+    "九州・沖縄": ("40", "47"),
+}
+
+# nearest で候補にする近い県の数
+NEAREST_CANDIDATES = 6
+
+EARTH_RADIUS_KM = 6371.0
+
+
+class QuestionSet(NamedTuple):
+    """出題セット（どちらも都道府県の行番号）
+
+    answers: (rounds, questions) の正解
+    options: (rounds, questions, options) の選択肢（正解を 1 つ含み、並びは無作為）
+    """
+
+    answers: np.ndarray
+    options: np.ndarray
+
+
+@cache
+def distance_matrix() -> np.ndarray:
+    """県庁所在地どうしの大円距離（km）の (47, 47) 行列"""
+    lat = np.radians(np.frombuffer(PREFECTURES.lat))
+    lon = np.radians(np.frombuffer(PREFECTURES.lon))
+
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = (
+        np.sin(dlat / 2) ** 2
+        + np.cos(lat[:, None]) * np.cos(lat) * np.sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def district_ids() -> np.ndarray:
+    """行番号ごとの地方区分の番号"""
+    codes = np.array([int(p.code) for p in PREFECTURES])
+    ids = np.full(len(codes), -1)
+    for i, (first, last) in enumerate(DISTRICTS.values()):
+        ids[(codes >= int(first)) & (codes <= int(last))] = i
+
+    return ids
+
+
+@cache
+def priority_matrix(strategy: str) -> np.ndarray:
+    """誤答の優先度の (47, 47) 行列（行が正解、小さいほど先に選ばれる、対角は inf）
+
+    優先する候補は 0、それ以外は 1 + 距離の順位（近いほど小さい）にして、
+    候補が足りないときは近い県で補う。
+    """
+    n = len(PREFECTURES)
+    distance = distance_matrix()
+    # 距離の順位（自分自身が 0）
+    rank = np.argsort(np.argsort(distance, axis=1, kind="stable"), axis=1)
+
+    if strategy == "random":
+        priority = np.zeros((n, n))
+    elif strategy == "nearest":
+        priority = np.where(rank <= NEAREST_CANDIDATES, 0.0, 1.0 + rank)
+    elif strategy == "same_region":
+        ids = district_ids()
+        priority = np.where(ids[:, None] == ids[None, :], 0.0, 1.0 + rank)
+    else:
+        raise ValueError(f"未対応の誤答の選び方です: {strategy}")
+
+    np.fill_diagonal(priority, np.inf)
+    priority.setflags(write=False)
+    return priority
+
+
+def draw_options(
+    answers,
+    k: int = NUM_OPTIONS,
+    strategy: str = "random",
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """正解の行番号（任意の形の配列）ごとに k 択の選択肢を作る
+
+    戻り値は answers の形に k の軸を足した行番号の配列。
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    answers = np.asarray(answers, dtype=np.intp)
+
+    noise = rng.random((*answers.shape, len(PREFECTURES)))
+    keys = priority_matrix(strategy)[answers] + noise
+    wrongs = np.argpartition(keys, k - 2, axis=-1)[..., : k - 1]
+
+    options = np.concatenate([wrongs, answers[..., None]], axis=-1)
+    order = np.argsort(rng.random(options.shape), axis=-1)
+    return np.take_along_axis(options, order, axis=-1)
+
+
+def generate(
+    rounds: int = 1,
+    questions: int = NUM_QUESTIONS,
+    k: int = NUM_OPTIONS,
+    strategy: str = "random",
+    seed: int | np.random.Generator | None = None,
+) -> QuestionSet:
+    """rounds 回分の出題セットをまとめて作る（1 回の中で正解は重複しない）"""
+    rng = np.random.default_rng(seed)
+
+    order = np.argsort(rng.random((rounds, len(PREFECTURES))), axis=-1)
+    answers = order[:, :questions]
+
+    return QuestionSet(answers, draw_options(answers, k, strategy, rng))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10_000, help="回数")
+    parser.add_argument("--strategy", choices=STRATEGIES, action="append")
+    args = parser.parse_args()
+
+    for strategy in args.strategy or STRATEGIES:
+        priority_matrix(strategy)
+        start = time.perf_counter()
+        generate(args.rounds, strategy=strategy, seed=0)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{strategy:<12} {args.rounds:>8,} rounds {elapsed * 1000:>8.1f}ms"
+            f" ({elapsed / args.rounds * 1e6:.1f}us/round)"
+        )
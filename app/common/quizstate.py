@@ -0,0 +1,142 @@
+"""クイズの進行状況（セッションに置くコンパクトな状態）
+
+問題と選択肢は共有の出題プール（common.rounds）の回にあるので、セッションには
+回の ID・出題モード・何問目か・回答済み/正解のビット列・選んだ選択肢の番号
+（1 問 1 バイト）だけを持つ。都道府県名や選択肢の文字列は都道府県の表
+（Const.prefectures）から必要なときに引く。
+
+出題プール（NumPy）は最初に問題を引くときに読み込む。
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from common.const import Const
+
+if TYPE_CHECKING:
+    from common.prefectures import Prefecture
+    from common.rounds import Round
+
+CONST = Const()
+
+NUM_QUESTIONS = CONST.num_questions
+PREFECTURES = CONST.prefectures
+
+# 選択肢を選んでいない問題
+NO_CHOICE = 0xFF
+
+# 自由入力で答えるモード（それ以外は選択肢から選ぶ）
+INPUT_MODE = "capital_to_pref_input"
+
+
+def normalize_name(name: str) -> str:
+    if name is None:
+        return ""
+
+    s = name.strip().replace("　", "").replace(" ", "").lower()
+    for suf in ("県", "都", "府", "道"):
+        if s.endswith(suf):
+            s = s[: -len(suf)]
+            break
+
+    return s
+
+
+class QuizState:
+    """クイズ 1 回分の進行状況"""
+
+    __slots__ = (
+        "answered",
+        "choices",
+        "correct",
+        "index",
+        "inputs",
+        "mode",
+        "round_id",
+    )
+
+    def __init__(
+        self, round_id: str, mode: str, questions: int = NUM_QUESTIONS
+    ) -> None:
+        self.round_id = round_id
+        self.mode = mode
+        self.index = 0
+        # i 問目を回答済み・正解なら i ビット目が 1
+        self.answered = 0
+        self.correct = 0
+        # i 問目で選んだ選択肢の番号（選択肢のモード）
+        self.choices = bytearray([NO_CHOICE]) * questions
+        # i 問目の入力（自由入力のモード）
+        self.inputs: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    @property
+    def round(self) -> Round:
+        from common.rounds import get_round
+
+        return get_round(self.round_id)
+
+    @property
+    def finished(self) -> bool:
+        return self.index >= len(self)
+
+    @property
+    def score(self) -> int:
+        return self.correct.bit_count()
+
+    def prefecture(self, i: int) -> Prefecture:
+        return PREFECTURES[int(self.round.answers[i])]
+
+    def _labels(self) -> tuple[str, ...]:
+        if self.mode == "pref_to_capital_mc":
+            return PREFECTURES.capitals
+        return PREFECTURES.names
+
+    def options(self, i: int) -> list[str]:
+        """i 問目の選択肢"""
+        labels = self._labels()
+        return [labels[j] for j in self.round.options[i].tolist()]
+
+    def correct_answer(self, i: int) -> str:
+        return self._labels()[int(self.round.answers[i])]
+
+    def is_answered(self, i: int) -> bool:
+        return bool(self.answered >> i & 1)
+
+    def is_correct(self, i: int) -> bool:
+        return bool(self.correct >> i & 1)
+
+    def user_answer(self, i: int) -> str | None:
+        """i 問目の回答（未回答・選んでいなければ None）"""
+        if self.mode == INPUT_MODE:
+            return self.inputs.get(i)
+        if (choice := self.choices[i]) == NO_CHOICE:
+            return None
+
+        return self.options(i)[choice]
+
+    def answer(self, value: str | None) -> bool:
+        """今の問題に value で答え、正解かどうかを返す"""
+        i = self.index
+        correct = self.correct_answer(i)
+
+        if self.mode == INPUT_MODE:
+            value = value or ""
+            self.inputs[i] = value
+            is_correct = normalize_name(value) == normalize_name(correct) != ""
+        else:
+            options = self.options(i)
+            self.choices[i] = options.index(value) if value in options else NO_CHOICE
+            is_correct = value == correct
+
+        self.answered |= 1 << i
+        if is_correct:
+            self.correct |= 1 << i
+
+        return is_correct
+
+    def next(self) -> None:
+        self.index += 1
@@ -0,0 +1,177 @@
+"""共有の出題プール（事前生成した回を ID で配る）
+
+セッションごとに問題を生成せず、誤答の選び方ごとに多数の回をまとめて
+生成しておき（common.questions.generate）、プロセスで共有する。
+セッションは回の ID と何問目かだけを持てばよい。
+
+回の ID は "<種類>:<誤答の選び方>:<番号>" の文字列。
+    pool:random:123      共有プールの 123 番目の回
+    daily:random:20261018 その日の回（日付から seed を決めるので全員が同じ問題）
+
+プールは ROUND_POOL_SIZE 回を ROUND_POOL_SEED から作る（seed が同じなら
+どのプロセスでも同じ内容）。ビルド済みのファイル（uint8 の npz）があれば読み込む。
+
+生成方法（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m common.rounds
+"""
+
+import argparse
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import NamedTuple, Self
+
+import numpy as np
+import streamlit as st
+
+from common.const import Const
+from common.questions import NUM_OPTIONS, STRATEGIES, generate
+
+CONST = Const()
+
+BUILD_DIR = CONST.build_dir
+NUM_QUESTIONS = CONST.num_questions
+POOL_SIZE = CONST.round_pool_size
+POOL_SEED = CONST.round_pool_seed
+
+POOL_EXTENSION = ".rounds.npz"
+
+# 日替わりの回は日本時間の日付で切り替える
+JST = timezone(timedelta(hours=9))
+
+
+class Round(NamedTuple):
+    """1 回分の問題（都道府県の行番号、読み取り専用）
+
+    answers: (questions,) の正解
+    options: (questions, options) の選択肢
+    """
+
+    answers: np.ndarray
+    options: np.ndarray
+
+
+class RoundPool:
+    """事前生成した回の集まり（行番号を uint8 で持つ）"""
+
+    def __init__(self, answers: np.ndarray, options: np.ndarray) -> None:
+        self.answers = np.ascontiguousarray(answers, dtype=np.uint8)
+        self.options = np.ascontiguousarray(options, dtype=np.uint8)
+        self.answers.setflags(write=False)
+        self.options.setflags(write=False)
+
+    @classmethod
+    def generate(
+        cls,
+        rounds: int,
+        strategy: str = "random",
+        seed: int = POOL_SEED,
+        questions: int = NUM_QUESTIONS,
+    ) -> Self:
+        generated = generate(rounds, questions, NUM_OPTIONS, strategy, seed)
+        return cls(generated.answers, generated.options)
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def __getitem__(self, number: int) -> Round:
+        return Round(self.answers[number], self.options[number])
+
+    @property
+    def nbytes(self) -> int:
+        return self.answers.nbytes + self.options.nbytes
+
+    def write(self, path: str) -> int:
+        """npz で書き出し、書き込んだバイト数を返す"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(f, answers=self.answers, options=self.options)
+            return f.tell()
+
+    @classmethod
+    def read(cls, path: str) -> Self:
+        with np.load(path) as data:
+            return cls(data["answers"], data["options"])
+
+
+def pool_path(strategy: str, build_dir: str) -> str:
+    return f"{build_dir}{strategy}{POOL_EXTENSION}"
+
+
+@st.cache_resource
+def load_pool(strategy: str = "random") -> RoundPool:
+    """誤答の選び方ごとの共有プール（ビルド済みで問題数が合えば読み込む）"""
+    path = pool_path(strategy, BUILD_DIR)
+    if os.path.exists(path):
+        pool = RoundPool.read(path)
+        if pool.answers.shape[1:] == (NUM_QUESTIONS,) and len(pool):
+            return pool
+
+    return RoundPool.generate(POOL_SIZE, strategy)
+
+
+@st.cache_resource(max_entries=8)
+def load_daily(strategy: str, day: str) -> RoundPool:
+    """day（YYYYMMDD）の回（1 回だけのプール）"""
+    return RoundPool.generate(1, strategy, seed=int(day))
+
+
+def today() -> str:
+    return datetime.now(JST).strftime("%Y%m%d")
+
+
+def draw_round(strategy: str = "random", rng: np.random.Generator | None = None) -> str:
+    """共有プールから回を 1 つ選び、その ID を返す"""
+    rng = np.random.default_rng() if rng is None else rng
+    return f"pool:{strategy}:{rng.integers(len(load_pool(strategy)))}"
+
+
+def daily_round(strategy: str = "random", day: date | str | None = None) -> str:
+    """その日の回の ID（既定は日本時間の今日）"""
+    if day is None:
+        day = today()
+    elif isinstance(day, date):
+        day = day.strftime("%Y%m%d")
+
+    return f"daily:{strategy}:{day}"
+
+
+def get_round(round_id: str) -> Round:
+    """ID の回を引く（不正な ID は ValueError）"""
+    try:
+        kind, strategy, key = round_id.split(":")
+    except ValueError:
+        raise ValueError(f"回の ID が不正です: {round_id}") from None
+
+    if strategy not in STRATEGIES:
+        raise ValueError(f"回の ID が不正です: {round_id}")
+
+    if kind == "pool" and key.isdigit():
+        pool = load_pool(strategy)
+        if int(key) < len(pool):
+            return pool[int(key)]
+
+    if kind == "daily" and len(key) == 8 and key.isdigit():
+        return load_daily(strategy, key)[0]
+
+    raise ValueError(f"回の ID が不正です: {round_id}")
+
+
+def convert_all(
+    strategies=STRATEGIES, rounds: int = POOL_SIZE, build_dir: str = BUILD_DIR
+) -> dict[str, int]:
+    """誤答の選び方ごとにプールを書き出し、書き込んだバイト数を返す"""
+    return {
+        strategy: RoundPool.generate(rounds, strategy).write(
+            pool_path(strategy, build_dir)
+        )
+        for strategy in strategies
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=POOL_SIZE, help="回数")
+    args = parser.parse_args()
+
+    for strategy, size in convert_all(rounds=args.rounds).items():
+        print(f"{strategy}: {args.rounds:,} rounds -> {size:,} bytes")
@@ -1,8 +1,12 @@
 import streamlit as st
 from streamlit.navigation.page import StreamlitPage
 
+from common.const import Const
 
-def navigation() -> None:
+CONST = Const()
+
+
+def pages() -> dict[str, list[StreamlitPage]]:
     pages: dict[str, list[StreamlitPage]] = {
         "Contents": [
             st.Page(
@@ -22,7 +26,22 @@ def navigation() -> None:
         # ],
     }
 
-    pg: StreamlitPage = st.navigation(pages)
+    if CONST.tracing:
+        # 計測結果（TRACING=1 のときだけ登録し、メニューには出さず /diagnostics で開く）
+        pages["Contents"].append(
+            st.Page(
+                "pages/diagnostics.py",
+                title="Diagnostics",
+                icon=":material/monitoring:",
+                visibility="hidden",
+            )
+        )
+
+    return pages
+
+
+def navigation() -> None:
+    pg: StreamlitPage = st.navigation(pages())
     pg.run()
 
 
@@ -0,0 +1,29 @@
+"""アプリの起動（ウォームアップを最初のセッションより先に始める）
+
+streamlit run はセッションが来るまでアプリのコードを実行しないので、
+main.py から始めるウォームアップは最初の利用者を待ってしまう。
+このモジュールは同じプロセスでウォームアップを始めてから Streamlit の
+サーバーを起動する（st.cache_resource とジオメトリキャッシュは
+プロセス内で共有されるので、セッションからは読み込み済みに見える）。
+
+終わったかどうかは WARMUP_STATUS_FILE に書き出される進行状況で確かめられる。
+
+起動方法（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m common.serve [streamlit run のオプション ...]
+"""
+
+import os
+import sys
+
+from streamlit.web import cli
+
+from common.warmup import start_warmup
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "main.py")
+
+
+if __name__ == "__main__":
+    start_warmup()
+
+    sys.argv = ["streamlit", "run", MAIN_SCRIPT, *sys.argv[1:]]
+    sys.exit(cli.main())
@@ -0,0 +1,184 @@
+"""ズームレベル別の簡略化ジオメトリ（ティア）
+
+共有境界をアーク単位で Douglas-Peucker 法により簡略化するので、
+隣接する市町村の境界はどのティアでもずれない。ティア z はズーム z で
+おおよそ 1 ピクセル以内の誤差になる許容値で簡略化する。
+
+生成方法（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m common.simplify
+"""
+
+import json
+import os
+
+import numpy as np
+
+from common.const import Const
+from common.topology import assemble, extract_arcs
+
+CONST = Const()
+
+BASE_DIR = CONST.base_dir
+BUILD_DIR = CONST.build_dir
+REGIONS = CONST.regions
+TIER_ZOOMS = CONST.tier_zooms
+
+# deck.gl はズーム 0 で世界全体を 512 ピクセルで描画する
+TILE_SIZE = 512
+
+# 出力する座標の小数点以下の桁数（約 0.1m）
+PRECISION = 6
+
+
+def tolerance(zoom: int) -> float:
+    """ズーム zoom で 1 ピクセルに相当する経度差"""
+    return 360 / (TILE_SIZE * 2**zoom)
+
+
+def significance(arc) -> np.ndarray:
+    """各点が残る最大の許容値（Douglas-Peucker 法の実効許容値）を求める"""
+    points = np.asarray(arc, dtype=float)
+    n = len(points)
+    sig = np.zeros(n)
+    sig[0] = sig[-1] = np.inf
+
+    stack = [(0, n - 1, np.inf)]
+    while stack:
+        a, b, parent = stack.pop()
+        if b - a < 2:
+            continue
+
+        start, end = points[a], points[b]
+        inner = points[a + 1 : b]
+        seg = end - start
+        length2 = seg @ seg
+
+        if length2 == 0:
+            dist = np.hypot(*(inner - start).T)
+        else:
+            t = np.clip((inner - start) @ seg / length2, 0, 1)
+            dist = np.hypot(*(inner - start - t[:, None] * seg).T)
+
+        k = int(np.argmax(dist))
+        value = min(float(dist[k]), parent)
+        sig[a + 1 + k] = value
+        stack.append((a, a + 1 + k, value))
+        stack.append((a + 1 + k, b, value))
+
+    return sig
+
+
+def _ring_size(kept: list[list], refs: list[int]) -> int:
+    return sum(len(kept[i if i >= 0 else ~i]) - 1 for i in refs) + 1
+
+
+def _rescue(arcs, sigs, kept, refs: list[int]) -> None:
+    """リングが 4 点以上になるまで、実効許容値の大きい点から戻す"""
+    indices = sorted({i if i >= 0 else ~i for i in refs})
+    needed = 4 - _ring_size(kept, refs)
+    candidates = sorted(
+        (s for i in indices for s in sigs[i] if np.isfinite(s)), reverse=True
+    )
+    threshold = candidates[min(needed, len(candidates)) - 1] if candidates else 0
+
+    for i in indices:
+        kept[i] = [pt for pt, s in zip(arcs[i], sigs[i]) if s >= threshold]
+
+
+def simplify_arcs(arcs, shapes, sigs, tol: float):
+    """許容値 tol でアークを間引き、潰れたリングを除いたフィーチャー構造を返す"""
+    kept = [[pt for pt, s in zip(arc, sig) if s > tol] for arc, sig in zip(arcs, sigs)]
+
+    result = []
+    for polygons in shapes:
+        if polygons is None:
+            result.append(None)
+            continue
+
+        simplified = []
+        for polygon in polygons:
+            if _ring_size(kept, polygon[0]) < 4:
+                continue
+            simplified.append(
+                [polygon[0]] + [r for r in polygon[1:] if _ring_size(kept, r) >= 4]
+            )
+
+        if not simplified:
+            # 全て潰れた小さな島は最大の外周だけ最低限の点で残す（クリックできるように）
+            largest = max(polygons, key=lambda p: _ring_size(arcs, p[0]))
+            _rescue(arcs, sigs, kept, largest[0])
+            simplified = [[largest[0]]]
+
+        result.append(simplified)
+
+    return kept, result
+
+
+def _rounded(arcs, precision: int):
+    return [
+        [(round(x, precision), round(y, precision)) for x, y in arc] for arc in arcs
+    ]
+
+
+def build_tiers(geojson, zooms=TIER_ZOOMS, precision: int = PRECISION) -> dict:
+    """ズームレベルごとの簡略化 GeoJSON を作成する"""
+    arcs, shapes = extract_arcs(geojson)
+    sigs = [significance(arc) for arc in arcs]
+
+    tiers = {}
+    for zoom in zooms:
+        kept, simplified = simplify_arcs(arcs, shapes, sigs, tolerance(zoom))
+        tiers[zoom] = assemble(_rounded(kept, precision), simplified, geojson)
+
+    return tiers
+
+
+def select_tier(
+    zoom: int, min_zoom: int = 0, max_zoom: int | None = None, zooms=TIER_ZOOMS
+) -> int | None:
+    """表示するズームに対して十分な精度のティアを選ぶ（None なら元データ）
+
+    表示ズームを [min_zoom, max_zoom] に収め、その精度が足りる最も粗いティアにする。
+    ティアは地図を描画するときの表示ズームで決まる（st.pydeck_chart は拡大・縮小を
+    サーバーに知らせないので、拡大してもティアは切り替わらない）。
+    """
+    target = max(zoom, min_zoom)
+    if max_zoom is not None:
+        target = min(target, max_zoom)
+
+    return next((z for z in sorted(zooms) if z >= target), None)
+
+
+def tier_name(region: str, zoom: int) -> str:
+    return f"{region}_z{zoom}"
+
+
+def convert_all(
+    base_dir: str = BASE_DIR,
+    build_dir: str = BUILD_DIR,
+    regions=REGIONS,
+    zooms=TIER_ZOOMS,
+) -> dict[str, dict[int, int]]:
+    """全アセットのティアを書き出し、地域コード・ティアごとのバイト数を返す"""
+    os.makedirs(build_dir, exist_ok=True)
+
+    sizes = {}
+    for region in regions:
+        with open(f"{base_dir}{region}.json", "r", encoding="utf-8") as f:
+            tiers = build_tiers(json.load(f), zooms)
+
+        sizes[region] = {}
+        for zoom, data in tiers.items():
+            path = f"{build_dir}{tier_name(region, zoom)}.json"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            sizes[region][zoom] = os.path.getsize(path)
+
+    return sizes
+
+
+if __name__ == "__main__":
+    for region, sizes in convert_all().items():
+        original = os.path.getsize(f"{BASE_DIR}{region}.json")
+        detail = ", ".join(f"z{z}: {n:,}" for z, n in sizes.items())
+        print(f"{region}: {original:,} -> {detail} bytes")
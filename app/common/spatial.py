@@ -0,0 +1,207 @@
+"""地域ごとの空間インデックス
+
+リングの bbox を一様グリッドに登録し、座標を含むフィーチャー
+（point-in-polygon）と最も近いフィーチャーをサーバー側で求める。
+ブラウザから選択フィーチャー全体を送り返してもらわなくても、
+座標だけで答え合わせやヒントの計算ができる。
+
+point-in-polygon は経緯度を平面として扱い、距離は緯度に応じて
+経度方向を縮めた近似（km）で求める。
+"""
+
+import math
+from functools import cached_property
+from typing import Self
+
+import numpy as np
+import streamlit as st
+
+from common.geometry import PackedGeometry, pack
+from common.utils import load_data
+
+# 緯度 1 度あたりの距離（km）
+KM_PER_DEGREE = 111.32
+
+
+class SpatialIndex:
+    """リングの bbox を登録したグリッドと、フィーチャー単位の検索"""
+
+    def __init__(self, packed: PackedGeometry, properties: list[dict]) -> None:
+        self.packed = packed
+        self.properties = properties
+
+        bboxes = packed.ring_bboxes
+        n_rings = packed.n_rings
+        if n_rings == 0:
+            self.origin = np.zeros(2)
+            self.cell_size = np.ones(2)
+            self.shape = (1, 1)
+            self._cell_offsets = np.zeros(2, dtype=np.int64)
+            self._cell_rings = np.zeros(0, dtype=np.int64)
+            return
+
+        # セル数がリング数と同じくらいになるよう分割する
+        self.origin = bboxes[:, :2].min(axis=0)
+        extent = np.maximum(bboxes[:, 2:].max(axis=0) - self.origin, 1e-9)
+        side = math.sqrt(extent[0] * extent[1] / n_rings)
+        nx = int(min(max(1, round(extent[0] / side)), 1024))
+        ny = int(min(max(1, round(extent[1] / side)), 1024))
+        self.shape = (nx, ny)
+        self.cell_size = extent / [nx, ny]
+
+        lower = self._cell(bboxes[:, :2])
+        upper = self._cell(bboxes[:, 2:])
+
+        cells = []
+        rings = []
+        for ring, ((x0, y0), (x1, y1)) in enumerate(zip(lower, upper)):
+            xs, ys = np.meshgrid(np.arange(x0, x1 + 1), np.arange(y0, y1 + 1))
+            cells.append((xs * ny + ys).ravel())
+            rings.append(np.full(xs.size, ring))
+
+        cells = np.concatenate(cells)
+        order = np.argsort(cells, kind="stable")
+        self._cell_rings = np.concatenate(rings)[order]
+        self._cell_offsets = np.searchsorted(
+            cells[order], np.arange(nx * ny + 1), side="left"
+        )
+
+    @classmethod
+    def from_geojson(cls, geojson) -> Self:
+        properties = [feature["properties"] for feature in geojson["features"]]
+        return cls(pack(geojson), properties)
+
+    def __len__(self) -> int:
+        return self.packed.n_features
+
+    def _cell(self, points: np.ndarray) -> np.ndarray:
+        cell = np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cell, 0, np.asarray(self.shape) - 1)
+
+    def _candidate_rings(self, lon: float, lat: float) -> np.ndarray:
+        """bbox が点を含むリング"""
+        point = np.array([lon, lat])
+        cell = np.floor((point - self.origin) / self.cell_size).astype(np.int64)
+        if np.any(cell < 0) or np.any(cell >= self.shape):
+            return self._cell_rings[:0]
+
+        index = cell[0] * self.shape[1] + cell[1]
+        rings = self._cell_rings[
+            self._cell_offsets[index] : self._cell_offsets[index + 1]
+        ]
+        bboxes = self.packed.ring_bboxes[rings]
+        inside = (
+            (bboxes[:, 0] <= lon)
+            & (lon <= bboxes[:, 2])
+            & (bboxes[:, 1] <= lat)
+            & (lat <= bboxes[:, 3])
+        )
+        return rings[inside]
+
+    def _ring_coords(self, ring: int) -> np.ndarray:
+        offsets = self.packed.ring_offsets
+        return self.packed.coords[offsets[ring] : offsets[ring + 1]]
+
+    def _ring_contains(self, ring: int, lon: float, lat: float) -> bool:
+        # 交差数判定（偶奇規則）
+        coords = self._ring_coords(ring)
+        x0, y0 = coords[:-1, 0], coords[:-1, 1]
+        x1, y1 = coords[1:, 0], coords[1:, 1]
+
+        crosses = (y0 > lat) != (y1 > lat)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = x0 + (lat - y0) * (x1 - x0) / (y1 - y0)
+
+        return bool(np.count_nonzero(crosses & (lon < x)) % 2)
+
+    def locate(self, lon: float, lat: float) -> int | None:
+        """座標を含むフィーチャーの番号（どれにも含まれなければ None）"""
+        parity: dict[int, int] = {}
+        for ring in self._candidate_rings(lon, lat).tolist():
+            if self._ring_contains(ring, lon, lat):
+                feature = int(self.packed.ring_feature[ring])
+                parity[feature] = parity.get(feature, 0) ^ 1
+
+        # 外周に含まれ穴に含まれないものは奇数回になる
+        for feature in sorted(parity):
+            if parity[feature]:
+                return feature
+
+        return None
+
+    def _scale(self, lat: float) -> np.ndarray:
+        return np.array([math.cos(math.radians(lat)), 1.0]) * KM_PER_DEGREE
+
+    @cached_property
+    def centroids(self) -> np.ndarray:
+        """フィーチャーごとの重心 [経度, 緯度]"""
+        return self.packed.centroids()
+
+    def distance(self, feature: int, lon: float, lat: float) -> float:
+        """フィーチャーまでの距離（km、含まれていれば 0）"""
+        if self.locate(lon, lat) == feature:
+            return 0.0
+
+        return self._boundary_distance(feature, lon, lat)
+
+    def _boundary_distance(self, feature: int, lon: float, lat: float) -> float:
+        """フィーチャーの境界までの距離（km）"""
+        scale = self._scale(lat)
+        point = np.array([lon, lat])
+        best = math.inf
+
+        for ring in np.flatnonzero(self.packed.ring_feature == feature).tolist():
+            coords = (self._ring_coords(ring) - point) * scale
+            if len(coords) < 2:
+                continue
+
+            start, end = coords[:-1], coords[1:]
+            segment = end - start
+            length = np.einsum("ij,ij->i", segment, segment)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = np.clip(-np.einsum("ij,ij->i", start, segment) / length, 0, 1)
+            t = np.nan_to_num(t)
+            nearest = start + segment * t[:, None]
+            best = min(
+                best, float(np.sqrt(np.einsum("ij,ij->i", nearest, nearest).min()))
+            )
+
+        return best
+
+    def nearest(self, lon: float, lat: float, k: int = 1) -> list[tuple[int, float]]:
+        """近い順に k 件の (フィーチャー番号, 距離 km)（含まれていれば距離 0）"""
+        if (feature := self.locate(lon, lat)) is not None and k == 1:
+            return [(feature, 0.0)]
+
+        # リングの bbox までの距離を下限として、近い候補から順に調べる
+        scale = self._scale(lat)
+        bboxes = self.packed.ring_bboxes
+        dx = np.maximum(np.maximum(bboxes[:, 0] - lon, lon - bboxes[:, 2]), 0)
+        dy = np.maximum(np.maximum(bboxes[:, 1] - lat, lat - bboxes[:, 3]), 0)
+        ring_bound = np.hypot(dx * scale[0], dy * scale[1])
+
+        bound = np.full(self.packed.n_features, np.inf)
+        np.minimum.at(bound, self.packed.ring_feature, ring_bound)
+
+        found: list[tuple[int, float]] = []
+        for candidate in np.argsort(bound, kind="stable").tolist():
+            if not np.isfinite(bound[candidate]):
+                break
+            if len(found) >= k and bound[candidate] > found[-1][1]:
+                break
+
+            if candidate == feature:
+                distance = 0.0
+            else:
+                distance = self._boundary_distance(candidate, lon, lat)
+            found.append((candidate, distance))
+            found.sort(key=lambda item: item[1])
+            del found[k:]
+
+        return found
+
+
+@st.cache_resource
+def load_spatial_index(region: str) -> SpatialIndex:
+    """地域の空間インデックス（元データから作成し、プロセス内で共有する）"""
+    return SpatialIndex.from_geojson(load_data(region))
@@ -0,0 +1,304 @@
+"""共有境界（アーク）の抽出と TopoJSON 形式
+
+隣接する市町村は同じ境界座標をそれぞれのリングに持っている。
+リングを接合点（隣接関係が変わる点）で切ってアークに分解し、
+同じアークは 1 本にまとめる。アーク単位で加工すれば境界はずれない。
+
+shapes はフィーチャーごとの構造を表す:
+    None（geometry なし）または ポリゴン > リング > アーク参照 のリスト
+アーク参照 i が負の場合は ~i 番目のアークを逆向きにたどる（TopoJSON と同じ）。
+
+TopoJSON への変換（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m common.topology
+"""
+
+import json
+import math
+import os
+import time
+from itertools import pairwise
+
+import numpy as np
+
+from common.const import Const
+
+CONST = Const()
+
+BASE_DIR = CONST.base_dir
+BUILD_DIR = CONST.build_dir
+REGIONS = CONST.regions
+
+TOPOJSON_EXTENSION = ".topojson"
+
+# 量子化の分割数（都道府県の範囲で 1m 未満の精度）
+QUANTIZATION = 1_000_000
+
+Point = tuple[float, float]
+
+
+def _polygons(geometry) -> list:
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+
+    raise ValueError(f"未対応のジオメトリです: {geometry['type']}")
+
+
+def _ring_points(ring) -> list[Point]:
+    points = [(pt[0], pt[1]) for pt in ring]
+    if points[0] != points[-1]:
+        points.append(points[0])
+
+    return points
+
+
+def _find_junctions(rings: list[list[Point]]) -> set[Point]:
+    neighbours: dict[Point, tuple[Point, Point]] = {}
+    junctions: set[Point] = set()
+
+    for ring in rings:
+        n = len(ring) - 1
+        for i in range(n):
+            point = ring[i]
+            pair = (ring[i - 1] if i else ring[n - 1], ring[i + 1])
+
+            if (seen := neighbours.get(point)) is None:
+                neighbours[point] = pair
+            elif seen != pair and seen != pair[::-1]:
+                junctions.add(point)
+
+    return junctions
+
+
+def _cut(ring: list[Point], junctions: set[Point]) -> list[list[Point]]:
+    n = len(ring) - 1
+    cuts = [i for i in range(n) if ring[i] in junctions]
+
+    if not cuts:
+        # 接合点のないリングは向きを保ったまま最小の点から始める
+        start = min(range(n), key=ring.__getitem__)
+        return [ring[start:n] + ring[:start] + [ring[start]]]
+
+    start = cuts[0]
+    rotated = ring[start:n] + ring[:start] + [ring[start]]
+    positions = [i - start if i >= start else i - start + n for i in cuts] + [n]
+
+    return [rotated[a : b + 1] for a, b in pairwise(positions)]
+
+
+def extract_arcs(geojson) -> tuple[list[list[Point]], list]:
+    """GeoJSON をアークと、アーク参照で表したフィーチャー構造に分解する"""
+    geometries = [f.get("geometry") for f in geojson["features"]]
+    rings = [
+        [[_ring_points(ring) for ring in polygon] for polygon in _polygons(g)]
+        if g is not None
+        else None
+        for g in geometries
+    ]
+    junctions = _find_junctions(
+        [ring for polygons in rings if polygons for p in polygons for ring in p]
+    )
+
+    arcs: list[list[Point]] = []
+    lookup: dict[tuple[Point, ...], int] = {}
+
+    def ref(arc: list[Point]) -> int:
+        key = tuple(arc)
+        if (index := lookup.get(key)) is not None:
+            return index
+        if (index := lookup.get(key[::-1])) is not None:
+            return ~index
+
+        lookup[key] = len(arcs)
+        arcs.append(arc)
+        return len(arcs) - 1
+
+    shapes = [
+        [[[ref(arc) for arc in _cut(ring, junctions)] for ring in p] for p in polygons]
+        if polygons is not None
+        else None
+        for polygons in rings
+    ]
+
+    return arcs, shapes
+
+
+def arc_points(arcs: list, index: int) -> list:
+    return arcs[index] if index >= 0 else arcs[~index][::-1]
+
+
+def ring_from_arcs(arcs: list, refs: list[int]) -> list:
+    """アーク参照の列からリングの座標列を組み立てる"""
+    ring = list(arc_points(arcs, refs[0]))
+    for index in refs[1:]:
+        ring.extend(arc_points(arcs, index)[1:])
+
+    return ring
+
+
+def assemble(arcs: list, shapes: list, geojson) -> dict:
+    """アークとフィーチャー構造から GeoJSON を組み立てる（properties は元データから）"""
+    features = []
+    for feature, polygons in zip(geojson["features"], shapes):
+        geometry = feature.get("geometry")
+
+        if polygons is not None:
+            coordinates = [
+                [[list(pt) for pt in ring_from_arcs(arcs, refs)] for refs in polygon]
+                for polygon in polygons
+            ]
+            if geometry["type"] == "Polygon":
+                geometry = {"type": "Polygon", "coordinates": coordinates[0]}
+            else:
+                geometry = {"type": "MultiPolygon", "coordinates": coordinates}
+
+        features.append({**feature, "geometry": geometry})
+
+    return {**geojson, "features": features}
+
+
+def _quantize_arc(arc, translate, scale) -> list[list[int]]:
+    points = np.rint((np.asarray(arc) - translate) / scale).astype(np.int64)
+    deltas = np.diff(points, axis=0)
+    deltas = deltas[np.any(deltas != 0, axis=1)]
+
+    if len(deltas) == 0:
+        # TopoJSON のアークは 2 点以上必要
+        deltas = np.zeros((1, 2), dtype=np.int64)
+
+    return [points[0].tolist(), *deltas.tolist()]
+
+
+def to_topojson(geojson, quantization: int = QUANTIZATION) -> dict:
+    """GeoJSON を量子化・差分符号化した TopoJSON に変換する"""
+    arcs, shapes = extract_arcs(geojson)
+
+    points = (
+        np.concatenate([np.asarray(arc) for arc in arcs]) if arcs else np.zeros((1, 2))
+    )
+    translate = points.min(axis=0)
+    extent = points.max(axis=0) - translate
+    scale = np.where(extent > 0, extent / (quantization - 1), 1.0)
+
+    geometries = []
+    for feature, polygons in zip(geojson["features"], shapes):
+        geometry = feature.get("geometry")
+        if polygons is None:
+            item = {"type": None}
+        elif geometry["type"] == "Polygon":
+            item = {"type": "Polygon", "arcs": polygons[0]}
+        else:
+            item = {"type": "MultiPolygon", "arcs": polygons}
+
+        item["properties"] = feature.get("properties")
+        geometries.append(item)
+
+    return {
+        "type": "Topology",
+        "transform": {"scale": scale.tolist(), "translate": translate.tolist()},
+        "objects": {
+            "collection": {"type": "GeometryCollection", "geometries": geometries}
+        },
+        "arcs": [_quantize_arc(arc, translate, scale) for arc in arcs],
+    }
+
+
+def from_topojson(topology, name: str = "collection") -> dict:
+    """TopoJSON を GeoJSON の FeatureCollection に復元する"""
+    scale = np.asarray(topology["transform"]["scale"])
+    translate = np.asarray(topology["transform"]["translate"])
+    # 量子化の刻みより細かい桁は出力しない
+    digits = max(0, math.ceil(-math.log10(scale.min())) + 1)
+
+    arcs = [
+        np.round(np.cumsum(arc, axis=0) * scale + translate, digits).tolist()
+        for arc in topology["arcs"]
+    ]
+
+    features = []
+    for item in topology["objects"][name]["geometries"]:
+        geometry = None
+        if item["type"] == "Polygon":
+            geometry = {
+                "type": "Polygon",
+                "coordinates": [ring_from_arcs(arcs, refs) for refs in item["arcs"]],
+            }
+        elif item["type"] == "MultiPolygon":
+            geometry = {
+                "type": "MultiPolygon",
+                "coordinates": [
+                    [ring_from_arcs(arcs, refs) for refs in polygon]
+                    for polygon in item["arcs"]
+                ],
+            }
+
+        features.append(
+            {
+                "type": "Feature",
+                "geometry": geometry,
+                "properties": item.get("properties"),
+            }
+        )
+
+    return {"type": "FeatureCollection", "features": features}
+
+
+def _timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def convert_all(
+    base_dir: str = BASE_DIR, build_dir: str = BUILD_DIR, regions=REGIONS
+) -> list[tuple[str, int, int, float, float, float]]:
+    """全アセットを TopoJSON に変換し、サイズと読み込み時間を比較する
+
+    戻り値は (地域コード, 元サイズ, 変換後サイズ, 元の読込秒,
+    変換後の読込秒, 変換後の読込・復元秒) のリスト。
+    """
+    os.makedirs(build_dir, exist_ok=True)
+
+    def load(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def decode(path):
+        return from_topojson(load(path))
+
+    report = []
+    for region in regions:
+        src = f"{base_dir}{region}.json"
+        dst = f"{build_dir}{region}{TOPOJSON_EXTENSION}"
+
+        with open(dst, "w", encoding="utf-8") as f:
+            json.dump(
+                to_topojson(load(src)), f, ensure_ascii=False, separators=(",", ":")
+            )
+
+        report.append(
+            (
+                region,
+                os.path.getsize(src),
+                os.path.getsize(dst),
+                _timed(load, src),
+                _timed(load, dst),
+                _timed(decode, dst),
+            )
+        )
+
+    return report
+
+
+if __name__ == "__main__":
+    print(
+        f"{'region':<16} {'json':>10} {'topojson':>10} {'size':>5}"
+        f" {'json.load':>10} {'topo.load':>10} {'+decode':>10} {'time':>5}"
+    )
+    for region, src, dst, t_src, t_load, t_decode in convert_all():
+        print(
+            f"{region:<16} {src:>10,} {dst:>10,} {dst / src:>5.0%}"
+            f" {t_src * 1000:>8.1f}ms {t_load * 1000:>8.1f}ms"
+            f" {t_decode * 1000:>8.1f}ms {t_decode / t_src:>5.0%}"
+        )
@@ -0,0 +1,144 @@
+"""再実行をまたいだ計測スパン
+
+関数（デコレーター）やブロック（コンテキストマネージャー）の所要時間を
+スパン名ごとにプロセス内で集計し、件数と p50/p95/p99 を出す。
+環境変数 TRACING=1 のときだけ計測し、無効なら何もしない。
+
+集計結果は隠しページ（/diagnostics）と Prometheus のテキスト形式で見られる。
+"""
+
+import functools
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from contextlib import contextmanager
+
+from common.const import Const
+
+CONST = Const()
+
+METRIC_NAME = "prefecture_quiz_span_seconds"
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class SpanStats:
+    """スパン 1 種類分の件数・合計と直近の所要時間"""
+
+    def __init__(self, samples: int) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: deque[float] = deque(maxlen=samples)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def quantile(self, q: float) -> float:
+        """直近の所要時間の分位点（nearest-rank）"""
+        if not self.recent:
+            return 0.0
+
+        ordered = sorted(self.recent)
+        return ordered[max(1, math.ceil(q * len(ordered))) - 1]
+
+
+class Tracer:
+    """スパンの計測と集計（スレッドセーフ）"""
+
+    def __init__(
+        self, enabled: bool = CONST.tracing, samples: int = CONST.tracing_samples
+    ) -> None:
+        self.enabled = enabled
+        self.samples = samples
+        self._spans: dict[str, SpanStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            if (stats := self._spans.get(name)) is None:
+                stats = self._spans[name] = SpanStats(self.samples)
+            stats.add(seconds)
+
+    @contextmanager
+    def span(self, name: str):
+        """with ブロックの所要時間を name で記録する"""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def traced(self, name: str | None = None) -> Callable:
+        """関数の所要時間を記録するデコレーター（name の既定は モジュール.関数名）"""
+
+        def decorator(func):
+            label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(label, time.perf_counter() - start)
+
+            return wrapper
+
+        return decorator
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """スパン名ごとの件数・合計・分位点（ミリ秒）"""
+        with self._lock:
+            return {
+                name: {
+                    "count": stats.count,
+                    "total_ms": stats.total * 1000,
+                    "p50_ms": stats.quantile(0.5) * 1000,
+                    "p95_ms": stats.quantile(0.95) * 1000,
+                    "p99_ms": stats.quantile(0.99) * 1000,
+                    "max_ms": stats.max * 1000,
+                }
+                for name, stats in sorted(self._spans.items())
+            }
+
+    def prometheus(self) -> str:
+        """Prometheus のテキスト形式（summary）"""
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in traced spans.",
+            f"# TYPE {METRIC_NAME} summary",
+        ]
+        with self._lock:
+            for name, stats in sorted(self._spans.items()):
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                for q in QUANTILES:
+                    lines.append(
+                        f'{METRIC_NAME}{{span="{label}",quantile="{q}"}}'
+                        f" {stats.quantile(q):.6f}"
+                    )
+                lines.append(f'{METRIC_NAME}_sum{{span="{label}"}} {stats.total:.6f}')
+                lines.append(f'{METRIC_NAME}_count{{span="{label}"}} {stats.count}')
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+# プロセス全体で 1 つだけ使う
+tracer = Tracer()
+
+span = tracer.span
+traced = tracer.traced
@@ -1,85 +1,116 @@
 import json
+import os
 
-import requests
 import streamlit as st
+
+from common.compressed import codec_of, load_json
 from common.const import Const
+from common.geocache import geometry_cache
+from common.geometry import pack
+from common.geostore import STORE_EXTENSION, open_store
+from common.geostream import stream_features
+from common.simplify import build_tiers, select_tier, tier_name
+from common.topology import TOPOJSON_EXTENSION, from_topojson
+from common.tracing import traced
 
 CONST = Const()
 
 BASE_URL = CONST.base_url
 BASE_DIR = CONST.base_dir
 BASE_FILE = CONST.base_file
+BUILD_DIR = CONST.build_dir
 
 
 @st.cache_data(show_spinner="fetch data...")
 def fetch_data(region: str, extension: str = ".json"):
+    # requests はリモートのアセットを使うときだけ読み込む
+    from common.fetch import fetcher
+
     path = f"{BASE_URL}{BASE_FILE}{region}{extension}"
 
-    response = requests.get(path)
-    response.raise_for_status()
-    return response.json()
+    # 受信したファイルはディスクに残し、次回は ETag / Last-Modified で再検証する。
+    # 圧縮ファイル（".json.zst" など）は保存したまま読み込み時に展開する
+    return load_json(fetcher.fetch(path))
+
+
+@traced()
+def load_data(region: str, extension: str = ".json", raw: bool = False):
+    """地域の GeoJSON を読み込む
+
+    extension に ".geo" を指定するとバイナリストアを mmap で開き、
+    遅延展開の GeoJSON ビュー（raw=True なら座標配列を持つストア）を返す。
+    ".topojson" を指定すると TopoJSON を読み込んで GeoJSON に復元する。
+    ".json.gz" / ".json.zst" / ".json.br" を指定すると圧縮ファイルを展開して読む。
+    """
+    if extension == STORE_EXTENSION:
+        store = open_store(f"{BUILD_DIR}{region}{extension}")
+        return store if raw else store.view()
+
+    if extension == TOPOJSON_EXTENSION:
+        return _load_topojson(f"{BUILD_DIR}{region}{extension}")
+
+    if codec_of(extension) is not None:
+        return _load_json(f"{BUILD_DIR}{region}{extension}")
+
+    return _load_json(f"{BASE_DIR}{region}{extension}")
+
+
+def stream_data(region: str, extension: str = ".json"):
+    """地域の GeoJSON のフィーチャーを逐次読み込みで 1 つずつ返す
 
+    全体を読み込まずに属性や座標配列を作るときに使う（キャッシュには載せない）。
+    ".json.gz" / ".json.zst" / ".json.br" を指定すると展開しながら読む。
+    """
+    if codec_of(extension) is not None:
+        return stream_features(f"{BUILD_DIR}{region}{extension}")
 
-@st.cache_data()
-def load_data(region: str, extension: str = ".json"):
-    path = f"{BASE_DIR}{region}{extension}"
+    return stream_features(f"{BASE_DIR}{region}{extension}")
 
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
 
-    return data
+@traced()
+def load_tier(region: str, zoom: int, min_zoom: int = 0, max_zoom: int | None = None):
+    """表示ズームに合った簡略化ジオメトリを読み込む
 
+    ティアは表示ズーム（[min_zoom, max_zoom] に収めたもの）で選び、合うものが
+    無ければ元データを返す。ビルド済みのファイルが無い環境（build_assets.sh を
+    実行していないデプロイなど）では、その場で簡略化してキャッシュに載せる。
+    """
+    if (tier := select_tier(zoom, min_zoom, max_zoom)) is None:
+        return load_data(region)
 
-@st.cache_data
+    path = f"{BUILD_DIR}{tier_name(region, tier)}.json"
+    if os.path.exists(path):
+        return _load_json(path)
+
+    return geometry_cache.get(
+        path, lambda: build_tiers(load_data(region), zooms=(tier,))[tier]
+    )
+
+
+def _load_json(path: str):
+    return geometry_cache.get(path, lambda: load_json(path))
+
+
+def _load_topojson(path: str):
+    def load():
+        with open(path, "r", encoding="utf-8") as f:
+            return from_topojson(json.load(f))
+
+    return geometry_cache.get(path, load)
+
+
+@traced()
 def get_geojson_center(geojson):
-    def extract_coords(geometry):
-        coords = []
-        if geometry["type"] == "Polygon":
-            coords.extend(geometry["coordinates"][0])
-        elif geometry["type"] == "MultiPolygon":
-            for polygon in geometry["coordinates"]:
-                coords.extend(polygon[0])
-        return coords
-
-    all_coords = []
-    for feature in geojson["features"]:
-        geometry = feature.get("geometry")
-        # geometry が None の場合はスキップ
-        if geometry is None:
-            continue
-
-        coords = extract_coords(geometry)
-        all_coords.extend(coords)
-
-    if not all_coords:
-        raise ValueError("GeoJSON に有効な座標が含まれていません")
-
-    lon = [pt[0] for pt in all_coords]
-    lat = [pt[1] for pt in all_coords]
-
-    center_lon = (min(lon) + max(lon)) / 2
-    center_lat = (min(lat) + max(lat)) / 2
+    min_lon, min_lat, max_lon, max_lat = get_geojson_bbox(geojson)
+
+    center_lon = (min_lon + max_lon) / 2
+    center_lat = (min_lat + max_lat) / 2
 
     return center_lat, center_lon
 
 
-@st.cache_data
+@traced()
 def get_geojson_bbox(geojson):
-    def extract_coords(geometry):
-        coords = []
-        if geometry["type"] == "Polygon":
-            coords.extend(geometry["coordinates"][0])
-        elif geometry["type"] == "MultiPolygon":
-            for polygon in geometry["coordinates"]:
-                coords.extend(polygon[0])
-        return coords
-
-    all_coords = []
-    for feature in geojson["features"]:
-        coords = extract_coords(feature["geometry"])
-        all_coords.extend(coords)
-
-    lon = [pt[0] for pt in all_coords]
-    lat = [pt[1] for pt in all_coords]
-
-    return [min(lon), min(lat), max(lon), max(lat)]
+    # 外周リングの座標をまとめて配列演算する（geometry が None のものは除く）。
+    # stream_data のフィーチャーの列も受け取れる
+    return pack(geojson).bbox()
@@ -0,0 +1,210 @@
+"""起動時のウォームアップ
+
+最初の利用者が読み込みを待たないよう、都道府県レイヤーと指定した地域の
+ジオメトリをバックグラウンドのスレッドプールでキャッシュに載せておく。
+環境変数 WARMUP_REGIONS（例: "03,13" や "all"）を設定したときだけ動く。
+common.serve から起動するとサーバーの起動前に始まる（streamlit run で直接
+起動した場合は最初のセッションが main.py を実行したときに始まる）。
+
+下の CLI は別プロセスで読み込むので、サーバーのキャッシュは温まらない。
+main.py が毎回 import するので、読み込み処理（NumPy など）は使うときに import する。
+
+読み込み時間の計測（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m common.warmup [地域コード ...|all] [--workers N]
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+import streamlit as st
+
+from common.const import Const
+
+CONST = Const()
+
+REGIONS = CONST.regions
+
+logger = logging.getLogger(__name__)
+
+
+def parse_regions(value: str) -> list[str]:
+    """カンマ区切りの地域コードを解釈する（"all" で全て）"""
+    codes = [code.strip() for code in value.split(",") if code.strip()]
+    if "all" in codes:
+        return list(REGIONS)
+
+    return codes
+
+
+def map_zooms(region: str) -> tuple[int, int, int]:
+    """地図で表示するときの (zoom, min_zoom, max_zoom)"""
+    if region == "prefecture":
+        zoom, min_zoom = CONST.prefecture_zoom
+        return zoom, min_zoom, CONST.prefecture_max_zoom
+
+    zoom, min_zoom = CONST.region_zooms.get(region[:2], CONST.region_zoom)
+    return zoom, min_zoom, CONST.region_max_zoom
+
+
+def load_region(region: str):
+    """地図で表示するときと同じズームの簡略化ジオメトリを読み込む"""
+    from common.utils import load_tier
+
+    zoom, min_zoom, max_zoom = map_zooms(region)
+    return load_tier(region, zoom=zoom, min_zoom=min_zoom, max_zoom=max_zoom)
+
+
+class Warmup:
+    """ウォームアップの進行状況と地域ごとの読み込み時間"""
+
+    def __init__(
+        self,
+        regions: list[str],
+        workers: int,
+        status_file: str = CONST.warmup_status_file,
+    ) -> None:
+        self.regions = regions
+        self.status_file = status_file
+        self.timings: dict[str, float] = {}
+        self.errors: dict[str, BaseException] = {}
+        self.started = time.perf_counter()
+        self.elapsed: float | None = None
+
+        # 前回の起動で書いた状態を終わったものと読まれないように消す
+        if status_file:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(status_file)
+
+        self._lock = threading.Lock()
+        self._finish_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="warmup"
+        )
+        self._futures = {self._executor.submit(self._load, r): r for r in regions}
+        self._executor.shutdown(wait=False)
+
+        for future in self._futures:
+            future.add_done_callback(self._done)
+
+    def _load(self, region: str) -> None:
+        start = time.perf_counter()
+        try:
+            load_region(region)
+        except (OSError, ValueError) as e:
+            with self._lock:
+                self.errors[region] = e
+            logger.warning("warmup %s failed: %s", region, e)
+            return
+
+        seconds = time.perf_counter() - start
+        with self._lock:
+            self.timings[region] = seconds
+        logger.info("warmup %s: %.1f ms", region, seconds * 1000)
+
+    def _done(self, future: Future | None = None) -> None:
+        if future is not None and (error := future.exception()) is not None:
+            # 想定外の例外はトレースバックを残す
+            region = self._futures[future]
+            with self._lock:
+                self.errors[region] = error
+            logger.error("warmup %s failed", region, exc_info=error)
+
+        if not self.ready:
+            return
+
+        # 後から来た側（wait など）は、先に来た側が書き終えるまで待つ
+        with self._finish_lock:
+            if self.elapsed is not None:
+                return
+
+            with self._lock:
+                self.elapsed = time.perf_counter() - self.started
+
+            logger.info(
+                "warmup finished: %d regions in %.1f ms",
+                len(self.timings),
+                self.elapsed * 1000,
+            )
+            if self.status_file:
+                self._write_status()
+
+    @property
+    def ready(self) -> bool:
+        return all(future.done() for future in self._futures)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """全て読み終わるまで待つ（timeout 秒を過ぎたら False）"""
+        _done, not_done = wait(self._futures, timeout=timeout)
+        if not_done:
+            return False
+
+        self._done()
+        return True
+
+    def report(self) -> list[tuple[str, float]]:
+        """読み込み時間の長い順に (地域コード, 秒) を返す"""
+        with self._lock:
+            return sorted(self.timings.items(), key=lambda item: -item[1])
+
+    def status(self) -> dict:
+        """readiness probe や診断ページ向けの進行状況"""
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "regions": len(self.regions),
+                "loaded": len(self.timings),
+                "elapsed_ms": None if self.elapsed is None else self.elapsed * 1000,
+                "timings_ms": {r: t * 1000 for r, t in self.timings.items()},
+                "errors": {r: repr(e) for r, e in self.errors.items()},
+            }
+
+    def _write_status(self) -> None:
+        # 書きかけのファイルを読まれないよう一時ファイルから置き換える
+        tmp = f"{self.status_file}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.status(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.status_file)
+
+
+def warmup(regions: list[str], workers: int = CONST.warmup_workers) -> Warmup:
+    """都道府県レイヤーと指定した地域をバックグラウンドで読み込み始める"""
+    from common.geoindex import load_index
+
+    # インデックスは小さいので先に同期で読む
+    load_index()
+
+    if "prefecture" not in regions:
+        regions = ["prefecture", *regions]
+
+    return Warmup(regions, workers)
+
+
+@st.cache_resource
+def start_warmup() -> Warmup | None:
+    """WARMUP_REGIONS が設定されていればプロセスで 1 回だけウォームアップする"""
+    if not (regions := parse_regions(CONST.warmup_regions)):
+        return None
+
+    return warmup(regions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("regions", nargs="*", default=["all"], help="地域コード")
+    parser.add_argument("--workers", type=int, default=CONST.warmup_workers)
+    args = parser.parse_args()
+
+    job = warmup(parse_regions(",".join(args.regions)), workers=args.workers)
+    job.wait()
+
+    for region, seconds in job.report():
+        print(f"{region:<16} {seconds * 1000:>8.1f} ms")
+    for region, error in job.errors.items():
+        print(f"{region:<16} failed: {error}")
+    print(f"{'total':<16} {(job.elapsed or 0) * 1000:>8.1f} ms")
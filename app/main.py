@@ -1,4 +1,5 @@
 from common.routing import footer, navigation, page_config
+from common.warmup import start_warmup
 
 
 def main():
@@ -10,6 +11,7 @@ def main():
 def initialize():
     # print("Initializing...")
     page_config()
+    start_warmup()
 
 
 def process_data():
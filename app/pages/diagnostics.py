@@ -0,0 +1,40 @@
+import streamlit as st
+from common.geocache import geometry_cache
+from common.tracing import tracer
+from common.warmup import start_warmup
+
+
+def main():
+    st.title(":material/monitoring: Diagnostics")
+
+    st.subheader("スパン", divider="rainbow")
+    if snapshot := tracer.snapshot():
+        st.dataframe(
+            [{"span": name, **stats} for name, stats in snapshot.items()],
+            hide_index=True,
+        )
+    else:
+        st.caption("まだ記録がありません")
+
+    st.subheader("ウォームアップ", divider="rainbow")
+    if (job := start_warmup()) is not None:
+        st.json(job.status())
+    else:
+        st.caption("WARMUP_REGIONS が設定されていません")
+
+    st.subheader("ジオメトリキャッシュ", divider="rainbow")
+    st.json(geometry_cache.stats())
+
+    st.subheader("Prometheus", divider="rainbow")
+    metrics = tracer.prometheus()
+    st.code(metrics, language="text")
+
+    st.download_button(
+        "ダウンロード",
+        metrics,
+        file_name="metrics.prom",
+        mime="text/plain",
+    )
+
+
+main()
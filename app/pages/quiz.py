@@ -1,27 +1,59 @@
-import random
-
-import pandas as pd
-import pydeck as pdk
 import streamlit as st
 from common.const import Const
+from common.deckspec import DeckSpec, serialize_layers
+from common.quizstate import QuizState
+from common.tracing import span, traced
 
 CONST = Const()
 
 NUM_QUESTIONS = CONST.num_questions
 PREFECTURES = CONST.prefectures
-
-
-def normalize_name(name: str) -> str:
-    if name is None:
-        return ""
-
-    s = name.strip().replace("　", "").replace(" ", "").lower()
-    for suf in ("県", "都", "府", "道"):
-        if s.endswith(suf):
-            s = s[: -len(suf)]
-            break
-
-    return s
+DISTRACTORS = CONST.quiz_distractors
+
+# the multiple-choice radio (one key, cleared when moving to the next question)
+CHOICE_KEY = "mc_choice"
+
+
+@st.cache_resource
+def capital_deck(index: int) -> DeckSpec:
+    """Single-point map of a prefectural capital (serialized once per prefecture)."""
+    # pydeck is loaded on the first map, not when the start screen is shown
+    import pydeck as pdk
+
+    p = PREFECTURES[index]
+    # plain records (pydeck serializes them as-is; no DataFrame needed)
+    map_data = [{"lat": p.lat, "lon": p.lon, "name": p.capital}]
+
+    view_state = pdk.ViewState(
+        latitude=p.lat,
+        longitude=p.lon,
+        zoom=12,
+        min_zoom=12,
+        max_zoom=12,
+        pitch=0,
+        interactive=False,
+    )
+
+    layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=map_data,
+        get_position=[p.lon, p.lat],
+        get_radius=500,
+        get_fill_color=[255, 0, 0],
+        pickable=True,
+    )
+
+    tooltip = {
+        "html": "<b>{name}</b>",
+        "style": {
+            "background-color": "teal",
+            "color": "aliceblue",
+            "font-family": "Noto Sans JP, sans-serif",
+            "border-radius": "50% 20% / 10% 40%",
+        },
+    }
+
+    return DeckSpec(serialize_layers([layer]), view_state, tooltip)
 
 
 class QuizApp:
@@ -35,156 +67,65 @@ class QuizApp:
 
     # ---------- state mutators (callbacks) ----------
     def start_quiz(self):
-        """Start or restart quiz: generate questions and MC options and initialize session state."""
+        """Start or restart quiz: pick a round from the shared pool and initialize session state."""
+        # the round pool (NumPy) is loaded on the first start, not with the page
+        from common.rounds import daily_round, draw_round
+
         mode = st.session_state.get("selected_mode")
-        sample = random.sample(PREFECTURES, k=NUM_QUESTIONS)
-        st.session_state.quiz = sample
-        st.session_state.index = 0
-        st.session_state.score = 0
 
-        # (user_answer, correct_answer, is_correct, pref, cap, lat, lon)
-        st.session_state.answered = [None] * NUM_QUESTIONS
+        # questions come from the shared round pool (no per-session generation)
+        if st.session_state.get("daily"):
+            round_id = daily_round(DISTRACTORS)
+        else:
+            round_id = draw_round(DISTRACTORS)
+
+        # the session keeps only the round ID, progress and packed answers
+        st.session_state.quiz_state = QuizState(round_id, mode)
         st.session_state.show_answer = False
-        st.session_state.mode = mode
 
         # widget initial value (safe to set here before widget instantiation)
         st.session_state.answer_input = ""
 
-        # generate MC options once per session
-        if mode in ("pref_to_capital_mc", "map_capital_mc"):
-            st.session_state.mc_options = self._generate_mc_options_for_sample(sample)
-
-        # map-specific pref options
-        if mode == "map_capital_mc":
-            st.session_state.mc_map_options = self._generate_mc_map_options_for_sample(
-                sample
-            )
-
     def submit_answer(self):
         """Handle answer submission for current question."""
-        idx = st.session_state.index
-        mode = st.session_state.get("mode", "capital_to_pref_input")
-        pref, cap, lat, lon = st.session_state.quiz[idx]
+        state = st.session_state.quiz_state
 
-        if mode == "capital_to_pref_input":
-            user_input = st.session_state.get("answer_input", "")
-            is_correct = (
-                normalize_name(user_input) == normalize_name(pref)
-                and normalize_name(user_input) != ""
-            )
-
-            if is_correct:
-                st.session_state.score += 1
-
-            st.session_state.answered[idx] = (
-                user_input,
-                pref,
-                is_correct,
-                pref,
-                cap,
-                lat,
-                lon,
-            )
-
-        elif mode == "pref_to_capital_mc":
-            key = f"mc_choice_{idx}"
-            user_choice = st.session_state.get(key, "")
-            is_correct = user_choice == cap
-
-            if is_correct:
-                st.session_state.score += 1
-
-            st.session_state.answered[idx] = (
-                user_choice,
-                cap,
-                is_correct,
-                pref,
-                cap,
-                lat,
-                lon,
-            )
-
-        else:  # map_capital_mc
-            key = f"mc_choice_{idx}"
-            user_choice = st.session_state.get(key, "")
-            is_correct = user_choice == pref
-
-            if is_correct:
-                st.session_state.score += 1
-
-            st.session_state.answered[idx] = (
-                user_choice,
-                pref,
-                is_correct,
-                pref,
-                cap,
-                lat,
-                lon,
-            )
+        if state.mode == "capital_to_pref_input":
+            state.answer(st.session_state.get("answer_input", ""))
+        else:
+            state.answer(st.session_state.get(CHOICE_KEY))
 
         st.session_state.show_answer = True
 
     def next_question(self):
         """Advance to next question (callback-safe)."""
-        prev_idx = st.session_state.index
-        st.session_state.index = prev_idx + 1
+        st.session_state.quiz_state.next()
         st.session_state.show_answer = False
 
-        # clear previous per-question widget values (safe inside callback)
-        mc_key = f"mc_choice_{prev_idx}"
-
-        if mc_key in st.session_state:
-            st.session_state[mc_key] = None
+        # clear the per-question widget value (safe inside callback)
+        if CHOICE_KEY in st.session_state:
+            del st.session_state[CHOICE_KEY]
 
         st.session_state.answer_input = ""
 
     def reset_to_start(self):
         """Return to start screen (remove quiz-related keys)."""
         for k in [
-            "quiz",
-            "index",
-            "score",
-            "answered",
+            "quiz_state",
             "show_answer",
-            "mode",
-            "mc_options",
-            "mc_map_options",
+            CHOICE_KEY,
             "answer_input",
         ]:
             if k in st.session_state:
                 del st.session_state[k]
 
-    # ---------- helpers ----------
-    def _generate_mc_options_for_sample(self, sample):
-        capitals = [cap for (_pref, cap, _la, _lo) in PREFECTURES]
-        mc_options = []
-
-        for pref, cap, _la, _lo in sample:
-            wrongs = random.sample([c for c in capitals if c != cap], k=3)
-            opts = wrongs + [cap]
-            random.shuffle(opts)
-            mc_options.append(opts)
-
-        return mc_options
-
-    def _generate_mc_map_options_for_sample(self, sample):
-        prefs = [p for (p, c, la, lo) in PREFECTURES]
-        mc_opts = []
-
-        for pref, cap, la, lo in sample:
-            wrongs = random.sample([p for p in prefs if p != pref], k=3)
-            opts = wrongs + [pref]
-            random.shuffle(opts)
-            mc_opts.append(opts)
-
-        return mc_opts
-
     # ---------- UI rendering ----------
+    @traced("quiz.run")
     def run(self):
         st.title(":material/crossword: 都道府県クイズ")
 
         # start screen
-        if "quiz" not in st.session_state:
+        if "quiz_state" not in st.session_state:
             st.subheader("モードを選んでゲームスタート！", divider="rainbow")
 
             default_mode = st.session_state.get("selected_mode", "map_capital_mc")
@@ -196,6 +137,11 @@ class QuizApp:
                 index=list(self.modes.keys()).index(default_mode),
             )
 
+            st.toggle(
+                "今日の問題（毎日かわる、みんな同じ問題）",
+                key="daily",
+            )
+
             with st.container(horizontal=True):
                 st.button("ゲームスタート", type="primary", on_click=self.start_quiz)
 
@@ -205,40 +151,39 @@ class QuizApp:
             return  # stop rendering further
 
         # in-quiz UI
-        quiz = st.session_state.quiz
-        idx = st.session_state.index
-
-        # score = st.session_state.score
-        answered = st.session_state.answered
+        state = st.session_state.quiz_state
+        idx = state.index
         show_answer = st.session_state.show_answer
-        mode = st.session_state.get("mode", "capital_to_pref_input")
+        mode = state.mode
 
         # finished
-        if idx >= NUM_QUESTIONS:
+        if state.finished:
             st.subheader(
-                f"結果: **正解は、{st.session_state.score} 問**でした！",
+                f"結果: **正解は、{state.score} 問**でした！",
                 divider="rainbow",
             )
             st.divider()
             st.write("詳しい結果：")
 
-            for i, entry in enumerate(answered, start=1):
-                if entry is None:
-                    st.write(f"{i}. （未回答）")
+            for i in range(len(state)):
+                if not state.is_answered(i):
+                    st.write(f"{i + 1}. （未回答）")
                     continue
 
-                user_ans, correct_ans, is_correct, pref, cap, lat, lon = entry
-                user_display = user_ans or "（未回答）"
+                p = state.prefecture(i)
+                user_display = state.user_answer(i) or "（未回答）"
                 qlabel = (
-                    f"県庁所在地: {cap}"
+                    f"県庁所在地: {p.capital}"
                     if mode == "capital_to_pref_input"
-                    else f"都道府県: {pref}"
+                    else f"都道府県: {p.name}"
                 )
-                result = "✅ 正解" if is_correct else "✖️ 不正解"
+                result = "✅ 正解" if state.is_correct(i) else "✖️ 不正解"
                 st.write(
-                    f"{i}. {qlabel} → 正解: {correct_ans} / あなた: {user_display} → {result}"
+                    f"{i + 1}. {qlabel} → 正解: {state.correct_answer(i)} / あなた: {user_display} → {result}"
                 )
-            st.caption(f"正答率: *{(st.session_state.score / NUM_QUESTIONS):.0%}*")
+            st.caption(f"正答率: *{(state.score / len(state)):.0%}*")
+            if state.round_id.startswith("daily:"):
+                st.caption("今日の問題はみんな同じだよ。明日もやってみよう")
             st.divider()
 
             with st.container(horizontal=True):
@@ -246,30 +191,9 @@ class QuizApp:
 
             return
 
-        # current question (safe unpack: quiz elements are (pref,cap,lat,lon) generated at start_quiz)
-        item = quiz[idx]
-
-        # conservative unpack fallback
-        if isinstance(item, (list, tuple)) and len(item) >= 4:
-            pref, cap, lat, lon = item[0], item[1], item[2], item[3]
-
-        else:
-            # fallback: try to find lat/lon from PREFECTURES list
-            pref, cap = item[0], item[1]  # type: ignore
-            found = next(
-                (
-                    (p, c, la, lo)
-                    for (p, c, la, lo) in PREFECTURES
-                    if p == pref or c == cap
-                ),
-                None,
-            )
-
-            if found:
-                pref, cap, lat, lon = found
-
-            else:
-                pref, cap, lat, lon = pref, cap, 36.0, 138.0
+        # current question (looked up from the prefecture table by row index)
+        p = state.prefecture(idx)
+        pref, cap = p.name, p.capital
 
         st.subheader(
             f"問題: {idx + 1} / {NUM_QUESTIONS}",
@@ -287,76 +211,22 @@ class QuizApp:
 
         elif mode == "pref_to_capital_mc":
             st.write(f"都道府県: **{pref}**")
-            options = st.session_state.get("mc_options", [])
-
-            # options[idx] should exist because start_quiz generated mc_options
-            if not options:
-                # fallback generation (shouldn't normally happen)
-                options = self._generate_mc_options_for_sample(quiz)
-                st.session_state.mc_options = options
-
-            choice_key = f"mc_choice_{idx}"
             st.radio(
                 "県庁所在地（4択）を選んでください",
-                options=options[idx],
-                key=choice_key,
+                options=state.options(idx),
+                key=CHOICE_KEY,
             )
 
         else:  # map_capital_mc
             st.subheader("どーこだ？", divider="violet")
             st.caption("ポイントにカーソルを当てるとヒントが出るよ")
-            map_data = pd.DataFrame([{"lat": lat, "lon": lon, "name": cap}])
-
-            view_state = pdk.ViewState(
-                latitude=lat,
-                longitude=lon,
-                zoom=12,
-                min_zoom=12,
-                max_zoom=12,
-                pitch=0,
-                interactive=False,
-            )
-
-            layer = pdk.Layer(
-                "ScatterplotLayer",
-                data=map_data,
-                get_position=[lon, lat],
-                get_radius=500,
-                get_fill_color=[255, 0, 0],
-                pickable=True,
-            )
+            with span("quiz.pydeck_chart"):
+                st.pydeck_chart(capital_deck(p.index))  # type: ignore
 
-            tooltip = {
-                "html": "<b>{name}</b>",
-                "style": {
-                    "background-color": "teal",
-                    "color": "aliceblue",
-                    "font-family": "Noto Sans JP, sans-serif",
-                    "border-radius": "50% 20% / 10% 40%",
-                },
-            }
-
-            deck = pdk.Deck(
-                map_style="dark_no_labels",
-                layers=[layer],
-                initial_view_state=view_state,
-                tooltip=tooltip,  # type: ignore
-            )
-
-            st.pydeck_chart(deck)
-
-            # use mc_map_options generated at start
-            options = st.session_state.get("mc_map_options", [])
-
-            if not options:
-                options = self._generate_mc_map_options_for_sample(quiz)
-                st.session_state.mc_map_options = options
-
-            choice_key = f"mc_choice_{idx}"
             st.radio(
                 "都道府県を選んでね",
-                options=options[idx],
-                key=choice_key,
+                options=state.options(idx),
+                key=CHOICE_KEY,
                 horizontal=True,
             )
 
@@ -371,19 +241,16 @@ class QuizApp:
         # 回答表示
         with st.status("進捗", expanded=True) as status:
             if show_answer:
-                user_ans, correct_ans, is_correct, _pref, _cap, _lat, _lon = (
-                    st.session_state.answered[idx]
-                )
-                user_display = user_ans if user_ans else "（未回答）"
+                correct_ans = state.correct_answer(idx)
 
-                if is_correct:
+                if state.is_correct(idx):
                     st.success(f"正解！ 正解は **{correct_ans}** です。")
 
                 else:
                     st.info(f"不正解。正解は **{correct_ans}** です。")
 
                 status.update(
-                    label=f"現在の正解数: **{st.session_state.score} / {idx + 1}**",
+                    label=f"現在の正解数: **{state.score} / {idx + 1}**",
                     state="complete",
                 )
 
@@ -394,7 +261,7 @@ class QuizApp:
                 )
                 st.info("地形から当ててみよう！")
 
-            st.toast(f"進捗: {idx} / {NUM_QUESTIONS} (正解: {st.session_state.score})")
+            st.toast(f"進捗: {idx} / {NUM_QUESTIONS} (正解: {state.score})")
 
         with st.sidebar:
             st.button("リセットして最初から", on_click=self.reset_to_start)
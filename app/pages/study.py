@@ -1,9 +1,15 @@
 import random
 
 import streamlit as st
-from common.pydeck import make_map
+from common.attributes import load_attributes
+from common.const import Const
+from common.pydeck import make_map, selected_in, selected_properties
+from common.spatial import load_spatial_index
 from common.step_by_step import StepByStep
-from common.utils import load_data
+from common.tracing import traced
+from common.utils import load_tier
+
+CONST = Const()
 
 ss = st.session_state
 step = StepByStep()
@@ -30,7 +36,19 @@ def change_step():
     ss.remaining_municipalities = None
 
 
-def question(data, area_code, has_tip):
+def distance_hint(region, selected, correct, area_code):
+    """選んだ場所の重心から正解までの距離（km）"""
+    targets = load_attributes(region).find(f"N03_00{area_code}", correct)
+    if not targets:
+        return None
+
+    index = load_spatial_index(region)
+    lon, lat = index.centroids[selected]
+    return min(index.distance(target, lon, lat) for target in targets)
+
+
+@traced("study.question")
+def question(area_code, has_tip, region):
     def answer_question():
         ss.sample_prev = ss.sample
 
@@ -50,11 +68,8 @@ def question(data, area_code, has_tip):
         ss.wrong_answers = []
         st.toast("問題をリセットしたよ")
 
-    municipalities = [
-        feature["properties"][f"N03_00{area_code}"]
-        for feature in data["features"]
-        if feature["properties"].get(f"N03_00{area_code}") is not None
-    ]
+    # 地名は属性テーブルから引く（ジオメトリは読まない）
+    municipalities = load_attributes(region).names(f"N03_00{area_code}")
 
     if "remaining_municipalities" not in ss or ss.remaining_municipalities is None:
         ss.remaining_municipalities = municipalities.copy()
@@ -93,14 +108,19 @@ def question(data, area_code, has_tip):
                     disabled=disable_answer,
                     on_click=answer_question,
                 ):
-                    if obj := ss.event:
-                        answer = obj.geojson[0]["properties"][f"N03_00{area_code}"]
+                    if selection := selected_in(ss.event, region):
+                        answer = selection.properties[f"N03_00{area_code}"]
 
                         if correct == answer:
                             st.toast("正解だよ！")
                             ss.correct_count += 1
                         else:
                             st.toast("おしい！")
+                            hint = distance_hint(
+                                region, selection.index, correct, area_code
+                            )
+                            if hint:
+                                st.toast(f"{correct}まであと約 {hint:.0f} km だよ")
                             if correct not in ss.wrong_answers:
                                 ss.wrong_answers.append(correct)
 
@@ -138,35 +158,41 @@ def question(data, area_code, has_tip):
     return has_tip
 
 
+@traced("study.step1")
 def step1(has_tip):
-    data = load_data("prefecture")
+    zoom, min_zoom = CONST.prefecture_zoom
+    max_zoom = CONST.prefecture_max_zoom
+    data = load_tier("prefecture", zoom=zoom, min_zoom=min_zoom, max_zoom=max_zoom)
 
     area_code = 1
-    has_tip = question(data, area_code, has_tip)
+    has_tip = question(area_code, has_tip, "prefecture")
 
     make_map(
         data,
         has_tip=has_tip,
-        max_zoom=8,
+        zoom=zoom,
+        min_zoom=min_zoom,
+        max_zoom=max_zoom,
         get_line_width=1000,
+        region="prefecture",
     )
 
 
+@traced("study.step2")
 def step2(has_tip):
-    if obj := ss.event:
-        pref = obj.geojson[0]["properties"]["N03_001"]
-        code = obj.geojson[0]["properties"]["N03_007"][:2]
+    if properties := selected_properties(ss.event):
+        pref = properties["N03_001"]
+        code = properties["N03_007"][:2]
         st.write(f"{pref}を選んだよ")
     else:
         st.info("都道府県から選択してね")
         return
 
+    zoom, min_zoom = CONST.region_zooms.get(code, CONST.region_zoom)
+
     with st.sidebar:
         is_subprefecture = False
-        zoom = 8
-        min_zoom = 6
         if pref == "北海道":
-            zoom = 6
             sub = st.segmented_control(
                 ":material/orbit: どっち",
                 options=["振興局", "市町村"],
@@ -175,18 +201,16 @@ def step2(has_tip):
                 help="北海道だけ特別だよ",
             )
             is_subprefecture = sub == "振興局"
-        elif pref == "東京都":
-            zoom = 9
-            min_zoom = 4
 
         area_code = 4
         if is_subprefecture:
             area_code = 2
             code += "_subprefecture"
 
-    data = load_data(f"{code}")
+    max_zoom = CONST.region_max_zoom
+    data = load_tier(f"{code}", zoom=zoom, min_zoom=min_zoom, max_zoom=max_zoom)
 
-    has_tip = question(data, area_code, has_tip)
+    has_tip = question(area_code, has_tip, code)
 
     lat, lon = None, None
     if pref == "北海道":
@@ -204,13 +228,16 @@ def step2(has_tip):
         has_tip=has_tip,
         zoom=zoom,
         min_zoom=min_zoom,
+        max_zoom=max_zoom,
         area_code=area_code,
         map_provider="carto",
         lat=lat,
         lon=lon,
+        region=code,
     )
 
 
+@traced("study.rerun")
 def main():
     st.title(":material/lightbulb: 場所と地名を覚えよう")
 
@@ -0,0 +1,6 @@
+"""ヘッドレスで動くベンチマーク
+
+リポジトリのルートで実行する:
+    PYTHONPATH=app python -m benchmarks.assets
+    python -m benchmarks.compare 前回.json 今回.json
+"""
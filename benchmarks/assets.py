@@ -0,0 +1,156 @@
+"""アセット読み込み・ジオメトリ計算・地図ペイロード作成のベンチマーク
+
+app/assets の全地域について次を計測し、JSON に書き出す。
+- json.load の解析時間と load_data（キャッシュなし / あり）の時間
+- get_geojson_bbox / get_geojson_center の時間
+- make_deck(...).to_json() の時間とバイト数（表示用の簡略化データ / 元データ）
+- JSON 化済みのレイヤーを使い回す make_deck_spec(...).to_json() の時間とバイト数
+- レイヤーの JSON 化（layer_json）の時間と地図のバイト数を形式（GeoJSON / 平らな
+  座標配列の "flat"）ごとに比べる
+- 1 地域を読み込んで地図を作るまでの Python の最大確保量（tracemalloc）
+- プロセスの最大常駐メモリ
+
+実行方法（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m benchmarks.assets [地域コード ...] [--repeat N] [-o FILE]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from common.const import Const
+from common.geocache import geometry_cache
+from common.pydeck import layer_json, make_deck, make_deck_spec
+from common.simplify import select_tier
+from common.utils import get_geojson_bbox, get_geojson_center, load_data
+from common.warmup import load_region, map_zooms
+
+from benchmarks.harness import measure, peak_rss_bytes, summarize, write_results
+
+CONST = Const()
+
+BASE_DIR = CONST.base_dir
+REGIONS = CONST.regions
+
+
+def _parse(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def bench_region(region: str, repeat: int) -> dict:
+    """1 地域分の計測結果"""
+    path = f"{BASE_DIR}{region}.json"
+    with open(path, "rb") as f:
+        file_bytes = len(f.read())
+
+    timings = {
+        "parse": measure(lambda: _parse(path), repeat),
+        "load_data_cold": measure(
+            lambda: load_data(region), repeat, setup=geometry_cache.clear
+        ),
+        "load_data_warm": measure(lambda: load_data(region), repeat),
+    }
+
+    data = load_data(region)
+    tier = load_region(region)
+    payload = make_deck(tier, region=region).to_json()
+    payload_raw = make_deck(data, region=region).to_json()
+
+    zoom, min_zoom, max_zoom = map_zooms(region)
+
+    def spec(layer_format: str = "geojson"):
+        return make_deck_spec(
+            tier,
+            region,
+            zoom=zoom,
+            min_zoom=min_zoom,
+            max_zoom=max_zoom,
+            layer_format=layer_format,
+        ).to_json()
+
+    def build_layer(layer_format: str):
+        tier_key = select_tier(zoom, min_zoom, max_zoom)
+        return layer_json(region, tier_key, 100, tier, layer_format)
+
+    layer_json.clear()
+    payload_spec = spec()
+    payload_spec_flat = spec("flat")
+
+    timings["get_geojson_bbox"] = measure(lambda: get_geojson_bbox(data), repeat)
+    timings["get_geojson_center"] = measure(lambda: get_geojson_center(data), repeat)
+    timings["deck_to_json"] = measure(
+        lambda: make_deck(tier, region=region).to_json(), repeat
+    )
+    timings["deck_to_json_raw"] = measure(
+        lambda: make_deck(data, region=region).to_json(), repeat
+    )
+    # レイヤーの JSON はキャッシュ済み（ビューとツールチップだけを作る）
+    timings["deck_spec_to_json"] = measure(spec, repeat)
+    # キャッシュがないときのレイヤーの JSON 化（形式ごと）
+    timings["layer_json"] = measure(
+        lambda: build_layer("geojson"), repeat, setup=layer_json.clear
+    )
+    timings["layer_json_flat"] = measure(
+        lambda: build_layer("flat"), repeat, setup=layer_json.clear
+    )
+
+    # 確保量は計測の邪魔になるので別に測る
+    geometry_cache.clear()
+    tracemalloc.start()
+    make_deck(load_data(region), region=region).to_json()
+    _current, peak_alloc = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "file_bytes": file_bytes,
+        "payload_bytes": len(payload.encode("utf-8")),
+        "payload_bytes_raw": len(payload_raw.encode("utf-8")),
+        "payload_bytes_spec": len(payload_spec.encode("utf-8")),
+        "payload_bytes_spec_flat": len(payload_spec_flat.encode("utf-8")),
+        "peak_alloc_bytes": peak_alloc,
+        "timings": {name: summarize(samples) for name, samples in timings.items()},
+    }
+
+
+def run(regions: list[str], repeat: int) -> dict:
+    start = time.perf_counter()
+    results = {}
+    for region in regions:
+        results[region] = bench_region(region, repeat)
+        timings = results[region]["timings"]
+        print(
+            f"{region:<16} parse {timings['parse']['p50_ms']:>7.1f}ms"
+            f"  load {timings['load_data_cold']['p50_ms']:>7.1f}ms"
+            f"  bbox {timings['get_geojson_bbox']['p50_ms']:>6.2f}ms"
+            f"  deck {timings['deck_to_json']['p50_ms']:>7.1f}ms"
+            f"  spec {timings['deck_spec_to_json']['p50_ms']:>6.2f}ms"
+            f"  {results[region]['payload_bytes']:>10,} bytes"
+            f"  spec {results[region]['payload_bytes_spec']:>9,}"
+            f" / flat {results[region]['payload_bytes_spec_flat']:>9,} bytes"
+        )
+
+    return {
+        "repeat": repeat,
+        "regions": results,
+        "summary": {
+            "elapsed_s": time.perf_counter() - start,
+            "peak_rss_bytes": peak_rss_bytes(),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("regions", nargs="*", default=REGIONS, help="地域コード")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数")
+    parser.add_argument("-o", "--output", help="結果の JSON の出力先")
+    args = parser.parse_args()
+
+    results = run(args.regions, args.repeat)
+    path = write_results("assets", results, args.output)
+
+    summary = results["summary"]
+    print(f"peak RSS {summary['peak_rss_bytes'] / 2**20:.0f} MiB")
+    print(f"elapsed  {summary['elapsed_s']:.1f} s -> {path}")
@@ -0,0 +1,79 @@
+"""ベンチマーク結果 2 つを比較する
+
+地域ごとの各計測の p50 とバイト数を比べ、しきい値を超えて
+悪化したものがあれば終了コード 1 を返す。
+
+実行方法（リポジトリのルートで実行）:
+    python -m benchmarks.compare 前回.json 今回.json [--threshold 1.1]
+"""
+
+import argparse
+import json
+import sys
+
+# バイト数として比べる項目
+BYTE_KEYS = (
+    "file_bytes",
+    "payload_bytes",
+    "payload_bytes_raw",
+    "payload_bytes_spec",
+    "payload_bytes_spec_flat",
+    "peak_alloc_bytes",
+)
+
+
+def compare(
+    old: dict, new: dict, threshold: float = 1.1
+) -> list[tuple[str, str, float, float, bool]]:
+    """(地域, 項目, 前回, 今回, 悪化したか) のリスト（共通の地域・項目だけ）"""
+    rows = []
+    for region, after in new["regions"].items():
+        if (before := old["regions"].get(region)) is None:
+            continue
+
+        pairs = [
+            (key, before[key], after[key])
+            for key in BYTE_KEYS
+            if key in before and key in after
+        ]
+        pairs += [
+            (f"{name}.p50_ms", before["timings"][name]["p50_ms"], stats["p50_ms"])
+            for name, stats in after["timings"].items()
+            if name in before["timings"]
+        ]
+
+        for key, a, b in pairs:
+            rows.append((region, key, a, b, a > 0 and b / a > threshold))
+
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("old", help="前回の結果")
+    parser.add_argument("new", help="今回の結果")
+    parser.add_argument("--threshold", type=float, default=1.1, help="悪化とみなす比率")
+    parser.add_argument("--all", action="store_true", help="悪化していない項目も表示")
+    args = parser.parse_args(argv)
+
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']}")
+    rows = compare(old, new, args.threshold)
+    for region, key, a, b, regressed in rows:
+        if regressed or args.all:
+            ratio = b / a if a else float("inf")
+            mark = "!" if regressed else " "
+            print(f"{mark} {region:<16} {key:<28}", end="")
+            print(f" {a:>12,.2f} -> {b:>12,.2f} {ratio:>6.2f}x")
+
+    regressions = sum(row[4] for row in rows)
+    print(f"{regressions} regressions / {len(rows)} metrics")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
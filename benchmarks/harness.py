@@ -0,0 +1,108 @@
+"""ベンチマーク共通の計測・集計・結果の書き出し"""
+
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+RESULTS_DIR = "benchmarks/results/"
+
+
+def measure(
+    func: Callable[[], object],
+    repeat: int,
+    setup: Callable[[], object] | None = None,
+) -> list[float]:
+    """func を repeat 回実行した秒数（setup は計測に含めない）"""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+
+    return samples
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """昇順の値の q パーセンタイル（nearest-rank）"""
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """秒数のリストをミリ秒の統計量にまとめる"""
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "min_ms": ordered[0] * 1000,
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p95_ms": percentile(ordered, 95) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def peak_rss_bytes() -> int:
+    """プロセスの最大常駐メモリ"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux は KiB、macOS はバイト
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_rss_bytes() -> int:
+    """現在の常駐メモリ（/proc が無い環境では最大常駐メモリ）"""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return peak_rss_bytes()
+
+    return pages * resource.getpagesize()
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return result.stdout.strip()
+
+
+def metadata() -> dict:
+    """比較のための実行環境"""
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_results(name: str, results: dict, path: str | None = None) -> str:
+    """結果を JSON で書き出し、パスを返す（既定は results/<name>-<commit>.json）"""
+    results = {"benchmark": name, "meta": metadata(), **results}
+    if path is None:
+        path = f"{RESULTS_DIR}{name}-{results['meta']['commit'] or 'local'}.json"
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+    return path
@@ -0,0 +1,133 @@
+"""起動時の import 時間の内訳と予算のチェック（python -X importtime）
+
+main.py と各ページの先頭の import 文を新しいプロセスで `python -X importtime` で
+実行し、Streamlit 本体より後に読み込まれたモジュールの時間を集計する。
+予算のファイル（benchmarks/startup_budget.json）と比べ、import 時間が予算を
+超えたスクリプトや、読み込んではいけないモジュール（pandas など）を読み込んだ
+スクリプトがあれば終了コード 1 を返す。
+
+予算のファイルの形式:
+    {"app/main.py": {"import_ms": 60, "forbidden": ["numpy", "requests"]}, ...}
+
+実行方法（リポジトリのルートで実行）:
+    python -m benchmarks.importtime [スクリプト ...] [--budget FILE] [--repeat N]
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from typing import NamedTuple
+
+from benchmarks.startup import TARGETS, env, import_statements
+
+BUDGET_FILE = "benchmarks/startup_budget.json"
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+class ImportTime(NamedTuple):
+    """-X importtime の 1 行（マイクロ秒、depth は入れ子の深さ）"""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse(stderr: str, after: str = "streamlit") -> list[ImportTime]:
+    """-X importtime の出力のうち、最上位の after より後に読み込まれた行"""
+    rows = []
+    for line in stderr.splitlines():
+        if (m := _LINE.match(line)) is None:
+            continue
+
+        row = ImportTime(m[4], int(m[1]), int(m[2]), len(m[3]) // 2)
+        if row.depth == 0 and row.module == after:
+            rows = []
+            continue
+        rows.append(row)
+
+    return rows
+
+
+def total_ms(rows: list[ImportTime]) -> float:
+    """最上位のモジュールの累計（= import 文の実行にかかった時間）"""
+    return sum(row.cumulative_us for row in rows if row.depth == 0) / 1000
+
+
+def packages(rows: list[ImportTime]) -> set[str]:
+    """読み込まれたトップレベルのパッケージ名"""
+    return {row.module.split(".", 1)[0] for row in rows}
+
+
+def importtime(target: str) -> list[ImportTime]:
+    """新しいプロセスで target の import 文を -X importtime で 1 回実行する"""
+    source = f"import streamlit\n{import_statements(target)}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", source],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env(),
+    )
+    return parse(result.stderr)
+
+
+def check(target: str, runs: list[list[ImportTime]], budget: dict) -> list[str]:
+    """予算を超えた項目の説明（超えていなければ空）"""
+    problems = []
+
+    elapsed = statistics.median(total_ms(rows) for rows in runs)
+    if (limit := budget.get("import_ms")) is not None and elapsed > limit:
+        problems.append(f"{target}: import {elapsed:.1f} ms > budget {limit} ms")
+
+    loaded = set().union(*(packages(rows) for rows in runs))
+    for module in budget.get("forbidden", []):
+        if module in loaded:
+            problems.append(f"{target}: imports {module}")
+
+    return problems
+
+
+def report(target: str, runs: list[list[ImportTime]], top: int) -> None:
+    elapsed = statistics.median(total_ms(rows) for rows in runs)
+    print(f"{target}: {elapsed:.1f} ms")
+
+    # 最後の実行の累計が大きいモジュール
+    for row in sorted(runs[-1], key=lambda r: -r.cumulative_us)[:top]:
+        print(
+            f"  {row.cumulative_us / 1000:>8.1f} ms  {row.self_us / 1000:>7.1f} ms"
+            f"  {'  ' * row.depth}{row.module}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "targets", nargs="*", help="スクリプトのパス（既定は予算の全て）"
+    )
+    parser.add_argument("--budget", default=BUDGET_FILE, help="予算の JSON")
+    parser.add_argument("--repeat", type=int, default=3, help="計測の繰り返し回数")
+    parser.add_argument("--top", type=int, default=10, help="内訳に出すモジュール数")
+    args = parser.parse_args(argv)
+
+    with open(args.budget, encoding="utf-8") as f:
+        budgets = json.load(f)
+
+    problems = []
+    for target in args.targets or list(budgets) or list(TARGETS):
+        runs = [importtime(target) for _ in range(args.repeat)]
+        report(target, runs, args.top)
+        problems += check(target, runs, budgets.get(target, {}))
+
+    for problem in problems:
+        print(f"OVER BUDGET {problem}")
+
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
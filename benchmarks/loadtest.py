@@ -0,0 +1,213 @@
+"""AppTest で動かすヘッドレスの負荷試験
+
+ブラウザの代わりに streamlit.testing.v1.AppTest でセッションを作り、
+クイズ 1 回分（スタート → 回答 → 次へ ×10）と学習ページの操作
+（都道府県を答える → 次へ進む → 市町村を答える）をシミュレーションする。
+利用者はスレッドで並行に動かし、1 プロセスに多数のセッションが
+載った状態で次を計測する。
+- 1 秒あたりの再実行回数と、再実行ごとの時間の分布
+- 順番待ちを含めた応答時間の分布
+- セッション 1 つあたりのメモリ（session_state の pickle サイズと RSS の増分）
+
+AppTest は実行のたびにプロセス全体の Runtime を差し替えるため、
+再実行そのものは 1 つずつ順に行う（GIL の下で CPU を使い切る
+Streamlit ワーカーの上限に近い）。
+
+実行方法（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m benchmarks.loadtest [quiz|study ...] [--users N]
+"""
+
+import argparse
+import os
+import pickle
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common.attributes import load_attributes
+from common.const import Const
+from common.pydeck import SELECTION_KEYS, Selection
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.harness import current_rss_bytes, summarize, write_results
+
+CONST = Const()
+
+# AppTest の相対パスは呼び出し元のファイルから解決されるので絶対パスにする
+PAGES_DIR = os.path.abspath("app/pages")
+QUIZ_PAGE = os.path.join(PAGES_DIR, "quiz.py")
+STUDY_PAGE = os.path.join(PAGES_DIR, "study.py")
+
+TIMEOUT = 60
+
+# AppTest の実行はプロセス内で同時に 1 つだけ
+_RUN_LOCK = threading.Lock()
+
+
+class Session:
+    """シミュレーションする利用者 1 人（再実行と応答の時間を記録する）"""
+
+    def __init__(self, page: str, seed: int, accuracy: float) -> None:
+        self.app = AppTest.from_file(page, default_timeout=TIMEOUT)
+        self.rng = random.Random(seed)
+        self.accuracy = accuracy
+        self.timings: list[float] = []
+        self.responses: list[float] = []
+
+    def run(self) -> None:
+        queued = time.perf_counter()
+        with _RUN_LOCK:
+            start = time.perf_counter()
+            self.app.run()
+            end = time.perf_counter()
+
+        self.timings.append(end - start)
+        self.responses.append(end - queued)
+
+        if self.app.exception:
+            raise RuntimeError(self.app.exception[0].message)
+
+    def click(self, label: str) -> None:
+        next(b for b in self.app.button if b.label == label).click()
+        self.run()
+
+    def state(self, key: str, default=None):
+        ss = self.app.session_state
+        return ss[key] if key in ss else default
+
+    def session_bytes(self) -> int:
+        """session_state を pickle したときのバイト数（ウィジェット値を含む）"""
+        ss = self.app.session_state
+        return sum(len(pickle.dumps(ss[key])) for key in ss)
+
+
+def quiz_round(session: Session) -> None:
+    """クイズ 1 回分: start_quiz → (submit_answer → next_question) ×10"""
+    session.run()
+    session.click("ゲームスタート")
+
+    for index in range(CONST.num_questions):
+        correct = session.state("quiz_state").correct_answer(index)
+        radio = session.app.radio(key="mc_choice")
+        if session.rng.random() < session.accuracy:
+            radio.set_value(correct)
+        else:
+            radio.set_value(session.rng.choice(radio.options))
+
+        session.click("回答する")
+        session.click("次へ")
+
+
+def _select(session: Session, region: str, key: str, answer: str) -> None:
+    """地図をクリックした代わりに選択イベントを session_state へ入れる"""
+    table = load_attributes(region)
+    candidates = table.find(key, answer)
+    if not candidates or session.rng.random() >= session.accuracy:
+        candidates = [i for i, value in enumerate(table.column(key)) if value]
+
+    index = session.rng.choice(candidates)
+    properties = {k: table.column(k)[index] for k in SELECTION_KEYS}
+    session.app.session_state["indices"] = index
+    session.app.session_state["event"] = Selection(index, properties, region)
+
+
+def study_walk(session: Session, answers: int = 5) -> None:
+    """学習ページ: 都道府県を答える → 次へ進む → 市町村を答える"""
+    session.app.session_state["now"] = 0
+    session.run()
+
+    for _ in range(answers):
+        _select(session, "prefecture", "N03_001", session.state("sample_prev"))
+        session.click("答える")
+
+    session.click("次へ進む")
+    event = session.state("event")
+    code = event.properties["N03_007"][:2]
+
+    for _ in range(answers):
+        _select(session, code, "N03_004", session.state("sample_prev"))
+        session.click("答える")
+
+
+SCENARIOS = {
+    "quiz": (QUIZ_PAGE, quiz_round),
+    "study": (STUDY_PAGE, study_walk),
+}
+
+
+def run_scenario(name: str, users: int, workers: int, accuracy: float) -> dict:
+    """users 人分のシナリオを workers 並列で動かした結果"""
+    page, scenario = SCENARIOS[name]
+
+    # import やキャッシュの読み込みを計測に含めないよう 1 人分先に動かす
+    scenario(Session(page, -1, accuracy))
+
+    sessions = [Session(page, seed, accuracy) for seed in range(users)]
+    errors: list[str] = []
+    lock = threading.Lock()
+
+    def play(session: Session) -> None:
+        try:
+            scenario(session)
+        except Exception as e:
+            with lock:
+                errors.append(f"{type(e).__name__}: {e}")
+
+    rss_before = current_rss_bytes()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(play, sessions))
+    elapsed = time.perf_counter() - start
+    rss_after = current_rss_bytes()
+
+    timings = [t for session in sessions for t in session.timings]
+    responses = [t for session in sessions for t in session.responses]
+    session_bytes = [session.session_bytes() for session in sessions]
+
+    return {
+        "users": users,
+        "workers": workers,
+        "reruns": len(timings),
+        "elapsed_s": elapsed,
+        "reruns_per_s": len(timings) / elapsed if elapsed else 0.0,
+        "rerun": summarize(timings) if timings else None,
+        "response": summarize(responses) if responses else None,
+        "session_bytes_mean": sum(session_bytes) / users,
+        "rss_per_session_bytes": (rss_after - rss_before) / users,
+        "errors": errors,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS))
+    parser.add_argument("--users", type=int, default=20, help="利用者数")
+    parser.add_argument("--workers", type=int, default=8, help="同時に動かす人数")
+    parser.add_argument("--accuracy", type=float, default=0.7, help="正答率")
+    parser.add_argument("-o", "--output", help="結果の JSON の出力先")
+    args = parser.parse_args()
+    if unknown := set(args.scenarios) - set(SCENARIOS):
+        parser.error(f"未知のシナリオです: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name in args.scenarios:
+        result = run_scenario(name, args.users, args.workers, args.accuracy)
+        results[name] = result
+
+        print(
+            f"{name:<6} {result['reruns']:>5} reruns {result['reruns_per_s']:>6.1f}/s"
+            f"  session {result['session_bytes_mean'] / 1024:>6.1f} KiB"
+            f"  rss/session {result['rss_per_session_bytes'] / 2**20:>5.1f} MiB"
+        )
+        for label in ("rerun", "response"):
+            if stats := result[label]:
+                print(
+                    f"  {label:<8} p50 {stats['p50_ms']:>8.1f}ms"
+                    f"  p95 {stats['p95_ms']:>8.1f}ms  p99 {stats['p99_ms']:>8.1f}ms"
+                )
+        for error in result["errors"]:
+            print(f"  {error}")
+
+    path = write_results("loadtest", {"scenarios": results}, args.output)
+    print(f"-> {path}")
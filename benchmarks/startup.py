@@ -0,0 +1,125 @@
+"""起動時間のベンチマーク（ページの import 時間と常駐メモリ）
+
+対象のスクリプト（main.py や各ページ）の先頭の import 文だけを毎回新しい
+プロセスで実行し、次を計測して JSON に書き出す。
+- Streamlit を読み込んだ後の、import 文の実行にかかった時間
+- import による常駐メモリの増分
+- import で読み込まれた重いモジュール（pandas など）
+
+ページはスクリプトとして実行されるので、画面を組み立てる部分は実行しない。
+Streamlit 本体はどのページでも読み込まれるので、先に読み込んでから計測する。
+
+実行方法（リポジトリのルートで実行）:
+    PYTHONPATH=app python -m benchmarks.startup [スクリプト ...] [--repeat N] [-o FILE]
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.harness import summarize, write_results
+
+TARGETS = ("app/main.py", "app/pages/quiz.py", "app/pages/study.py")
+
+# 読み込まれたかを記録するモジュール
+HEAVY_MODULES = ("pandas", "pyarrow", "numpy", "pydeck", "requests")
+
+# 子プロセスで実行する計測（結果は標準出力の最後の行に JSON で出す）
+_PROBE = """
+import json, sys, time
+from benchmarks.harness import current_rss_bytes
+import streamlit
+
+code = compile(sys.argv[1], sys.argv[2], "exec")
+base = current_rss_bytes()
+start = time.perf_counter()
+exec(code, {"__name__": "__startup__"})
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "import_s": elapsed,
+    "rss_bytes": current_rss_bytes() - base,
+    "loaded": [m for m in sys.argv[3:] if m in sys.modules],
+}))
+"""
+
+
+def import_statements(path: str) -> str:
+    """スクリプトの先頭の import 文だけを取り出したソース"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+
+    imports = [n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))]
+    return ast.unparse(ast.Module(imports, []))
+
+
+def env() -> dict[str, str]:
+    paths = [os.path.abspath("app"), os.path.abspath(".")]
+    if extra := os.environ.get("PYTHONPATH"):
+        paths.append(extra)
+
+    return {**os.environ, "PYTHONPATH": os.pathsep.join(paths)}
+
+
+def probe(target: str) -> dict:
+    """新しいプロセスで target（スクリプトのパス）の import 文を 1 回実行した結果"""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            _PROBE,
+            import_statements(target),
+            target,
+            *HEAVY_MODULES,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env(),
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def bench_target(target: str, repeat: int) -> dict:
+    """1 スクリプト分の計測結果"""
+    probes = [probe(target) for _ in range(repeat)]
+
+    return {
+        "rss_bytes": int(statistics.median(p["rss_bytes"] for p in probes)),
+        "loaded": probes[-1]["loaded"],
+        "timings": {"import": summarize([p["import_s"] for p in probes])},
+    }
+
+
+def run(targets: list[str], repeat: int) -> dict:
+    start = time.perf_counter()
+    results = {}
+    for target in targets:
+        results[target] = bench_target(target, repeat)
+        print(
+            f"{target:<20} import {results[target]['timings']['import']['p50_ms']:>7.1f}ms"
+            f"  rss +{results[target]['rss_bytes'] / 2**20:>6.1f} MiB"
+            f"  {' '.join(results[target]['loaded']) or '-'}"
+        )
+
+    return {
+        "repeat": repeat,
+        "targets": results,
+        "summary": {"elapsed_s": time.perf_counter() - start},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("targets", nargs="*", default=TARGETS, help="スクリプトのパス")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数")
+    parser.add_argument("-o", "--output", help="結果の JSON の出力先")
+    args = parser.parse_args()
+
+    results = run(args.targets, args.repeat)
+    path = write_results("startup", results, args.output)
+    print(f"elapsed  {results['summary']['elapsed_s']:.1f} s -> {path}")
@@ -0,0 +1,30 @@
+#!/bin/bash
+
+# スクリプトのある場所を基準にパスを解決
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+cd "$SCRIPT_DIR" || exit 1
+
+# アセットの派生ファイルを生成（app/assets/*.json を更新したら実行）
+export PYTHONPATH="$SCRIPT_DIR/app"
+
+# bbox・中心座標インデックス
+uv run python -m common.geoindex
+
+# メモリマップ型バイナリストア（app/assets/build/*.geo）
+uv run python -m common.geostore
+
+# ズームレベル別の簡略化ジオメトリ（app/assets/build/*_z*.json）
+uv run python -m common.simplify
+
+# 共有境界を 1 本にまとめた TopoJSON（app/assets/build/*.topojson）
+uv run python -m common.topology
+
+# ジオメトリを含まない属性テーブル（app/assets/build/*.attrs.json）
+uv run python -m common.attributes
+
+# gzip / zstd / brotli 圧縮版（app/assets/build/*.json.gz|.zst|.br）
+uv run python -m common.compressed
+
+# クイズの共有出題プール（app/assets/build/*.rounds.npz）
+uv run python -m common.rounds
@@ -0,0 +1,99 @@
+"""テスト共通のフィクスチャ"""
+
+import os
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), "..", "app", "assets")
+
+
+class StaticHandler(SimpleHTTPRequestHandler):
+    """ETag を付けて配信し、リクエストを記録するハンドラー"""
+
+    etag = None
+
+    def send_head(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers)))
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            fail = server.failures > 0
+            server.failures -= fail
+
+        try:
+            time.sleep(server.delay)
+            if fail:
+                self.send_error(503)
+                return None
+
+            path = self.translate_path(self.path)
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                self.etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+                if self.headers.get("If-None-Match") == self.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return None
+
+            return super().send_head()
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def end_headers(self):
+        if self.etag is not None:
+            self.send_header("ETag", self.etag)
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StaticServer(ThreadingHTTPServer):
+    """ディレクトリを配信するローカル HTTP サーバー（アセット配信の代役）"""
+
+    daemon_threads = True
+
+    def __init__(self, directory: str) -> None:
+        super().__init__(
+            ("127.0.0.1", 0), partial(StaticHandler, directory=str(directory))
+        )
+        self.url = f"http://127.0.0.1:{self.server_address[1]}/"
+        self.lock = threading.Lock()
+        self.requests: list[tuple[str, dict]] = []
+        self.failures = 0  # 次の n 件に 503 を返す
+        self.delay = 0.0  # 応答までの秒数
+        self.active = 0
+        self.peak = 0
+
+
+def _serve(directory):
+    httpd = StaticServer(directory)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    return httpd
+
+
+@pytest.fixture
+def server(tmp_path):
+    """tmp_path を配信するローカル HTTP サーバー"""
+    httpd = _serve(tmp_path)
+    yield httpd
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def asset_server():
+    """app/assets を配信するローカル HTTP サーバー"""
+    httpd = _serve(ASSETS_DIR)
+    yield httpd
+
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,82 @@
+"""Unit tests for app/common/attributes.py"""
+
+from app.common.attributes import AttributeTable, load_attributes
+
+GEOJSON = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "geometry": None,
+            "properties": {
+                "N03_001": "北海道",
+                "N03_002": "石狩振興局",
+                "N03_003": None,
+                "N03_004": "札幌市",
+                "N03_007": "01100",
+            },
+        },
+        {
+            "type": "Feature",
+            "geometry": None,
+            "properties": {"N03_001": "北海道", "N03_004": None, "N03_007": "01000"},
+        },
+        {
+            "type": "Feature",
+            "geometry": None,
+            "properties": {
+                "N03_001": "北海道",
+                "N03_002": "渡島総合振興局",
+                "N03_004": "函館市",
+                "N03_007": "01202",
+            },
+        },
+    ],
+}
+
+
+class TestAttributeTable:
+    """Test cases for AttributeTable class"""
+
+    def test_columns(self):
+        """列ごとのリスト（無い属性は None）"""
+        table = AttributeTable.from_geojson(GEOJSON)
+
+        assert len(table) == 3
+        assert table.column("index") == [0, 1, 2]
+        assert table.column("N03_002") == ["石狩振興局", None, "渡島総合振興局"]
+        assert table.column("N03_003") == [None, None, None]
+
+    def test_names(self):
+        """None を除いた地名の一覧（フィーチャー順）"""
+        table = AttributeTable.from_geojson(GEOJSON)
+        assert table.names("N03_004") == ["札幌市", "函館市"]
+
+    def test_row_and_find(self):
+        """行の取得と値による検索"""
+        table = AttributeTable.from_geojson(GEOJSON)
+
+        assert table.find("N03_004", "函館市") == [2]
+        assert table.row(2)["N03_007"] == "01202"
+        assert table.find("N03_004", "旭川市") == []
+
+    def test_from_features(self):
+        """フィーチャーのイテレーターからも同じ列になる"""
+        table = AttributeTable.from_features(iter(GEOJSON["features"]))
+
+        assert table.columns == AttributeTable.from_geojson(GEOJSON).columns
+
+    def test_write_read(self, tmp_path):
+        """書き出したテーブルを読み込むと同じ列になる"""
+        table = AttributeTable.from_geojson(GEOJSON)
+        path = str(tmp_path / "test.attrs.json")
+
+        assert table.write(path) > 0
+        assert AttributeTable.read(path).columns == table.columns
+
+    def test_load_attributes(self):
+        """アセットの地名がフィーチャー順に並ぶ"""
+        table = load_attributes("03")
+
+        assert table.column("N03_004")[0] == "盛岡市"
+        assert "宮古市" in table.names("N03_004")
@@ -0,0 +1,171 @@
+"""Unit tests for benchmarks/harness.py, benchmarks/compare.py, benchmarks/startup.py and benchmarks/importtime.py"""
+
+import json
+
+from benchmarks.compare import compare, main
+from benchmarks.harness import measure, percentile, summarize, write_results
+from benchmarks.importtime import BUDGET_FILE, ImportTime, check, importtime, parse
+from benchmarks.importtime import main as importtime_main
+from benchmarks.loadtest import QUIZ_PAGE, STUDY_PAGE, Session, quiz_round
+from benchmarks.startup import probe
+
+
+def _result(p50: float, payload: int) -> dict:
+    return {
+        "meta": {"commit": "abc"},
+        "regions": {
+            "03": {
+                "payload_bytes": payload,
+                "timings": {"parse": {"p50_ms": p50}},
+            }
+        },
+    }
+
+
+class TestHarness:
+    """Test cases for benchmark harness"""
+
+    def test_percentile(self):
+        """nearest-rank のパーセンタイル"""
+        ordered = [float(i) for i in range(1, 101)]
+
+        assert percentile(ordered, 50) == 50.0
+        assert percentile(ordered, 95) == 95.0
+        assert percentile(ordered, 99) == 99.0
+        assert percentile([1.0], 99) == 1.0
+
+    def test_summarize(self):
+        """秒数をミリ秒の統計量にまとめる"""
+        summary = summarize([0.003, 0.001, 0.002])
+
+        assert summary["n"] == 3
+        assert summary["min_ms"] == 1.0
+        assert summary["p50_ms"] == 2.0
+        assert summary["max_ms"] == 3.0
+
+    def test_measure(self):
+        """setup を毎回呼び、繰り返し回数分の計測値を返す"""
+        calls = []
+        samples = measure(lambda: calls.append("run"), 3, lambda: calls.append("s"))
+
+        assert len(samples) == 3
+        assert calls == ["s", "run"] * 3
+
+    def test_write_results(self, tmp_path):
+        """実行環境と一緒に JSON で書き出す"""
+        path = write_results("test", {"value": 1}, str(tmp_path / "out.json"))
+
+        with open(path, encoding="utf-8") as f:
+            results = json.load(f)
+        assert results["benchmark"] == "test"
+        assert results["value"] == 1
+        assert "python" in results["meta"]
+
+
+class TestCompare:
+    """Test cases for benchmark comparison"""
+
+    def test_compare(self):
+        """しきい値を超えた悪化だけを検出する"""
+        rows = compare(_result(10.0, 1000), _result(12.0, 1050), threshold=1.1)
+
+        assert ("03", "payload_bytes", 1000, 1050, False) in rows
+        assert ("03", "parse.p50_ms", 10.0, 12.0, True) in rows
+
+    def test_main_exit_code(self, tmp_path):
+        """悪化があれば終了コード 1"""
+        old, new = tmp_path / "old.json", tmp_path / "new.json"
+        old.write_text(json.dumps(_result(10.0, 1000)))
+        new.write_text(json.dumps(_result(10.5, 1000)))
+
+        assert main([str(old), str(new)]) == 0
+        assert main([str(new), str(old), "--threshold", "0.9"]) == 1
+
+
+class TestLoadTest:
+    """Test cases for AppTest load-testing harness"""
+
+    def test_quiz_round(self):
+        """クイズ 1 回分を最後まで進める"""
+        session = Session(QUIZ_PAGE, seed=0, accuracy=1.0)
+        quiz_round(session)
+
+        # スタート画面 + ゲームスタート + (回答する + 次へ) × 10
+        assert len(session.timings) == 22
+        assert session.state("quiz_state").index == 10
+        assert session.state("quiz_state").score == 10
+        assert session.session_bytes() > 0
+
+
+class TestStartup:
+    """Test cases for startup benchmark"""
+
+    def test_probe(self, tmp_path):
+        """スクリプトの import 文だけを新しいプロセスで実行する"""
+        script = tmp_path / "page.py"
+        script.write_text(
+            "import numpy\nfrom common.const import Const\n\nraise SystemExit(1)\n"
+        )
+
+        result = probe(str(script))
+
+        assert result["loaded"] == ["numpy"]
+        assert result["import_s"] > 0
+
+    def test_pages_without_pandas(self):
+        """クイズ・学習のページは pandas を読み込まない"""
+        assert "pandas" not in probe(QUIZ_PAGE)["loaded"]
+        assert "pandas" not in probe(STUDY_PAGE)["loaded"]
+
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   streamlit.version
+import time:      1000 |       5000 | streamlit
+import time:       200 |        200 |     numpy._core
+import time:       300 |        500 |   numpy
+import time:       400 |        900 | common.geometry
+import time:        50 |         50 | common.const
+"""
+
+
+class TestImportTime:
+    """Test cases for import-time report and budget"""
+
+    def test_parse(self):
+        """Streamlit より後の行だけを入れ子の深さつきで読む"""
+        rows = parse(IMPORTTIME)
+
+        assert rows[0] == ImportTime("numpy._core", 200, 200, 2)
+        assert [row.module for row in rows if row.depth == 0] == [
+            "common.geometry",
+            "common.const",
+        ]
+
+    def test_check(self):
+        """予算を超えた時間と読み込んではいけないモジュール"""
+        runs = [parse(IMPORTTIME)]
+
+        assert check("page.py", runs, {"import_ms": 1, "forbidden": ["pandas"]}) == []
+        assert check("page.py", runs, {"import_ms": 0.5, "forbidden": ["numpy"]}) == [
+            "page.py: import 0.9 ms > budget 0.5 ms",
+            "page.py: imports numpy",
+        ]
+
+    def test_budget_modules(self):
+        """main.py と各ページは予算で禁じたモジュールを読み込まない"""
+        with open(BUDGET_FILE, encoding="utf-8") as f:
+            budgets = json.load(f)
+
+        for target, budget in budgets.items():
+            forbidden = {"forbidden": budget["forbidden"]}
+            assert check(target, [importtime(target)], forbidden) == []
+
+    def test_main_exit_code(self, tmp_path):
+        """予算を超えれば終了コード 1"""
+        budget = tmp_path / "budget.json"
+        budget.write_text(json.dumps({STUDY_PAGE: {"forbidden": ["numpy"]}}))
+        args = ["--budget", str(budget), "--repeat", "1", "--top", "0"]
+
+        assert importtime_main(args) == 1
+        assert importtime_main([QUIZ_PAGE, *args]) == 0
@@ -0,0 +1,134 @@
+"""Unit tests for app/common/compressed.py"""
+
+import io
+import json
+
+from types import SimpleNamespace
+
+import pytest
+
+import app.common.compressed as compressed
+import app.common.utils as utils
+from app.common.compressed import (
+    SUFFIXES,
+    codec_of,
+    compress,
+    decompressing_reader,
+    load_json,
+)
+from app.common.fetch import Fetcher
+
+GEOJSON = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 0.0]]],
+            },
+            "properties": {"N03_001": "テスト県", "N03_004": "甲市"},
+        }
+    ],
+}
+
+DATA = json.dumps(GEOJSON, ensure_ascii=False).encode("utf-8")
+
+
+@pytest.fixture(params=["gzip", "zstd"])
+def codec(request):
+    return request.param
+
+
+class TestCompressed:
+    """Test cases for compressed assets"""
+
+    def test_codec_of(self):
+        """拡張子から圧縮形式を判定する"""
+        assert codec_of(".json") is None
+        assert codec_of(".json.gz") == "gzip"
+        assert codec_of("app/assets/build/03.json.zst") == "zstd"
+        assert codec_of(".json.br") == "brotli"
+
+    def test_load_json(self, tmp_path, codec):
+        """圧縮ファイルを展開しながら読み込む"""
+        path = tmp_path / f"test.json{SUFFIXES[codec]}"
+        path.write_bytes(compress(DATA, codec))
+
+        assert load_json(str(path)) == GEOJSON
+
+    def test_load_plain_json(self, tmp_path):
+        """圧縮されていないファイルはそのまま読み込む"""
+        path = tmp_path / "test.json"
+        path.write_bytes(DATA)
+
+        assert load_json(str(path)) == GEOJSON
+
+    def test_reader_streams(self, codec):
+        """少しずつ読んでも元のバイト列になる"""
+        reader = decompressing_reader(io.BytesIO(compress(DATA, codec)), codec)
+
+        chunks = []
+        while chunk := reader.read(7):
+            chunks.append(chunk)
+
+        assert b"".join(chunks) == DATA
+
+    def test_brotli(self, tmp_path):
+        """brotli（パッケージがあるときだけ）"""
+        pytest.importorskip("brotli")
+        path = tmp_path / "test.json.br"
+        path.write_bytes(compress(DATA, "brotli"))
+
+        assert load_json(str(path)) == GEOJSON
+
+    def test_truncated(self, tmp_path, codec):
+        """途中で切れた圧縮ファイルは EOFError"""
+        path = tmp_path / f"region.json{SUFFIXES[codec]}"
+        path.write_bytes(compress(DATA, codec)[:-8])
+
+        with pytest.raises(EOFError):
+            load_json(str(path))
+
+    def test_truncated_brotli(self, monkeypatch):
+        """brotli も終端に届かなければ EOFError（JSON のエラーにしない）"""
+
+        class Decompressor:
+            def process(self, chunk):
+                return chunk
+
+            def is_finished(self):
+                return False
+
+        monkeypatch.setattr(
+            compressed, "_brotli", lambda: SimpleNamespace(Decompressor=Decompressor)
+        )
+
+        with pytest.raises(EOFError):
+            decompressing_reader(io.BytesIO(DATA), "brotli").read()
+
+    def test_unknown_codec(self):
+        """未対応の圧縮形式は ValueError"""
+        with pytest.raises(ValueError):
+            compress(DATA, "lzma")
+
+    def test_load_data(self, tmp_path, monkeypatch, codec):
+        """load_data の extension で圧縮ファイルを選ぶ"""
+        suffix = SUFFIXES[codec]
+        (tmp_path / f"region.json{suffix}").write_bytes(compress(DATA, codec))
+        monkeypatch.setattr(utils, "BUILD_DIR", f"{tmp_path}/")
+
+        assert utils.load_data("region", extension=f".json{suffix}") == GEOJSON
+
+    def test_fetch_data(self, tmp_path, server, monkeypatch, codec):
+        """fetch_data は保存したファイルを展開して読む"""
+        suffix = SUFFIXES[codec]
+        (tmp_path / f"fetch_{codec}.json{suffix}").write_bytes(compress(DATA, codec))
+        (tmp_path / f"fetch_{codec}.json").write_bytes(DATA)
+        monkeypatch.setattr(utils, "BASE_URL", server.url)
+        monkeypatch.setattr(
+            "common.fetch.fetcher", Fetcher(cache_dir=f"{tmp_path}/cache/")
+        )
+
+        assert utils.fetch_data(f"fetch_{codec}", extension=f".json{suffix}") == GEOJSON
+        assert utils.fetch_data(f"fetch_{codec}") == GEOJSON
@@ -1,6 +1,6 @@
 """Unit tests for app/common/const.py"""
 
-from app.common.const import Const
+from app.common.const import Const, env, flag
 
 
 class TestConst:
@@ -9,28 +9,27 @@ class TestConst:
     def test_prefectures_count(self):
         """都道府県データの件数"""
         const = Const()
-        # 47都道府県存在する（重複を除く）
-        unique_prefectures = set([pref[0] for pref in const.prefectures])
+        # 47都道府県が重複なく存在する
+        unique_prefectures = set([pref.name for pref in const.prefectures])
         assert len(unique_prefectures) == 47
+        assert len(const.prefectures) == 47
 
     def test_prefecture_data_format(self):
         """データフォーマットの確認"""
         const = Const()
         # (都道府県名, 市町村名, 緯度, 経度)の形式
         for pref_data in const.prefectures:
-            assert len(pref_data) == 4
-            prefecture, city, lat, lon = pref_data
-            assert isinstance(prefecture, str)
-            assert isinstance(city, str)
-            assert isinstance(lat, (int, float))
-            assert isinstance(lon, (int, float))
+            assert isinstance(pref_data.name, str)
+            assert isinstance(pref_data.capital, str)
+            assert isinstance(pref_data.lat, (int, float))
+            assert isinstance(pref_data.lon, (int, float))
 
     def test_coordinate_range(self):
         """座標の範囲チェック"""
         const = Const()
         # 緯度: 24-46, 経度: 123-154の範囲内
         for pref_data in const.prefectures:
-            _, _, lat, lon = pref_data
+            lat, lon = pref_data.lat, pref_data.lon
             assert 24.0 <= lat <= 46.0, f"Latitude {lat} out of range"
             assert 123.0 <= lon <= 154.0, f"Longitude {lon} out of range"
 
@@ -39,3 +38,35 @@ class TestConst:
         const = Const()
         # デフォルト値が10
         assert const.num_questions == 10
+
+
+class TestEnv:
+    """Test cases for env function"""
+
+    def test_env(self, monkeypatch):
+        """環境変数を型に合わせて読む"""
+        monkeypatch.setenv("PREFECTURE_QUIZ_TEST", " 8 ")
+        assert env("PREFECTURE_QUIZ_TEST", 4, int) == 8
+
+    def test_env_default(self, monkeypatch):
+        """未設定・空なら既定値"""
+        monkeypatch.delenv("PREFECTURE_QUIZ_TEST", raising=False)
+        assert env("PREFECTURE_QUIZ_TEST", 4, int) == 4
+
+        monkeypatch.setenv("PREFECTURE_QUIZ_TEST", "")
+        assert env("PREFECTURE_QUIZ_TEST", 4, int) == 4
+
+    def test_flag(self, monkeypatch):
+        """真偽値は明示した真の値だけを真にする（false・0 などは偽）"""
+        for value in ("1", "true", "Yes", " ON "):
+            monkeypatch.setenv("PREFECTURE_QUIZ_TEST", value)
+            assert env("PREFECTURE_QUIZ_TEST", False, flag) is True
+
+        for value in ("0", "false", "no", "off", "enabled", ""):
+            monkeypatch.setenv("PREFECTURE_QUIZ_TEST", value)
+            assert env("PREFECTURE_QUIZ_TEST", False, flag) is False
+
+    def test_env_invalid(self, monkeypatch):
+        """読めない値は既定値に戻す（import を失敗させない）"""
+        monkeypatch.setenv("PREFECTURE_QUIZ_TEST", "4MB")
+        assert env("PREFECTURE_QUIZ_TEST", 4, int) == 4
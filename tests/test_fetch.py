@@ -0,0 +1,140 @@
+"""Unit tests for app/common/fetch.py"""
+
+import json
+import os
+import threading
+
+import pytest
+import requests
+
+from app.common.fetch import META_SUFFIX, Fetcher
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    return Fetcher(cache_dir=f"{tmp_path}/cache/", retries=2, backoff=0)
+
+
+def _write(path, data: bytes, mtime_ns: int) -> None:
+    path.write_bytes(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestFetcher:
+    """Test cases for Fetcher"""
+
+    def test_download(self, tmp_path, server, fetcher):
+        """受信したファイルとメタデータを保存する"""
+        (tmp_path / "a.json").write_bytes(b'{"a": 1}')
+
+        path = fetcher.fetch(f"{server.url}a.json")
+
+        assert path.endswith("-a.json")
+        with open(path, "rb") as f:
+            assert f.read() == b'{"a": 1}'
+        with open(path + META_SUFFIX, encoding="utf-8") as f:
+            meta = json.load(f)
+        assert meta["etag"] and meta["last_modified"]
+        assert fetcher.stats["downloaded"] == 1
+
+    def test_revalidate(self, tmp_path, server, fetcher):
+        """2 回目は ETag / Last-Modified で再検証し、304 なら再受信しない"""
+        (tmp_path / "a.json").write_bytes(b'{"a": 1}')
+        url = f"{server.url}a.json"
+
+        first = fetcher.fetch(url)
+        second = fetcher.fetch(url)
+
+        assert first == second
+        _path, headers = server.requests[-1]
+        assert "If-None-Match" in headers
+        assert "If-Modified-Since" in headers
+        assert fetcher.stats == {"downloaded": 1, "revalidated": 1}
+
+    def test_modified(self, tmp_path, server, fetcher):
+        """更新されたファイルは受信し直す"""
+        _write(tmp_path / "a.json", b'{"a": 1}', 1_000_000_000_000_000_000)
+        url = f"{server.url}a.json"
+        fetcher.fetch(url)
+
+        _write(tmp_path / "a.json", b'{"a": 22}', 1_100_000_000_000_000_000)
+        path = fetcher.fetch(url)
+
+        with open(path, "rb") as f:
+            assert f.read() == b'{"a": 22}'
+        assert fetcher.stats["downloaded"] == 2
+
+    def test_retry(self, tmp_path, server, fetcher):
+        """503 は再試行する"""
+        (tmp_path / "a.json").write_bytes(b"{}")
+        server.failures = 2
+
+        fetcher.fetch(f"{server.url}a.json")
+
+        assert len(server.requests) == 3
+
+    def test_stale_on_error(self, tmp_path, server, fetcher):
+        """再試行しても失敗したら保存済みのファイルを返す"""
+        (tmp_path / "a.json").write_bytes(b"{}")
+        url = f"{server.url}a.json"
+        path = fetcher.fetch(url)
+        server.failures = 10
+
+        assert fetcher.fetch(url) == path
+        assert fetcher.stats["stale"] == 1
+
+    def test_client_error(self, tmp_path, server, fetcher):
+        """4xx は保存済みのファイルがあっても送出する"""
+        (tmp_path / "a.json").write_bytes(b"{}")
+        url = f"{server.url}a.json"
+        fetcher.fetch(url)
+        (tmp_path / "a.json").unlink()
+
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch(url)
+        assert fetcher.stats["stale"] == 0
+
+    def test_connection_error(self, tmp_path, server, fetcher):
+        """サーバーに接続できなければ保存済みのファイルを返す"""
+        (tmp_path / "a.json").write_bytes(b"{}")
+        url = f"{server.url}a.json"
+        path = fetcher.fetch(url)
+        server.shutdown()
+        server.server_close()
+
+        assert fetcher.fetch(url) == path
+        assert fetcher.stats["stale"] == 1
+
+    def test_error_without_cache(self, server, fetcher):
+        """保存済みのファイルがなければ例外を送出する"""
+        url = f"{server.url}missing.json"
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch(url)
+
+        assert not os.path.exists(fetcher.path(url))
+
+    def test_concurrency(self, tmp_path, server):
+        """同時接続数の上限を超えない"""
+        fetcher = Fetcher(cache_dir=f"{tmp_path}/cache/", concurrency=2)
+        for i in range(8):
+            (tmp_path / f"{i}.json").write_bytes(b"{}")
+        server.delay = 0.05
+
+        threads = [
+            threading.Thread(target=fetcher.fetch, args=(f"{server.url}{i}.json",))
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert server.peak == 2
+        assert fetcher.stats["downloaded"] == 8
+
+    def test_assets(self, asset_server, fetcher):
+        """app/assets を配信するサーバーから取得する"""
+        path = fetcher.fetch(f"{asset_server.url}25.json")
+
+        with open(path, "rb") as f, open("app/assets/25.json", "rb") as g:
+            assert f.read() == g.read()
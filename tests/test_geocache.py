@@ -0,0 +1,96 @@
+"""Unit tests for app/common/geocache.py"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from app.common.geocache import GeometryCache, freeze
+
+
+class TestFreeze:
+    """Test cases for freeze function"""
+
+    def test_equal(self):
+        """通常の dict・list と同じように比較・シリアライズできる"""
+        data = {"features": [{"properties": {"N03_004": "盛岡市"}}]}
+        frozen, size = freeze(data)
+
+        assert frozen == data
+        assert json.dumps(frozen) == json.dumps(data)
+        assert size > 0
+
+    def test_readonly(self):
+        """変更しようとすると TypeError"""
+        frozen, _ = freeze({"features": [[0.0, 1.0]]})
+
+        with pytest.raises(TypeError):
+            frozen["type"] = "FeatureCollection"
+        with pytest.raises(TypeError):
+            frozen["features"].append([2.0, 3.0])
+        with pytest.raises(TypeError):
+            frozen["features"][0][0] = 1.0
+
+
+class TestGeometryCache:
+    """Test cases for GeometryCache class"""
+
+    def test_shared(self):
+        """2 回目以降はコピーせず同じオブジェクトを返す"""
+        cache = GeometryCache()
+        first = cache.get("a", lambda: {"features": []})
+        second = cache.get("a", lambda: {"features": [1]})
+
+        assert first is second
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        """上限を超えたら最も古く使われたものから追い出す"""
+        _, size = freeze({"value": "x" * 100})
+        cache = GeometryCache(max_bytes=size * 2)
+
+        cache.get("a", lambda: {"value": "a" * 100})
+        cache.get("b", lambda: {"value": "b" * 100})
+        cache.get("a", lambda: {"value": "a" * 100})
+        cache.get("c", lambda: {"value": "c" * 100})
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.stats()["evictions"] == 1
+        assert cache.nbytes <= cache.max_bytes
+
+    def test_loader_error(self):
+        """読み込みに失敗した結果はキャッシュしない"""
+        cache = GeometryCache()
+
+        def fail():
+            raise FileNotFoundError
+
+        with pytest.raises(FileNotFoundError):
+            cache.get("a", fail)
+
+        assert "a" not in cache
+        assert cache.get("a", lambda: {"ok": True}) == {"ok": True}
+
+    def test_concurrent_load(self):
+        """同じキーの同時読み込みは 1 回にまとめる"""
+        cache = GeometryCache()
+        calls = []
+
+        def load():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"features": []}
+
+        threads = [
+            threading.Thread(target=cache.get, args=("a", load)) for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
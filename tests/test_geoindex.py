@@ -0,0 +1,62 @@
+"""Unit tests for app/common/geoindex.py"""
+
+import json
+
+import pytest
+
+from app.common.geoindex import (
+    build_entry,
+    get_feature_bbox,
+    get_region_bbox,
+    get_region_center,
+)
+from app.common.utils import get_geojson_bbox, get_geojson_center
+
+SQUARE = {
+    "type": "Polygon",
+    "coordinates": [
+        [[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0], [0.0, 0.0]],
+    ],
+}
+
+
+class TestBuildEntry:
+    """Test cases for build_entry function"""
+
+    def test_build_entry(self):
+        """bbox・中心・フィーチャー単位の bbox"""
+        geojson = {"features": [{"geometry": None}, {"geometry": SQUARE}]}
+        entry = build_entry(geojson)
+
+        assert entry["bbox"] == [0.0, 0.0, 10.0, 10.0]
+        assert entry["center"] == [5.0, 5.0]
+        assert entry["features"] == [None, [0.0, 0.0, 10.0, 10.0]]
+
+    def test_build_entry_empty(self):
+        """空のGeoJSON"""
+        with pytest.raises(ValueError, match="GeoJSON に有効な座標が含まれていません"):
+            build_entry({"features": []})
+
+
+class TestLookup:
+    """Test cases for the committed index"""
+
+    @pytest.mark.parametrize("region", ["prefecture", "13"])
+    def test_index_matches_assets(self, region):
+        """インデックスがアセットと一致する"""
+        with open(f"app/assets/{region}.json", encoding="utf-8") as f:
+            geojson = json.load(f)
+
+        assert get_region_center(region) == get_geojson_center(geojson)
+        assert get_region_bbox(region) == get_geojson_bbox(geojson)
+
+    def test_feature_bbox(self):
+        """フィーチャー単位の bbox"""
+        min_lon, min_lat, max_lon, max_lat = get_feature_bbox("prefecture", 0)  # type: ignore
+        assert min_lon < max_lon
+        assert min_lat < max_lat
+
+    def test_unknown_region(self):
+        """未登録の地域コード"""
+        assert get_region_center("nonexistent") is None
+        assert get_region_bbox("nonexistent") is None
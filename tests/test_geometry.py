@@ -0,0 +1,160 @@
+"""Unit tests for app/common/geometry.py"""
+
+import numpy as np
+import pytest
+
+from app.common.geometry import PackedGeometry, pack
+from app.common.geostore import GeoStore, write_store
+
+GEOJSON = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0], [0.0, 0.0]],
+                    [[2.0, 2.0], [4.0, 2.0], [4.0, 4.0], [2.0, 2.0]],
+                ],
+            },
+            "properties": {"N03_004": "甲市"},
+        },
+        {
+            "type": "Feature",
+            "geometry": None,
+            "properties": {"N03_004": "所属未定地"},
+        },
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "MultiPolygon",
+                "coordinates": [
+                    [[[20.0, 0.0], [30.0, 0.0], [30.0, 10.0], [20.0, 0.0]]],
+                    [[[40.0, 0.0], [50.0, 0.0], [50.0, 10.0], [40.0, 0.0]]],
+                ],
+            },
+            "properties": {"N03_004": "乙町"},
+        },
+    ],
+}
+
+
+class TestPackedGeometry:
+    """Test cases for PackedGeometry class"""
+
+    def test_pack(self):
+        """リングごとのオフセット・フィーチャー番号・外周フラグ"""
+        packed = pack(GEOJSON)
+
+        assert packed.coords.shape == (17, 2)
+        assert packed.ring_offsets.tolist() == [0, 5, 9, 13, 17]
+        assert packed.ring_feature.tolist() == [0, 0, 2, 2]
+        assert packed.ring_exterior.tolist() == [True, False, True, True]
+
+    def test_bbox(self):
+        """外周リング全体の bbox"""
+        assert pack(GEOJSON).bbox() == [0.0, 0.0, 50.0, 10.0]
+
+    def test_feature_bboxes(self):
+        """geometry が無いフィーチャーは NaN"""
+        bboxes = pack(GEOJSON).feature_bboxes()
+
+        assert bboxes[0].tolist() == [0.0, 0.0, 10.0, 10.0]
+        assert np.isnan(bboxes[1]).all()
+        assert bboxes[2].tolist() == [20.0, 0.0, 50.0, 10.0]
+
+    def test_areas(self):
+        """穴の面積は差し引かれる"""
+        np.testing.assert_allclose(pack(GEOJSON).areas(), [98.0, 0.0, 100.0])
+
+    def test_centroids(self):
+        """面積重み付きの重心（面積 0 のフィーチャーは NaN のまま）"""
+        centroids = pack(GEOJSON).centroids()
+
+        np.testing.assert_allclose(
+            centroids[0], [(500 - 20 / 3) / 98, (500 - 16 / 3) / 98]
+        )
+        assert np.isnan(centroids[1]).all()
+        np.testing.assert_allclose(centroids[2], [110 / 3, 10 / 3])
+
+    def test_ring_orientation(self):
+        """リングの向きが逆でも面積は正になる"""
+        reversed_geojson = {
+            "features": [
+                {
+                    "geometry": {
+                        "type": "Polygon",
+                        "coordinates": [
+                            [[0.0, 0.0], [0.0, 2.0], [2.0, 2.0], [2.0, 0.0], [0.0, 0.0]]
+                        ],
+                    }
+                }
+            ]
+        }
+        packed = pack(reversed_geojson)
+
+        assert packed.areas().tolist() == [4.0]
+        assert packed.centroid() == (1.0, 1.0)
+
+    def test_three_dimensional_coordinates(self):
+        """3 次元目の値は無視する"""
+        geojson = {
+            "features": [
+                {
+                    "geometry": {
+                        "type": "Polygon",
+                        "coordinates": [[[0, 0, 5], [1, 0, 5], [1, 1, 5], [0, 0, 5]]],
+                    }
+                }
+            ]
+        }
+
+        assert pack(geojson).bbox() == [0.0, 0.0, 1.0, 1.0]
+
+    def test_from_store(self, tmp_path):
+        """バイナリストアからも同じ配列になる"""
+        path = str(tmp_path / "test.geo")
+        write_store(GEOJSON, path)
+        store = GeoStore(path)
+
+        from_json = pack(GEOJSON)
+        for packed in (pack(store), pack(store.view())):
+            assert packed.coords.tolist() == from_json.coords.tolist()
+            assert packed.ring_offsets.tolist() == from_json.ring_offsets.tolist()
+            assert packed.ring_feature.tolist() == from_json.ring_feature.tolist()
+            assert packed.ring_exterior.tolist() == from_json.ring_exterior.tolist()
+
+    def test_from_features(self):
+        """フィーチャーのイテレーターからも同じ配列になる"""
+        from_json = pack(GEOJSON)
+        packed = pack(iter(GEOJSON["features"]))
+
+        assert packed.n_features == 3
+        assert packed.coords.tolist() == from_json.coords.tolist()
+        assert packed.ring_offsets.tolist() == from_json.ring_offsets.tolist()
+        assert packed.ring_feature.tolist() == from_json.ring_feature.tolist()
+        assert packed.ring_exterior.tolist() == from_json.ring_exterior.tolist()
+
+    def test_from_no_features(self):
+        """フィーチャーが無ければ空の配列"""
+        packed = PackedGeometry.from_features([])
+
+        assert packed.coords.shape == (0, 2)
+        assert packed.n_rings == 0
+        assert packed.n_features == 0
+
+    def test_pack_packed(self):
+        """詰めた配列はそのまま返す"""
+        packed = pack(GEOJSON)
+        assert pack(packed) is packed
+        assert isinstance(packed, PackedGeometry)
+
+    def test_empty(self):
+        """有効な座標が無ければ ValueError"""
+        packed = pack({"features": [{"geometry": None}]})
+
+        with pytest.raises(ValueError):
+            packed.bbox()
+        with pytest.raises(ValueError):
+            packed.centroid()
@@ -0,0 +1,85 @@
+"""Unit tests for app/common/geostore.py"""
+
+import numpy as np
+import pytest
+
+from app.common.geostore import GeoStore, write_store
+
+GEOJSON = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0], [0.0, 0.0]],
+                    [[2.0, 2.0], [4.0, 2.0], [4.0, 4.0], [2.0, 2.0]],
+                ],
+            },
+            "properties": {"N03_001": "テスト県", "N03_004": "甲市"},
+        },
+        {
+            "type": "Feature",
+            "geometry": None,
+            "properties": {"N03_001": "テスト県", "N03_004": "所属未定地"},
+        },
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "MultiPolygon",
+                "coordinates": [
+                    [[[20.0, 0.0], [30.0, 0.0], [30.0, 10.0], [20.0, 0.0]]],
+                    [[[40.0, 0.0], [50.0, 0.0], [50.0, 10.0], [40.0, 0.0]]],
+                ],
+            },
+            "properties": {"N03_001": "テスト県", "N03_004": "乙町"},
+        },
+    ],
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = str(tmp_path / "test.geo")
+    write_store(GEOJSON, path)
+    return GeoStore(path)
+
+
+class TestGeoStore:
+    """Test cases for GeoStore class"""
+
+    def test_round_trip(self, store):
+        """GeoJSON への展開で元データと一致する"""
+        assert store.to_geojson() == GEOJSON
+
+    def test_arrays(self, store):
+        """座標・オフセット配列"""
+        assert store.coords.shape == (17, 2)
+        assert store.coords.dtype == np.float64
+        assert list(store.feature_offsets) == [0, 1, 1, 3]
+        assert not store.coords.flags.writeable
+
+    def test_float32(self, tmp_path):
+        """float32 で保存する"""
+        path = str(tmp_path / "test32.geo")
+        write_store(GEOJSON, path, dtype="<f4")
+        assert GeoStore(path).coords.dtype == np.float32
+
+    def test_view(self, store):
+        """遅延ビューからの参照"""
+        view = store.view()
+        features = view["features"]
+
+        assert view["type"] == "FeatureCollection"
+        assert len(features) == 3
+        assert features[-1]["properties"]["N03_004"] == "乙町"
+        assert features[1]["geometry"] is None
+        assert dict(features[0]) == GEOJSON["features"][0]
+
+    def test_invalid_file(self, tmp_path):
+        """バイナリストア以外のファイル"""
+        path = tmp_path / "invalid.geo"
+        path.write_bytes(b"{}" * 16)
+        with pytest.raises(ValueError, match="バイナリストアではありません"):
+            GeoStore(str(path))
@@ -0,0 +1,112 @@
+"""Unit tests for app/common/geostream.py"""
+
+import io
+import json
+
+import pytest
+
+from app.common.compressed import compress
+from app.common.geometry import PackedGeometry
+from app.common.geostream import collect, iter_features, stream_features
+from app.common.utils import load_data
+
+GEOJSON = {
+    "type": "FeatureCollection",
+    "name": "テスト",
+    "features": [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 0.0]]],
+            },
+            "properties": {"N03_004": "甲市"},
+        },
+        {"type": "Feature", "geometry": None, "properties": {"N03_004": "乙町"}},
+    ],
+    "bbox": [0.0, 0.0, 1.0, 1.0],
+}
+
+
+def _stream(data: dict, chunk_size: int = 1 << 16, indent=None):
+    text = json.dumps(data, ensure_ascii=False, indent=indent)
+    return iter_features(io.BytesIO(text.encode("utf-8")), chunk_size)
+
+
+class TestIterFeatures:
+    """Test cases for iter_features function"""
+
+    def test_features(self):
+        """フィーチャーを順に返し、ほかのメンバーは読み飛ばす"""
+        assert list(_stream(GEOJSON)) == GEOJSON["features"]
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+    def test_small_chunks(self, chunk_size):
+        """値の途中で区切れても同じフィーチャーになる"""
+        features = list(_stream(GEOJSON, chunk_size, indent=2))
+
+        assert features == GEOJSON["features"]
+
+    def test_number_at_chunk_boundary(self):
+        """区切りで終わった数値は続きを読んでから解析する"""
+        data = {"count": 12345, "features": [{"id": 67890}]}
+
+        assert list(_stream(data, chunk_size=12)) == [{"id": 67890}]
+
+    def test_empty(self):
+        """features が空・無いときは何も返さない"""
+        assert list(_stream({"type": "FeatureCollection", "features": []})) == []
+        assert list(_stream({"type": "FeatureCollection"})) == []
+
+    def test_lazy(self):
+        """読み終える前からフィーチャーを返す"""
+        features = _stream(GEOJSON, chunk_size=8)
+
+        assert next(features) == GEOJSON["features"][0]
+
+    def test_truncated(self):
+        """途中で切れた JSON は ValueError"""
+        text = json.dumps(GEOJSON).encode("utf-8")
+
+        with pytest.raises(ValueError):
+            list(iter_features(io.BytesIO(text[: len(text) // 2]), chunk_size=16))
+
+    def test_not_object(self):
+        """FeatureCollection でなければ ValueError"""
+        with pytest.raises(ValueError):
+            list(iter_features(io.BytesIO(b"[1, 2]")))
+
+
+class TestStreamFeatures:
+    """Test cases for stream_features function"""
+
+    def test_asset(self):
+        """アセットを json.load と同じフィーチャーに読む"""
+        assert (
+            list(stream_features("app/assets/25.json")) == load_data("25")["features"]
+        )
+
+    def test_compressed(self, tmp_path):
+        """圧縮ファイルは展開しながら読む"""
+        path = tmp_path / "test.json.gz"
+        path.write_bytes(compress(json.dumps(GEOJSON).encode("utf-8"), "gzip"))
+
+        assert list(stream_features(str(path), chunk_size=16)) == GEOJSON["features"]
+
+    def test_collect(self):
+        """FeatureCollection にまとめ直す"""
+        collection = collect(stream_features("app/assets/25.json"))
+
+        assert collection["type"] == "FeatureCollection"
+        assert collection["features"] == load_data("25")["features"]
+
+    def test_packed(self):
+        """逐次読み込みから詰めた配列は json.load からのものと同じ"""
+        expected = PackedGeometry.from_geojson(load_data("03"))
+        packed = PackedGeometry.from_features(stream_features("app/assets/03.json"))
+
+        assert packed.n_features == expected.n_features
+        assert packed.coords.tolist() == expected.coords.tolist()
+        assert packed.ring_offsets.tolist() == expected.ring_offsets.tolist()
+        assert packed.ring_feature.tolist() == expected.ring_feature.tolist()
+        assert packed.ring_exterior.tolist() == expected.ring_exterior.tolist()
@@ -0,0 +1,80 @@
+"""Unit tests for app/common/prefectures.py"""
+
+import dataclasses
+
+import numpy as np
+import pytest
+
+from app.common.const import Const
+from app.common.prefectures import Prefecture, PrefectureTable
+
+ROWS = [
+    ("北海道", "札幌市", 43.06417, 141.34694),
+    ("青森県", "青森市", 40.82444, 140.74),
+    ("岩手県", "盛岡市", 39.70361, 141.1525),
+]
+
+
+class TestPrefectureTable:
+    """Test cases for PrefectureTable class"""
+
+    def test_records(self):
+        """行番号と都道府県コードを振ったレコードになる"""
+        table = PrefectureTable(ROWS)
+
+        assert len(table) == 3
+        assert table[2] == Prefecture(2, "03", "岩手県", "盛岡市", 39.70361, 141.1525)
+        assert [p.name for p in table] == ["北海道", "青森県", "岩手県"]
+        assert table.capitals == ("札幌市", "青森市", "盛岡市")
+
+    def test_lookup(self):
+        """都道府県名・県庁所在地・コードで引ける"""
+        table = PrefectureTable(ROWS)
+
+        assert table.by_name("青森県") is table[1]
+        assert table.by_capital("盛岡市") is table[2]
+        assert table.by_code("01") is table[0]
+        assert table.by_code("03201") is table[2]
+        assert table.by_name("東京都") is None
+        assert table.name_index["岩手県"] == 2
+
+    def test_coordinate_arrays(self):
+        """緯度・経度は行番号をそろえた配列"""
+        table = PrefectureTable(ROWS)
+        lat = np.frombuffer(table.lat)
+
+        assert lat.tolist() == [43.06417, 40.82444, 39.70361]
+        assert table.lon[1] == 140.74
+
+    def test_immutable(self):
+        """レコード・配列・索引は変更できない"""
+        table = PrefectureTable(ROWS)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            table[0].name = "東京都"  # type: ignore[misc]
+        with pytest.raises(TypeError):
+            table.lat[0] = 0.0
+        with pytest.raises(TypeError):
+            table.name_index["東京都"] = 0  # type: ignore[index]
+        assert not hasattr(table[0], "__dict__")
+
+    @pytest.mark.parametrize(
+        "row",
+        [
+            ("北海道", "函館市", 41.77, 140.73),
+            ("道南県", "札幌市", 41.77, 140.73),
+        ],
+    )
+    def test_duplicates(self, row):
+        """都道府県名・県庁所在地が重複していれば ValueError"""
+        with pytest.raises(ValueError):
+            PrefectureTable([*ROWS, row])
+
+    def test_const(self):
+        """Const の表は 47 都道府県をコード順に持つ"""
+        table = Const().prefectures
+
+        assert len(table) == 47
+        assert table.by_code("16").name == "富山県"
+        assert table.by_code("25").name == "滋賀県"
+        assert table.by_code("47").capital == "那覇市"
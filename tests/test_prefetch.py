@@ -0,0 +1,127 @@
+"""Unit tests for app/common/prefetch.py"""
+
+import threading
+
+import app.common.prefetch as prefetch_module
+from app.common.prefetch import Prefetcher, neighbour_graph, prefetch_around
+from app.common.utils import load_data
+
+
+def _square(code, x, y):
+    return {
+        "type": "Feature",
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [[[x, y], [x + 1, y], [x + 1, y + 1], [x, y + 1], [x, y]]],
+        },
+        "properties": {"N03_007": f"{code}000"},
+    }
+
+
+class TestNeighbourGraph:
+    """Test cases for neighbour_graph function"""
+
+    def test_shared_edge(self):
+        """境界を共有する地域どうしが隣接する"""
+        geojson = {
+            "type": "FeatureCollection",
+            "features": [_square("01", 0, 0), _square("02", 1, 0), _square("03", 5, 5)],
+        }
+
+        assert neighbour_graph(geojson) == {"01": ["02"], "02": ["01"], "03": []}
+
+    def test_prefectures(self):
+        """都道府県レイヤーから隣接県を求める"""
+        graph = neighbour_graph(load_data("prefecture"))
+
+        assert len(graph) == 47
+        assert graph["03"] == ["02", "04", "05"]
+        assert graph["13"] == ["11", "12", "14", "19"]
+        assert graph["01"] == []
+        assert graph["47"] == []
+        assert all(code in graph[n] for code, ns in graph.items() for n in ns)
+
+
+class TestPrefetcher:
+    """Test cases for Prefetcher class"""
+
+    def test_prefetch(self, monkeypatch):
+        """地域のジオメトリと属性テーブルを読み込む"""
+        loaded = []
+        monkeypatch.setattr(prefetch_module, "load_region", loaded.append)
+        monkeypatch.setattr(prefetch_module, "load_attributes", loaded.append)
+
+        prefetcher = Prefetcher(workers=2)
+        prefetcher.prefetch(["03", "02"])
+
+        assert prefetcher.wait(timeout=5)
+        assert sorted(loaded) == ["02", "02", "03", "03"]
+
+    def test_pending(self, monkeypatch):
+        """読み込み中の地域は重ねて投入しない"""
+        release = threading.Event()
+        loaded = []
+
+        def load(region):
+            release.wait(5)
+            loaded.append(region)
+
+        monkeypatch.setattr(prefetch_module, "load_region", load)
+        monkeypatch.setattr(prefetch_module, "load_attributes", lambda _region: None)
+
+        prefetcher = Prefetcher(workers=1)
+        first = prefetcher.prefetch(["03"])
+        second = prefetcher.prefetch(["03"])
+        release.set()
+
+        assert first == second
+        assert prefetcher.wait(timeout=5)
+        assert loaded == ["03"]
+
+    def test_errors(self, monkeypatch):
+        """読み込みに失敗しても例外を投げない"""
+
+        def load(region):
+            raise FileNotFoundError(region)
+
+        monkeypatch.setattr(prefetch_module, "load_region", load)
+
+        prefetcher = Prefetcher(workers=1)
+        (future,) = prefetcher.prefetch(["99"])
+
+        assert prefetcher.wait(timeout=5)
+        assert future.exception() is None
+
+    def test_unexpected_error(self, monkeypatch, caplog):
+        """想定外の例外はトレースバックつきで記録する"""
+
+        def load(region):
+            raise RuntimeError(region)
+
+        monkeypatch.setattr(prefetch_module, "load_region", load)
+
+        prefetcher = Prefetcher(workers=1)
+        (future,) = prefetcher.prefetch(["99"])
+
+        assert prefetcher.wait(timeout=5)
+        assert isinstance(future.exception(), RuntimeError)
+        assert any(record.exc_info for record in caplog.records)
+
+
+class TestPrefetchAround:
+    """Test cases for prefetch_around function"""
+
+    def test_neighbours(self, monkeypatch):
+        """選んだ都道府県、隣接県の順に先読みする"""
+        requested = []
+        monkeypatch.setattr(
+            prefetch_module,
+            "load_prefetcher",
+            lambda: type("Recorder", (), {"prefetch": staticmethod(requested.extend)}),
+        )
+        monkeypatch.setattr(prefetch_module, "load_neighbours", lambda: {"03": ["02"]})
+
+        prefetch_around("03")
+        prefetch_around("01")
+
+        assert requested == ["03", "02", "01", "01_subprefecture"]
@@ -0,0 +1,280 @@
+"""Unit tests for app/common/pydeck.py"""
+
+import json
+import pickle
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from streamlit.dataframe_util import is_pandas_version_less_than
+from streamlit.elements.deck_gl_json_chart import _prepare_pydeck_for_json
+from streamlit.testing.v1 import AppTest
+
+from app.common.deckspec import DeckSpec
+from app.common.pydeck import (
+    Selection,
+    as_geojson,
+    feature_index,
+    flat_polygons,
+    layer_json,
+    make_deck,
+    make_deck_spec,
+    select_feature,
+    selected_in,
+    selected_properties,
+)
+
+FEATURES = [
+    {
+        "type": "Feature",
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 0.0]]],
+        },
+        "properties": {
+            "N03_001": "北海道",
+            "N03_002": "石狩振興局",
+            "N03_003": None,
+            "N03_004": "札幌市",
+            "N03_007": "01100",
+        },
+    },
+    {
+        "type": "Feature",
+        "geometry": None,
+        "properties": None,
+    },
+]
+
+
+class TestSelection:
+    """Test cases for slim selection events"""
+
+    def test_select_feature(self):
+        """番号と必要な属性だけを残す"""
+        selection = select_feature(FEATURES, 0)
+
+        assert selection.index == 0
+        assert selection.properties == {
+            "N03_001": "北海道",
+            "N03_002": "石狩振興局",
+            "N03_004": "札幌市",
+            "N03_007": "01100",
+        }
+
+    def test_select_feature_without_properties(self):
+        """属性が無いフィーチャー"""
+        assert select_feature(FEATURES, 1).properties["N03_001"] is None
+
+    def test_selection_is_small(self):
+        """ジオメトリを含まないのでセッションに小さく保存できる"""
+        selection = select_feature(FEATURES, 0)
+
+        assert "coordinates" not in repr(selection)
+        assert pickle.loads(pickle.dumps(selection)) == selection
+
+    def test_selected_properties(self):
+        """Selection と pydeck の選択オブジェクトのどちらからも属性を引ける"""
+        event = SimpleNamespace(geojson=[FEATURES[0]])
+
+        assert selected_properties(None) is None
+        assert selected_properties(event)["N03_004"] == "札幌市"
+        assert selected_properties(Selection(0, {"N03_004": "札幌市"})) == {
+            "N03_004": "札幌市"
+        }
+
+    def test_selected_in(self):
+        """選んだ地図と同じ地域の選択だけを使う"""
+        selection = select_feature(FEATURES, 0, region="01")
+
+        assert selection.region == "01"
+        assert selected_in(selection, "01") is selection
+        assert selected_in(None, "01") is None
+
+    def test_stale_selection(self):
+        """別の地図で選んだ番号は今の地図に当てはめない"""
+        # 北海道の市町村（150 番）を選んでから振興局（14 件）に切り替えた
+        municipality = Selection(150, {"N03_004": "稚内市"}, "01")
+        # 都道府県（30 番）を選んだまま鳥取県（19 件）の市町村へ進んだ
+        prefecture = Selection(30, {"N03_001": "鳥取県"}, "prefecture")
+
+        assert selected_in(municipality, "01_subprefecture") is None
+        assert selected_in(prefecture, "31") is None
+        assert selected_in(SimpleNamespace(geojson=[FEATURES[0]]), "01") is None
+
+
+class TestAsGeojson:
+    """Test cases for as_geojson and make_deck with streamed features"""
+
+    def test_as_geojson(self):
+        """フィーチャーの列は FeatureCollection にまとめ、GeoJSON はそのまま返す"""
+        geojson = {"type": "FeatureCollection", "features": FEATURES}
+
+        assert as_geojson(iter(FEATURES)) == geojson
+        assert as_geojson(geojson) is geojson
+
+    def test_make_deck_stream(self):
+        """逐次読み込みのフィーチャーの列から地図を組み立てる"""
+        deck = make_deck(iter(FEATURES[:1]))
+
+        assert deck.initial_view_state.latitude == 0.5
+        assert deck.layers[0].data["features"] == FEATURES[:1]
+
+
+class TestDeckSpec:
+    """Test cases for DeckSpec and make_deck_spec"""
+
+    GEOJSON = {"type": "FeatureCollection", "features": FEATURES[:1]}
+
+    def setup_method(self):
+        layer_json.clear()
+
+    def test_same_as_deck(self):
+        """make_deck と同じ地図の JSON になる"""
+        kwargs = {"has_tip": True, "area_code": 4, "map_provider": "carto"}
+        deck = make_deck(self.GEOJSON, region="99", lat=0.5, lon=0.5, **kwargs)
+        spec = make_deck_spec(self.GEOJSON, "99", lat=0.5, lon=0.5, **kwargs)
+
+        assert json.loads(spec.to_json()) == json.loads(deck.to_json())
+        assert spec._tooltip == deck._tooltip
+
+    def test_default_provider(self):
+        """地図の提供元の既定は pdk.Deck と同じ"""
+        import pydeck as pdk
+
+        view_state = pdk.ViewState(latitude=0.5, longitude=0.5, zoom=4)
+        spec = json.loads(DeckSpec("[]", view_state).to_json())
+        deck = json.loads(
+            pdk.Deck(
+                map_style="dark_no_labels", initial_view_state=view_state
+            ).to_json()
+        )
+
+        for key in ("mapStyle", "mapProvider", "initialViewState"):
+            assert spec[key] == deck[key]
+
+    @pytest.mark.skipif(
+        is_pandas_version_less_than("3.0.0"), reason="pandas 3 の回避策の経路"
+    )
+    def test_pydeck_chart(self):
+        """st.pydeck_chart に渡すと to_json() の JSON をそのまま送り、レイヤーを走査しない"""
+        spec = make_deck_spec(self.GEOJSON, "99", lat=0.5, lon=0.5)
+        assert not hasattr(spec, "layers")
+
+        def script():
+            import streamlit as st
+
+            st.pydeck_chart(st.session_state.spec)
+
+        app = AppTest.from_function(script)
+        app.session_state.spec = spec
+        with patch(
+            "streamlit.elements.deck_gl_json_chart._prepare_pydeck_for_json",
+            wraps=_prepare_pydeck_for_json,
+        ) as prepare:
+            app.run()
+
+        assert not app.exception
+        prepare.assert_called_once_with(spec)
+        assert app.get("deck_gl_json_chart")[0].proto.json == spec.to_json()
+
+    def test_reuse_layers(self):
+        """レイヤーの JSON は 1 度だけ作り、ビューとツールチップだけを変える"""
+        spec = make_deck_spec(self.GEOJSON, "99", lat=0.5, lon=0.5)
+        moved = make_deck_spec(self.GEOJSON, "99", has_tip=True, lat=1.0, lon=2.0)
+
+        assert moved.layers_json is spec.layers_json
+        assert moved.view_state["latitude"] == 1.0
+        assert moved._tooltip != spec._tooltip
+
+    def test_layer_key(self):
+        """地域・ティア・線の太さが違えば別のレイヤー"""
+        spec = make_deck_spec(self.GEOJSON, "99", lat=0.5, lon=0.5)
+
+        assert (
+            make_deck_spec(
+                self.GEOJSON, "99", lat=0.5, lon=0.5, get_line_width=1000
+            ).layers_json
+            != spec.layers_json
+        )
+        assert (
+            make_deck_spec(
+                self.GEOJSON, "99", zoom=10, max_zoom=10, lat=0.5, lon=0.5
+            ).layers_json
+            is not spec.layers_json
+        )
+
+
+class TestFlatPolygons:
+    """Test cases for the flat layer format"""
+
+    SQUARE = [[0.0, 0.0], [4.0, 0.0], [4.0, 4.0], [0.0, 4.0], [0.0, 0.0]]
+    HOLE = [[1.0, 1.0], [2.0, 1.0], [2.0, 2.0], [1.0, 1.0]]
+    GEOJSON = {
+        "type": "FeatureCollection",
+        "features": [
+            FEATURES[1],
+            {
+                "type": "Feature",
+                "geometry": {
+                    "type": "MultiPolygon",
+                    "coordinates": [
+                        [SQUARE, HOLE],
+                        [[[5.0, 5.0], [6.0, 5.0], [6.0, 6.0]]],
+                    ],
+                },
+                "properties": FEATURES[0]["properties"],
+            },
+        ],
+    }
+
+    def setup_method(self):
+        layer_json.clear()
+
+    def test_flat_polygons(self):
+        """ポリゴンごとに平らな座標配列と穴の位置を持ち、閉じる点は省く"""
+        records = flat_polygons(self.GEOJSON)
+
+        assert [r["feature"] for r in records] == [1, 1]
+        assert records[0]["polygon"] == {
+            "positions": [0.0, 0.0, 4.0, 0.0, 4.0, 4.0, 0.0, 4.0]
+            + [1.0, 1.0, 2.0, 1.0, 2.0, 2.0],
+            "holeIndices": [8],
+        }
+        # 穴がなく閉じていないリングはそのまま
+        assert records[1]["polygon"] == [5.0, 5.0, 6.0, 5.0, 6.0, 6.0]
+        # 属性はツールチップと選択に使うものだけ
+        assert records[0]["properties"] == {
+            "N03_001": "北海道",
+            "N03_002": "石狩振興局",
+            "N03_004": "札幌市",
+            "N03_007": "01100",
+        }
+
+    def test_flat_layer(self):
+        """ "flat" では同じ id の PolygonLayer になり、GeoJSON より小さい"""
+        kwargs = {"lat": 0.5, "lon": 0.5}
+        flat = make_deck_spec(self.GEOJSON, "99", layer_format="flat", **kwargs)
+
+        layer = json.loads(flat.layers_json)[0]
+        assert layer["@@type"] == "PolygonLayer"
+        assert layer["id"] == "geojson"
+        assert layer["positionFormat"] == "XY"
+        assert (
+            flat.layers_json != make_deck_spec(self.GEOJSON, "99", **kwargs).layers_json
+        )
+
+        deck = make_deck(self.GEOJSON, layer_format="flat", **kwargs)
+        assert json.loads(deck.to_json())["layers"] == json.loads(flat.layers_json)
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            make_deck(self.GEOJSON, layer_format="arrow", lat=0.5, lon=0.5)
+
+    def test_feature_index(self):
+        """ "flat" の行の番号はフィーチャーの番号に読み替える"""
+        record = flat_polygons(self.GEOJSON)[1]
+
+        assert feature_index(1, record) == 1
+        assert feature_index(3, {"properties": {}}) == 3
+        assert select_feature(self.GEOJSON["features"], feature_index(1, record))
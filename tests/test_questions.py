@@ -0,0 +1,106 @@
+"""Unit tests for app/common/questions.py"""
+
+import numpy as np
+import pytest
+
+from app.common.questions import (
+    NEAREST_CANDIDATES,
+    PREFECTURES,
+    distance_matrix,
+    district_ids,
+    draw_options,
+    generate,
+    priority_matrix,
+)
+
+TOKYO = PREFECTURES.name_index["東京都"]
+OSAKA = PREFECTURES.name_index["大阪府"]
+HOKKAIDO = PREFECTURES.name_index["北海道"]
+
+
+class TestDistanceMatrix:
+    """Test cases for distance_matrix function"""
+
+    def test_distance(self):
+        """県庁所在地どうしの距離（km）で対称"""
+        distance = distance_matrix()
+
+        assert distance.shape == (47, 47)
+        assert np.allclose(distance, distance.T)
+        assert np.all(np.diag(distance) == 0)
+        assert 390 < distance[TOKYO, OSAKA] < 410
+
+    def test_districts(self):
+        """地方区分は全ての県に振られる"""
+        ids = district_ids()
+
+        assert np.all(ids >= 0)
+        assert ids[TOKYO] == ids[PREFECTURES.name_index["神奈川県"]]
+        assert ids[TOKYO] != ids[OSAKA]
+
+
+class TestGenerate:
+    """Test cases for generate function"""
+
+    @pytest.mark.parametrize("strategy", ["random", "nearest", "same_region"])
+    def test_shape(self, strategy):
+        """回ごとに正解は重複せず、選択肢は正解を 1 つ含む 4 択"""
+        questions = generate(200, 10, strategy=strategy, seed=0)
+
+        assert questions.answers.shape == (200, 10)
+        assert questions.options.shape == (200, 10, 4)
+        assert all(len(set(row)) == 10 for row in questions.answers.tolist())
+
+        options = questions.options.reshape(-1, 4)
+        answers = questions.answers.reshape(-1)
+        assert np.all((options == answers[:, None]).sum(axis=1) == 1)
+        assert all(len(set(row)) == 4 for row in options.tolist())
+
+    def test_seed(self):
+        """seed が同じなら同じ出題セット"""
+        first = generate(5, seed=42)
+        second = generate(5, seed=42)
+
+        assert np.array_equal(first.answers, second.answers)
+        assert np.array_equal(first.options, second.options)
+        assert not np.array_equal(first.answers, generate(5, seed=43).answers)
+
+    def test_answer_position(self):
+        """正解の位置は偏らない"""
+        questions = generate(2000, seed=0)
+        position = np.argmax(questions.options == questions.answers[..., None], axis=-1)
+
+        counts = np.bincount(position.reshape(-1), minlength=4)
+        assert counts.min() > 0.2 * counts.sum()
+
+    def test_nearest(self):
+        """nearest は近い県から誤答を選ぶ"""
+        options = draw_options(
+            [TOKYO] * 100, strategy="nearest", rng=np.random.default_rng(0)
+        )
+        nearest = np.argsort(distance_matrix()[TOKYO])[: NEAREST_CANDIDATES + 1]
+
+        assert set(options.reshape(-1).tolist()) <= set(nearest.tolist())
+
+    def test_same_region(self):
+        """same_region は同じ地方から、足りなければ近い県で補う"""
+        ids = district_ids()
+        rng = np.random.default_rng(0)
+
+        options = draw_options([TOKYO] * 100, strategy="same_region", rng=rng)
+        assert np.all(ids[options] == ids[TOKYO])
+
+        # 北海道は同じ地方に他の県が無いので最も近い 3 県になる
+        options = draw_options([HOKKAIDO], strategy="same_region", rng=rng)
+        nearest = np.argsort(distance_matrix()[HOKKAIDO])[:4]
+        assert set(options[0].tolist()) == set(nearest.tolist())
+
+    def test_unknown_strategy(self):
+        """未対応の選び方は ValueError"""
+        with pytest.raises(ValueError):
+            generate(strategy="farthest")
+
+    def test_priority_readonly(self):
+        """共有する優先度行列は変更できない"""
+        with pytest.raises(ValueError):
+            priority_matrix("random")[0, 1] = 1.0
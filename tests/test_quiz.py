@@ -1,35 +1,110 @@
 """Unit tests for app/pages/quiz.py"""
 
-from app.pages.quiz import normalize_name
-
-
-class TestNormalizeName:
-    """Test cases for normalize_name function"""
-
-    def test_normalize_name_with_suffix(self):
-        """都道府県名の正規化（接尾辞あり）"""
-        assert normalize_name("大阪府") == "大阪"
-        assert normalize_name("東京都") == "東京"
-        assert normalize_name("京都府") == "京都"
-        assert normalize_name("北海道") == "北海"
-        assert normalize_name("千葉県") == "千葉"
-
-    def test_normalize_name_without_suffix(self):
-        """都道府県名の正規化（接尾辞なし）"""
-        assert normalize_name("東京") == "東京"
-        assert normalize_name("大阪") == "大阪"
-
-    def test_normalize_name_with_spaces(self):
-        """空白を含む文字列の正規化"""
-        assert normalize_name("千葉　県") == "千葉"
-        assert normalize_name("千葉 県") == "千葉"
-        assert normalize_name("  千葉県  ") == "千葉"
-
-    def test_normalize_name_none(self):
-        """None値の処理"""
-        assert normalize_name(None) == ""  # pyright: ignore[reportArgumentType]
-
-    def test_normalize_name_empty(self):
-        """空文字列の処理"""
-        assert normalize_name("") == ""
-        assert normalize_name("   ") == ""
+import json
+import os
+
+import pydeck as pdk
+
+from app.common.const import Const
+from app.pages.quiz import capital_deck
+from streamlit.testing.v1 import AppTest
+
+QUIZ_PAGE = os.path.abspath("app/pages/quiz.py")
+
+
+def _start(daily: bool = False) -> AppTest:
+    app = AppTest.from_file(QUIZ_PAGE, default_timeout=60)
+    app.run()
+    if daily:
+        app.toggle(key="daily").set_value(True)
+    app.button[0].click().run()
+    return app
+
+
+def _answer(app: AppTest, value: str) -> None:
+    app.radio(key="mc_choice").set_value(value)
+    next(b for b in app.button if b.label == "回答する").click().run()
+    next(b for b in app.button if b.label == "次へ").click().run()
+
+
+class TestQuizApp:
+    """Test cases for QuizApp page"""
+
+    def test_start(self):
+        """ゲームスタートで回の ID だけを持つ状態を作る"""
+        app = _start()
+        state = app.session_state["quiz_state"]
+
+        assert state.round_id.startswith("pool:")
+        assert state.index == 0
+        assert app.radio(key="mc_choice").options == state.options(0)
+        assert "quiz" not in app.session_state
+        assert "answered" not in app.session_state
+
+    def test_daily(self):
+        """今日の問題は日替わりの回"""
+        app = _start(daily=True)
+
+        assert app.session_state["quiz_state"].round_id.startswith("daily:")
+
+    def test_round(self):
+        """10 問答えると結果を表示し、ウィジェットのキーは増えない"""
+        app = _start()
+        state = app.session_state["quiz_state"]
+
+        for i in range(10):
+            correct = state.correct_answer(i)
+            if i % 2:
+                correct = next(o for o in state.options(i) if o != correct)
+            _answer(app, correct)
+
+        state = app.session_state["quiz_state"]
+        assert state.finished
+        assert state.score == 5
+        assert "正解は、5 問" in app.subheader[0].value
+        assert not [k for k in app.session_state if k.startswith("mc_choice_")]
+
+    def test_reset(self):
+        """スタート画面に戻ると状態を消す"""
+        app = _start()
+        next(b for b in app.button if b.label == "リセットして最初から").click().run()
+
+        assert "quiz_state" not in app.session_state
+
+
+class TestCapitalDeck:
+    """Test cases for capital_deck function"""
+
+    def test_capital_deck(self):
+        """県庁所在地の 1 点の地図を都道府県ごとに 1 度だけ作る"""
+        p = Const().prefectures[12]
+        deck = capital_deck(12)
+        spec = json.loads(deck.to_json())
+
+        assert capital_deck(12) is deck
+        assert spec["layers"][0]["data"] == [
+            {"lat": p.lat, "lon": p.lon, "name": p.capital}
+        ]
+        assert spec["initialViewState"]["latitude"] == p.lat
+
+    def test_same_map_as_deck(self):
+        """地図のスタイル・提供元・ビューは pdk.Deck と同じ（背景地図が出る）"""
+        p = Const().prefectures[0]
+        deck = pdk.Deck(
+            map_style="dark_no_labels",
+            initial_view_state=pdk.ViewState(
+                latitude=p.lat,
+                longitude=p.lon,
+                zoom=12,
+                min_zoom=12,
+                max_zoom=12,
+                pitch=0,
+                interactive=False,
+            ),
+        )
+        spec = json.loads(capital_deck(0).to_json())
+        expected = json.loads(deck.to_json())
+
+        for key in ("mapStyle", "mapProvider", "initialViewState"):
+            assert spec[key] == expected[key]
+        assert spec["mapProvider"] == "carto"
@@ -0,0 +1,121 @@
+"""Unit tests for app/common/quizstate.py"""
+
+import pickle
+
+from app.common.const import Const
+from app.common.quizstate import NO_CHOICE, QuizState, normalize_name
+from app.common.rounds import get_round
+
+PREFECTURES = Const().prefectures
+
+ROUND_ID = "daily:random:20261018"
+
+
+class TestNormalizeName:
+    """Test cases for normalize_name function"""
+
+    def test_normalize_name_with_suffix(self):
+        """都道府県名の正規化（接尾辞あり）"""
+        assert normalize_name("大阪府") == "大阪"
+        assert normalize_name("東京都") == "東京"
+        assert normalize_name("京都府") == "京都"
+        assert normalize_name("北海道") == "北海"
+        assert normalize_name("千葉県") == "千葉"
+
+    def test_normalize_name_without_suffix(self):
+        """都道府県名の正規化（接尾辞なし）"""
+        assert normalize_name("東京") == "東京"
+        assert normalize_name("大阪") == "大阪"
+
+    def test_normalize_name_with_spaces(self):
+        """空白を含む文字列の正規化"""
+        assert normalize_name("千葉　県") == "千葉"
+        assert normalize_name("千葉 県") == "千葉"
+        assert normalize_name("  千葉県  ") == "千葉"
+
+    def test_normalize_name_none(self):
+        """None値の処理"""
+        assert normalize_name(None) == ""  # pyright: ignore[reportArgumentType]
+
+    def test_normalize_name_empty(self):
+        """空文字列の処理"""
+        assert normalize_name("") == ""
+        assert normalize_name("   ") == ""
+
+
+class TestQuizState:
+    """Test cases for QuizState class"""
+
+    def test_questions(self):
+        """問題と選択肢は回の行番号から引く"""
+        state = QuizState(ROUND_ID, "map_capital_mc")
+        answers, options = get_round(ROUND_ID)
+
+        assert len(state) == 10
+        assert state.prefecture(0) == PREFECTURES[int(answers[0])]
+        assert state.options(0) == [PREFECTURES.names[j] for j in options[0].tolist()]
+        assert state.correct_answer(0) == state.prefecture(0).name
+
+    def test_capital_options(self):
+        """県庁所在地を答えるモードの選択肢は県庁所在地"""
+        state = QuizState(ROUND_ID, "pref_to_capital_mc")
+
+        assert state.correct_answer(0) == state.prefecture(0).capital
+        assert state.correct_answer(0) in state.options(0)
+        assert set(state.options(0)) <= set(PREFECTURES.capitals)
+
+    def test_answer(self):
+        """回答は選んだ選択肢の番号とビット列で持つ"""
+        state = QuizState(ROUND_ID, "map_capital_mc")
+        wrong = next(o for o in state.options(1) if o != state.correct_answer(1))
+
+        assert state.answer(state.correct_answer(0))
+        state.next()
+        assert not state.answer(wrong)
+        state.next()
+
+        assert state.score == 1
+        assert (state.answered, state.correct) == (0b11, 0b01)
+        assert state.is_correct(0) and not state.is_correct(1)
+        assert state.user_answer(1) == wrong
+        assert state.user_answer(2) is None
+        assert not state.is_answered(2)
+
+    def test_unanswered_choice(self):
+        """選択肢を選ばずに答えると未選択で不正解"""
+        state = QuizState(ROUND_ID, "map_capital_mc")
+
+        assert not state.answer(None)
+        assert state.choices[0] == NO_CHOICE
+        assert state.user_answer(0) is None
+        assert state.is_answered(0)
+
+    def test_input_mode(self):
+        """自由入力のモードは入力を正規化して比べる"""
+        state = QuizState(ROUND_ID, "capital_to_pref_input")
+        name = state.prefecture(0).name
+
+        assert state.answer(f" {name[:-1]} ")
+        state.next()
+        assert not state.answer("")
+
+        assert state.user_answer(0) == f" {name[:-1]} "
+        assert state.score == 1
+
+    def test_finished(self):
+        """全問進めると終わり"""
+        state = QuizState(ROUND_ID, "map_capital_mc")
+        for _ in range(10):
+            state.next()
+
+        assert state.finished
+
+    def test_compact(self):
+        """pickle しても小さい（問題や選択肢の文字列を持たない）"""
+        state = QuizState(ROUND_ID, "map_capital_mc")
+        for i in range(10):
+            state.answer(state.options(i)[0])
+            state.next()
+
+        assert len(pickle.dumps(state)) < 256
+        assert not hasattr(state, "__dict__")
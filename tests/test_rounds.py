@@ -0,0 +1,110 @@
+"""Unit tests for app/common/rounds.py"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+import app.common.rounds as rounds
+from app.common.rounds import (
+    RoundPool,
+    daily_round,
+    draw_round,
+    get_round,
+    load_daily,
+    load_pool,
+    pool_path,
+)
+
+
+@pytest.fixture
+def build_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(rounds, "BUILD_DIR", f"{tmp_path}/")
+    load_pool.clear()
+    load_daily.clear()
+    yield f"{tmp_path}/"
+    load_pool.clear()
+    load_daily.clear()
+
+
+class TestRoundPool:
+    """Test cases for RoundPool class"""
+
+    def test_generate(self):
+        """seed が同じなら同じ内容の uint8 配列"""
+        pool = RoundPool.generate(100, seed=1)
+        same = RoundPool.generate(100, seed=1)
+
+        assert len(pool) == 100
+        assert pool.answers.dtype == np.uint8
+        assert pool.options.shape == (100, 10, 4)
+        assert np.array_equal(pool.options, same.options)
+        assert pool.nbytes == 100 * 10 * 5
+
+    def test_readonly(self):
+        """共有する配列は変更できない"""
+        answers, _options = RoundPool.generate(1)[0]
+
+        with pytest.raises(ValueError):
+            answers[0] = 0
+
+    def test_write_read(self, tmp_path):
+        """書き出したプールを読み込むと同じ内容になる"""
+        pool = RoundPool.generate(50, strategy="nearest")
+        path = str(tmp_path / "nearest.rounds.npz")
+
+        assert pool.write(path) > 0
+        read = RoundPool.read(path)
+        assert np.array_equal(read.answers, pool.answers)
+        assert np.array_equal(read.options, pool.options)
+
+
+class TestRoundIds:
+    """Test cases for round IDs"""
+
+    def test_draw_round(self, build_dir):
+        """共有プールの回を ID で引ける"""
+        round_id = draw_round(rng=np.random.default_rng(0))
+        kind, strategy, number = round_id.split(":")
+
+        assert (kind, strategy) == ("pool", "random")
+        answers, options = get_round(round_id)
+        assert np.array_equal(answers, load_pool("random").answers[int(number)])
+        assert options.shape == (10, 4)
+
+    def test_built_pool(self, build_dir):
+        """ビルド済みのプールがあれば読み込む"""
+        RoundPool.generate(3, strategy="same_region", seed=5).write(
+            pool_path("same_region", build_dir)
+        )
+
+        assert len(load_pool("same_region")) == 3
+        assert get_round("pool:same_region:2").answers.tolist() == (
+            RoundPool.generate(3, strategy="same_region", seed=5)[2].answers.tolist()
+        )
+
+    def test_daily_round(self, build_dir):
+        """同じ日の回は全員同じ、日が変われば別の問題"""
+        first = get_round(daily_round(day=date(2026, 10, 18)))
+        second = get_round(daily_round(day="20261018"))
+        other = get_round(daily_round(day="20261019"))
+
+        assert daily_round(day=date(2026, 10, 18)) == "daily:random:20261018"
+        assert np.array_equal(first.options, second.options)
+        assert not np.array_equal(first.answers, other.answers)
+
+    @pytest.mark.parametrize(
+        "round_id",
+        [
+            "",
+            "pool:random",
+            "pool:farthest:1",
+            "pool:random:-1",
+            "pool:random:99999",
+            "daily:random:2026",
+        ],
+    )
+    def test_invalid(self, build_dir, round_id):
+        """不正な ID は ValueError"""
+        with pytest.raises(ValueError):
+            get_round(round_id)
@@ -0,0 +1,38 @@
+"""Unit tests for app/common/routing.py"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.common import routing
+
+
+def _titles(pages):
+    return [page.title for section in pages.values() for page in section]
+
+
+@pytest.fixture(autouse=True)
+def page(monkeypatch):
+    # st.Page はランタイムの外では作れないので引数だけ記録する
+    monkeypatch.setattr(
+        routing.st, "Page", lambda path, **kwargs: SimpleNamespace(path=path, **kwargs)
+    )
+
+
+class TestPages:
+    """Test cases for pages function"""
+
+    def test_pages(self, monkeypatch):
+        """通常はクイズと学習のページだけ"""
+        monkeypatch.setattr(routing.CONST, "tracing", False)
+
+        assert _titles(routing.pages()) == ["Quiz", "Study"]
+
+    def test_diagnostics(self, monkeypatch):
+        """TRACING のときだけ診断ページを登録する"""
+        monkeypatch.setattr(routing.CONST, "tracing", True)
+
+        pages = routing.pages()
+
+        assert _titles(pages) == ["Quiz", "Study", "Diagnostics"]
+        assert pages["Contents"][-1].visibility == "hidden"
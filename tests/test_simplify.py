@@ -0,0 +1,99 @@
+"""Unit tests for app/common/simplify.py"""
+
+import math
+
+import numpy as np
+
+from app.common.simplify import build_tiers, select_tier, significance, tolerance
+
+
+def wavy_square() -> list[list[float]]:
+    """細かい凹凸のある辺を x=1 に持つ正方形の外周"""
+    edge = [[1.0 + 0.001 * (i % 2), i / 100] for i in range(101)]
+    return [[0.0, 0.0], *edge, [0.0, 1.0], [0.0, 0.0]]
+
+
+class TestSignificance:
+    """Test cases for significance function"""
+
+    def test_endpoints(self):
+        """端点は常に残る"""
+        sig = significance([(0.0, 0.0), (1.0, 1.0), (2.0, 0.0)])
+        assert math.isinf(sig[0])
+        assert math.isinf(sig[-1])
+        assert sig[1] == 1.0
+
+    def test_nested(self):
+        """子の実効許容値は親を超えない"""
+        sig = significance([(0.0, 0.0), (1.0, 0.1), (2.0, 5.0), (4.0, 0.0)])
+        assert np.all(sig[1:-1] <= sig[2])
+
+
+class TestBuildTiers:
+    """Test cases for build_tiers function"""
+
+    def test_shared_border(self):
+        """簡略化しても隣接する境界がずれない"""
+        west = wavy_square()
+        east = [[1.0, 0.0], [2.0, 0.0], [2.0, 1.0]] + [
+            pt for pt in reversed(west[1:-2]) if pt[1] > 0
+        ]
+        east.append([1.0, 0.0])
+        geojson = {
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [c]}}
+                for c in (west, east)
+            ],
+        }
+
+        for tier in build_tiers(geojson, zooms=(4, 12)).values():
+            rings = [f["geometry"]["coordinates"][0] for f in tier["features"]]
+            border = [{tuple(pt) for pt in r if 0.99 <= pt[0] <= 1.01} for r in rings]
+            assert border[0] == border[1]
+            assert all(len(r) >= 4 for r in rings)
+
+    def test_point_count(self):
+        """低いズームほど点が少ない"""
+        geojson = {
+            "features": [
+                {"geometry": {"type": "Polygon", "coordinates": [wavy_square()]}}
+            ]
+        }
+        tiers = build_tiers(geojson, zooms=(4, 16))
+        low, high = (
+            len(tiers[z]["features"][0]["geometry"]["coordinates"][0]) for z in (4, 16)
+        )
+        assert low < high
+
+    def test_small_island(self):
+        """潰れる小さな島も最低限のリングとして残る"""
+        island = [[0.0, 0.0], [1e-5, 0.0], [1e-5, 1e-5], [0.0, 1e-5], [0.0, 0.0]]
+        geojson = {
+            "features": [{"geometry": {"type": "Polygon", "coordinates": [island]}}]
+        }
+        ring = build_tiers(geojson, zooms=(4,))[4]["features"][0]["geometry"][
+            "coordinates"
+        ][0]
+        assert len(ring) >= 4
+
+
+class TestSelectTier:
+    """Test cases for select_tier function"""
+
+    def test_select_tier(self):
+        """表示ズーム以上の最も粗いティアを選ぶ"""
+        assert select_tier(4, 4, zooms=(4, 6, 8)) == 4
+        assert select_tier(5, 4, zooms=(4, 6, 8)) == 6
+        assert select_tier(4, 6, zooms=(4, 6, 8)) == 6
+        assert select_tier(9, 6, zooms=(4, 6, 8)) is None
+
+    def test_select_tier_max_zoom(self):
+        """表示ズームで選び、max_zoom を超える表示ズームは max_zoom に収める"""
+        assert select_tier(4, 4, max_zoom=8, zooms=(4, 6, 8)) == 4
+        assert select_tier(8, 6, max_zoom=12, zooms=(4, 6, 8, 12)) == 8
+        assert select_tier(12, 4, max_zoom=6, zooms=(4, 6, 8)) == 6
+
+    def test_tolerance(self):
+        """ズームが 1 上がると許容値は半分"""
+        assert tolerance(5) == tolerance(4) / 2
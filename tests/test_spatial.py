@@ -0,0 +1,92 @@
+"""Unit tests for app/common/spatial.py"""
+
+import pytest
+
+from app.common.spatial import SpatialIndex, load_spatial_index
+
+GEOJSON = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0], [0.0, 0.0]],
+                    [[2.0, 2.0], [4.0, 2.0], [4.0, 4.0], [2.0, 4.0], [2.0, 2.0]],
+                ],
+            },
+            "properties": {"N03_004": "甲市"},
+        },
+        {
+            "type": "Feature",
+            "geometry": None,
+            "properties": {"N03_004": "所属未定地"},
+        },
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "MultiPolygon",
+                "coordinates": [
+                    [[[2.5, 2.5], [3.5, 2.5], [3.5, 3.5], [2.5, 3.5], [2.5, 2.5]]],
+                    [[[20.0, 0.0], [30.0, 0.0], [30.0, 10.0], [20.0, 0.0]]],
+                ],
+            },
+            "properties": {"N03_004": "乙町"},
+        },
+    ],
+}
+
+
+@pytest.fixture
+def index():
+    return SpatialIndex.from_geojson(GEOJSON)
+
+
+class TestSpatialIndex:
+    """Test cases for SpatialIndex class"""
+
+    def test_locate(self, index):
+        """座標を含むフィーチャー"""
+        assert index.locate(5.0, 8.0) == 0
+        assert index.locate(28.0, 2.0) == 2
+
+    def test_locate_hole(self, index):
+        """穴の中は外側のフィーチャーに含まれない"""
+        assert index.locate(2.2, 2.2) is None
+        # 穴の中にある別のフィーチャー
+        assert index.locate(3.0, 3.0) == 2
+
+    def test_locate_outside(self, index):
+        """どのフィーチャーにも含まれない座標"""
+        assert index.locate(15.0, 5.0) is None
+        assert index.locate(21.0, 9.0) is None
+        assert index.locate(-100.0, 50.0) is None
+
+    def test_nearest(self, index):
+        """近い順のフィーチャーと距離"""
+        (first, distance), (second, _) = index.nearest(14.0, 1.0, k=2)
+
+        assert (first, second) == (0, 2)
+        assert distance == pytest.approx(4.0 * 111.32 * 0.99985, rel=1e-3)
+
+    def test_nearest_inside(self, index):
+        """含まれていれば距離 0"""
+        assert index.nearest(5.0, 8.0) == [(0, 0.0)]
+
+    def test_nearest_skips_empty(self, index):
+        """geometry が無いフィーチャーは返さない"""
+        features = [feature for feature, _ in index.nearest(15.0, 5.0, k=3)]
+        assert features == [0, 2]
+
+    def test_properties(self, index):
+        """フィーチャー番号から属性を引ける"""
+        assert index.properties[index.locate(5.0, 8.0)]["N03_004"] == "甲市"
+        assert len(index) == 3
+
+    def test_load_spatial_index(self):
+        """地域のアセットから作成する"""
+        tokyo = load_spatial_index("13")
+        feature = tokyo.locate(139.7671, 35.6812)  # 東京駅
+
+        assert tokyo.properties[feature]["N03_004"] == "千代田区"
@@ -0,0 +1,130 @@
+"""Unit tests for app/common/topology.py"""
+
+import math
+
+from app.common.topology import (
+    assemble,
+    extract_arcs,
+    from_topojson,
+    ring_from_arcs,
+    to_topojson,
+)
+
+# 東西に隣接する 2 つの正方形（x=1 の辺を共有）
+NEIGHBOURS = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [
+                        [0.0, 0.0],
+                        [1.0, 0.0],
+                        [1.0, 0.5],
+                        [1.0, 1.0],
+                        [0.0, 1.0],
+                        [0.0, 0.0],
+                    ]
+                ],
+            },
+            "properties": {"name": "west"},
+        },
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [
+                        [1.0, 0.0],
+                        [2.0, 0.0],
+                        [2.0, 1.0],
+                        [1.0, 1.0],
+                        [1.0, 0.5],
+                        [1.0, 0.0],
+                    ]
+                ],
+            },
+            "properties": {"name": "east"},
+        },
+        {"type": "Feature", "geometry": None, "properties": {"name": "none"}},
+    ],
+}
+
+
+class TestExtractArcs:
+    """Test cases for extract_arcs function"""
+
+    def test_shared_arc(self):
+        """共有境界は 1 本のアークにまとめられる"""
+        arcs, shapes = extract_arcs(NEIGHBOURS)
+
+        west, east = shapes[0][0][0], shapes[1][0][0]
+        shared = {i if i >= 0 else ~i for i in west} & {
+            i if i >= 0 else ~i for i in east
+        }
+        assert len(shared) == 1
+        assert arcs[shared.pop()] in (
+            [(1.0, 0.0), (1.0, 0.5), (1.0, 1.0)],
+            [(1.0, 1.0), (1.0, 0.5), (1.0, 0.0)],
+        )
+        assert shapes[2] is None
+
+    def test_ring_from_arcs(self):
+        """アーク参照から閉じたリングを組み立てる"""
+        arcs, shapes = extract_arcs(NEIGHBOURS)
+        ring = ring_from_arcs(arcs, shapes[0][0][0])
+
+        assert ring[0] == ring[-1]
+        assert sorted(set(ring)) == sorted(
+            {
+                tuple(pt)
+                for pt in NEIGHBOURS["features"][0]["geometry"]["coordinates"][0]
+            }
+        )
+
+    def test_assemble(self):
+        """properties と geometry の種類が保たれる"""
+        arcs, shapes = extract_arcs(NEIGHBOURS)
+        geojson = assemble(arcs, shapes, NEIGHBOURS)
+
+        assert [f["properties"] for f in geojson["features"]] == [
+            f["properties"] for f in NEIGHBOURS["features"]
+        ]
+        assert geojson["features"][0]["geometry"]["type"] == "Polygon"
+        assert geojson["features"][2]["geometry"] is None
+
+
+class TestTopoJSON:
+    """Test cases for to_topojson / from_topojson functions"""
+
+    def test_encode(self):
+        """共有境界を 1 本のアークとして量子化・差分符号化する"""
+        topology = to_topojson(NEIGHBOURS)
+        geometries = topology["objects"]["collection"]["geometries"]
+
+        assert topology["type"] == "Topology"
+        assert len(topology["arcs"]) == 3
+        assert all(
+            isinstance(v, int) for arc in topology["arcs"] for pt in arc for v in pt
+        )
+        assert [g["type"] for g in geometries] == ["Polygon", "Polygon", None]
+
+    def test_round_trip(self):
+        """復元した GeoJSON が元データと一致する"""
+        geojson = from_topojson(to_topojson(NEIGHBOURS))
+
+        for original, decoded in zip(NEIGHBOURS["features"], geojson["features"]):
+            assert decoded["properties"] == original["properties"]
+            if original["geometry"] is None:
+                assert decoded["geometry"] is None
+                continue
+
+            ring = decoded["geometry"]["coordinates"][0]
+            expected = original["geometry"]["coordinates"][0]
+            assert ring[0] == ring[-1]
+            assert len(ring) == len(expected)
+            # 量子化の刻み以内で一致する
+            for pt in ring:
+                assert min(math.dist(pt, e) for e in expected) < 1e-5
@@ -0,0 +1,93 @@
+"""Unit tests for app/common/tracing.py"""
+
+import pytest
+
+from app.common.tracing import METRIC_NAME, SpanStats, Tracer
+
+
+class TestSpanStats:
+    """Test cases for SpanStats class"""
+
+    def test_quantile(self):
+        """直近の所要時間の分位点"""
+        stats = SpanStats(samples=100)
+        for i in range(1, 101):
+            stats.add(i / 1000)
+
+        assert stats.count == 100
+        assert stats.quantile(0.5) == 0.05
+        assert stats.quantile(0.99) == 0.099
+        assert stats.max == 0.1
+
+    def test_recent_window(self):
+        """分位点は直近 samples 件だけで求める（件数と合計は全件）"""
+        stats = SpanStats(samples=2)
+        for seconds in (10.0, 1.0, 1.0):
+            stats.add(seconds)
+
+        assert stats.count == 3
+        assert stats.total == 12.0
+        assert stats.quantile(0.99) == 1.0
+
+
+class TestTracer:
+    """Test cases for Tracer class"""
+
+    def test_disabled(self):
+        """無効なら何も記録しない"""
+        tracer = Tracer(enabled=False)
+
+        @tracer.traced("func")
+        def func():
+            return 1
+
+        with tracer.span("block"):
+            assert func() == 1
+
+        assert tracer.snapshot() == {}
+
+    def test_span(self):
+        """with ブロックの所要時間を記録する（例外でも記録する）"""
+        tracer = Tracer(enabled=True)
+
+        with tracer.span("block"):
+            pass
+        with pytest.raises(ValueError):
+            with tracer.span("block"):
+                raise ValueError
+
+        assert tracer.snapshot()["block"]["count"] == 2
+
+    def test_traced(self):
+        """デコレーターの既定名は モジュール.関数名"""
+        tracer = Tracer(enabled=True)
+
+        @tracer.traced()
+        def load(value):
+            return value * 2
+
+        assert load(2) == 4
+        assert load.__name__ == "load"
+        assert list(tracer.snapshot()) == ["test_tracing.load"]
+
+    def test_prometheus(self):
+        """Prometheus の summary 形式で出力する"""
+        tracer = Tracer(enabled=True)
+        tracer.record("utils.load_data", 0.25)
+
+        lines = tracer.prometheus().splitlines()
+
+        assert f"# TYPE {METRIC_NAME} summary" in lines
+        assert (
+            f'{METRIC_NAME}{{span="utils.load_data",quantile="0.5"}} 0.250000' in lines
+        )
+        assert f'{METRIC_NAME}_sum{{span="utils.load_data"}} 0.250000' in lines
+        assert f'{METRIC_NAME}_count{{span="utils.load_data"}} 1' in lines
+
+    def test_reset(self):
+        """集計をリセットする"""
+        tracer = Tracer(enabled=True)
+        tracer.record("span", 0.1)
+        tracer.reset()
+
+        assert tracer.snapshot() == {}
@@ -5,7 +5,14 @@ from unittest.mock import mock_open, patch
 
 import pytest
 
-from app.common.utils import get_geojson_bbox, get_geojson_center, load_data
+import app.common.utils as utils
+from app.common.utils import (
+    get_geojson_bbox,
+    get_geojson_center,
+    load_data,
+    load_tier,
+    stream_data,
+)
 
 
 class TestLoadData:
@@ -24,6 +31,26 @@ class TestLoadData:
             load_data("nonexistent_file")
 
 
+class TestLoadTier:
+    """Test cases for load_tier function"""
+
+    def test_build_missing_tier(self, tmp_path, monkeypatch):
+        """ビルド済みのティアが無ければその場で簡略化する"""
+        monkeypatch.setattr(utils, "BUILD_DIR", f"{tmp_path}/")
+
+        full = load_data("25")
+        tier = load_tier("25", zoom=8, min_zoom=6, max_zoom=8)
+
+        assert len(tier["features"]) == len(full["features"])
+        assert json.dumps(tier) != json.dumps(full)
+        assert load_tier("25", zoom=8, min_zoom=6, max_zoom=8) is tier
+        assert not list(tmp_path.iterdir())
+
+    def test_beyond_tiers(self):
+        """表示ズームに合うティアが無ければ元データ"""
+        assert load_tier("25", zoom=20, max_zoom=20) is load_data("25")
+
+
 class TestGetGeojsonCenter:
     """Test cases for get_geojson_center function"""
 
@@ -143,3 +170,7 @@ class TestGetGeojsonBbox:
         }
         bbox = get_geojson_bbox(geojson)
         assert bbox == [0.0, 0.0, 10.0, 10.0]  # [min_lon, min_lat, max_lon, max_lat]
+
+    def test_get_geojson_bbox_stream(self):
+        """逐次読み込みのフィーチャーの列からも同じ bbox"""
+        assert get_geojson_bbox(stream_data("03")) == get_geojson_bbox(load_data("03"))
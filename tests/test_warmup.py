@@ -0,0 +1,112 @@
+"""Unit tests for app/common/warmup.py"""
+
+import json
+import time
+
+import app.common.warmup as warmup_module
+from app.common.warmup import Warmup, map_zooms, parse_regions
+
+
+class TestParseRegions:
+    """Test cases for parse_regions function"""
+
+    def test_parse_regions(self):
+        """カンマ区切りの地域コード"""
+        assert parse_regions("03, 13,,") == ["03", "13"]
+        assert parse_regions("") == []
+
+    def test_parse_regions_all(self):
+        """all で全ての地域コード"""
+        regions = parse_regions("all")
+        assert "prefecture" in regions
+        assert "47" in regions
+
+    def test_map_zooms(self):
+        """地図で表示するときのズーム"""
+        assert map_zooms("prefecture") == (4, 4, 8)
+        assert map_zooms("13") == (9, 4, 12)
+        assert map_zooms("01_subprefecture") == (6, 6, 12)
+        assert map_zooms("03") == (8, 6, 12)
+
+
+class TestWarmup:
+    """Test cases for Warmup class"""
+
+    def test_timings(self, monkeypatch):
+        """地域ごとの読み込み時間を記録する"""
+        loaded = []
+        monkeypatch.setattr(warmup_module, "load_region", loaded.append)
+
+        job = Warmup(["prefecture", "03", "13"], workers=2)
+
+        assert job.wait(timeout=5)
+        assert job.ready
+        assert sorted(loaded) == ["03", "13", "prefecture"]
+        assert {region for region, _ in job.report()} == set(loaded)
+        assert job.elapsed is not None
+
+    def test_errors(self, monkeypatch):
+        """読み込みに失敗しても他の地域は続ける"""
+
+        def load(region):
+            if region == "99":
+                raise FileNotFoundError(region)
+
+        monkeypatch.setattr(warmup_module, "load_region", load)
+
+        job = Warmup(["99", "03"], workers=1)
+
+        assert job.wait(timeout=5)
+        assert list(job.errors) == ["99"]
+        assert [region for region, _ in job.report()] == ["03"]
+
+    def test_unexpected_error(self, monkeypatch):
+        """想定外の例外も記録して他の地域は続ける"""
+
+        def load(region):
+            if region == "99":
+                raise RuntimeError(region)
+
+        monkeypatch.setattr(warmup_module, "load_region", load)
+
+        job = Warmup(["99", "03"], workers=1)
+
+        assert job.wait(timeout=5)
+        assert isinstance(job.errors["99"], RuntimeError)
+        assert [region for region, _ in job.report()] == ["03"]
+
+    def test_status_file(self, tmp_path, monkeypatch):
+        """終わったら進行状況をファイルに書き出す（前回の分は消す）"""
+        monkeypatch.setattr(warmup_module, "load_region", lambda region: None)
+        path = tmp_path / "warmup.json"
+        path.write_text("stale")
+
+        job = Warmup(["prefecture", "03"], workers=2, status_file=str(path))
+
+        assert job.wait(timeout=5)
+        status = json.loads(path.read_text())
+        assert status["ready"]
+        assert status["loaded"] == 2
+        assert set(status["timings_ms"]) == {"prefecture", "03"}
+        assert status == json.loads(json.dumps(job.status()))
+
+    def test_wait_for_status_file(self, tmp_path, monkeypatch):
+        """書き出しの途中でも wait は書き終えるまで待つ"""
+        # 読み込みスレッドの完了コールバックで書き出させる
+        monkeypatch.setattr(
+            warmup_module, "load_region", lambda region: time.sleep(0.05)
+        )
+        write_status = Warmup._write_status
+
+        def slow_write(job):
+            time.sleep(0.2)
+            write_status(job)
+
+        monkeypatch.setattr(Warmup, "_write_status", slow_write)
+        path = tmp_path / "warmup.json"
+
+        job = Warmup(["prefecture"], workers=1, status_file=str(path))
+        time.sleep(0.1)
+
+        assert job.wait(timeout=5)
+        assert json.loads(path.read_text())["ready"]